@@ -0,0 +1,255 @@
+"""
+articles.py
+
+Adapter for downloading the articles behind feed items (the `link` field
+produced by the HN, Reddit and Product Hunt adapters) and extracting their
+main text.
+
+Downloads run concurrently with a global cap and a smaller per-host cap, so
+a batch of links that all point at one site doesn't hammer it. Bodies are
+streamed and abandoned once `max_bytes` is reached. Results are cached by
+URL for a while so follow-up questions about the same links are instant.
+Links to hosts that resolve to loopback, private, link-local or other
+non-public addresses are refused (WEB2API_ARTICLES_ALLOW_PRIVATE=1 allows
+them): redirects are followed here, one checked hop at a time, and every
+connection goes through utils/netguard.py, which only connects to an
+address it has just checked. Within a deadline (see utils/deadline.py), links not done in time
+come back with an error instead of holding up the ones that are. Each article is also
+handed to utils/progress.py as soon as it is done.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+import requests
+
+from ..utils import deadline, metrics, progress, ratelimit
+from ..utils.cache import LRUCache
+from ..utils.errors import DeadlineExceededError, ForbiddenHostError
+from ..utils.http_client import HttpError, charset_from_headers, fetch_streamed, get_session, new_session, read_body
+from ..utils.netguard import PublicOnlyAdapter, public_addresses
+from ..utils.parser import extract_main_text
+from ..utils.resilience import RetryPolicy
+from ..utils.settings import env_bool, env_int
+
+
+MAX_CONCURRENCY = env_int("WEB2API_ARTICLES_CONCURRENCY", 8)
+PER_HOST_CONCURRENCY = env_int("WEB2API_ARTICLES_PER_HOST", 2)
+
+# Links come from tool callers, so by default only hosts on the public
+# internet are fetched: not loopback, private, link-local (which includes
+# cloud metadata endpoints) or otherwise reserved addresses.
+ALLOW_PRIVATE_HOSTS = env_bool("WEB2API_ARTICLES_ALLOW_PRIVATE", False)
+
+MAX_LINKS = 50
+DEFAULT_MAX_BYTES = 500_000
+DEFAULT_TIMEOUT = 10.0
+MAX_REDIRECTS = 5
+
+# Article pages are not worth retrying hard: one quick retry at most.
+ARTICLE_RETRY = RetryPolicy(retries=1, base_delay=0.2, max_delay=0.5)
+
+_HTML_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+
+_cache: LRUCache[Dict[str, Any]] = LRUCache(max_entries=256, ttl=15 * 60)
+metrics.register("articles.cache", _cache.stats)
+
+_pool = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix="web2api-articles")
+
+# Bounded: a host dropped while in use only loosens its cap until its
+# downloads finish.
+_host_slots: LRUCache[threading.Semaphore] = LRUCache(max_entries=ratelimit.MAX_HOSTS)
+_host_slots_lock = threading.Lock()
+
+# hostname -> whether all of its addresses are public. Only decides whether
+# to try a link; the connection itself is checked again (see _session()).
+_public_hosts: LRUCache[bool] = LRUCache(max_entries=ratelimit.MAX_HOSTS, ttl=300.0)
+
+_public_session: Optional[requests.Session] = None
+_public_session_lock = threading.Lock()
+
+
+def _session() -> requests.Session:
+    """The session to download with: public addresses only, unless allowed."""
+    global _public_session
+    if ALLOW_PRIVATE_HOSTS:
+        return get_session()
+    if _public_session is None:
+        with _public_session_lock:
+            if _public_session is None:
+                _public_session = new_session(PublicOnlyAdapter)
+    return _public_session
+
+
+def _host_slot(host: str) -> threading.Semaphore:
+    with _host_slots_lock:
+        slot = _host_slots.get(host)
+        if slot is None:
+            slot = threading.Semaphore(PER_HOST_CONCURRENCY)
+            _host_slots.set(host, slot)
+        return slot
+
+
+def _is_public_host(hostname: str) -> bool:
+    """True if hostname resolves, and only to globally routable addresses."""
+    if ALLOW_PRIVATE_HOSTS:
+        return True
+    public = _public_hosts.get(hostname)
+    if public is None:
+        try:
+            public = bool(public_addresses(hostname))
+        except ForbiddenHostError:
+            public = False
+        _public_hosts.set(hostname, public)
+    return public
+
+
+def _empty_result(link: str, error: Optional[str] = None, error_type: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "link": link,
+        "title": None,
+        "text": "",
+        "bytes": 0,
+        "truncated": False,
+        "error": error,
+        "error_type": error_type,
+    }
+
+
+def _content_type(response: requests.Response) -> str:
+    return response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+
+
+def _fetch_one(link: str, max_bytes: int, timeout: float) -> Dict[str, Any]:
+    """Download and extract one article. Never raises; errors go in the dict."""
+    result = _empty_result(link)
+
+    def read(response: requests.Response) -> Tuple[requests.Response, Optional[bytes], bool]:
+        content_type = _content_type(response)
+        if response.is_redirect or (content_type and content_type not in _HTML_TYPES):
+            response.close()
+            return response, None, False
+        body, truncated = read_body(response, max_bytes)
+        return response, body, truncated
+
+    url = link
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            result.update(error="Unsupported URL", error_type="UnsupportedURL")
+            return result
+        if not _is_public_host(parts.hostname):
+            result.update(error="Host is not a public address", error_type="ForbiddenHost")
+            return result
+
+        with _host_slot(parts.netloc):
+            try:
+                response, body, truncated = fetch_streamed(
+                    url, read, timeout=timeout, retry=ARTICLE_RETRY, session=_session(), allow_redirects=False
+                )
+            except ForbiddenHostError as exc:
+                result.update(error=str(exc), error_type="ForbiddenHost")
+                return result
+            except HttpError as exc:
+                result.update(error=str(exc), error_type=type(exc).__name__)
+                return result
+        if not response.is_redirect:
+            break
+        # Follow it ourselves, so the next host is checked before anything is sent.
+        url = urljoin(url, response.headers["Location"])
+    else:
+        result.update(error=f"More than {MAX_REDIRECTS} redirects", error_type="TooManyRedirects")
+        return result
+
+    if body is None:
+        result.update(
+            error=f"Unsupported content type {_content_type(response)!r}", error_type="UnsupportedContentType"
+        )
+        return result
+
+    title, text = extract_main_text(body, encoding=charset_from_headers(response.headers))
+    result.update(title=title, text=text, bytes=len(body), truncated=truncated)
+    return result
+
+
+def _cached(link: str, max_bytes: int) -> Optional[Dict[str, Any]]:
+    entry = _cache.get(link)
+    if entry is None or entry["error"]:
+        return None
+    # A truncated copy only satisfies requests that allow no more bytes.
+    if entry["truncated"] and entry["bytes"] < max_bytes:
+        return None
+    return entry
+
+
+def _interleave_hosts(links: List[str]) -> List[str]:
+    """
+    Order links round-robin by host so that pool workers blocked on one
+    host's per-host cap don't starve links to other hosts.
+    """
+    by_host: Dict[str, List[str]] = {}
+    for link in links:
+        by_host.setdefault(urlsplit(link).netloc, []).append(link)
+    queues = list(by_host.values())
+    ordered: List[str] = []
+    while queues:
+        ordered.extend(queue.pop(0) for queue in queues)
+        queues = [queue for queue in queues if queue]
+    return ordered
+
+
+def fetch_articles(
+    links: List[str],
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch many article links concurrently and extract their main text.
+
+    Args:
+        links: article URLs (duplicates are fetched once; at most MAX_LINKS).
+        max_bytes: per-article download cap; bigger bodies are cut off.
+        timeout: per-request timeout in seconds.
+
+    Returns:
+        One dict per unique link, in input order, with keys:
+        - link (str)
+        - title (str or None)
+        - text (str)
+        - bytes (int): bytes downloaded
+        - truncated (bool): True if the body hit max_bytes
+        - error (str or None)
+        - error_type (str or None): the error's kind, e.g. "HttpError",
+          "DeadlineExceededError" (also for links still pending when the
+          deadline ran out), "UnsupportedContentType", "ForbiddenHost" (also
+          for redirects to such hosts) or "TooManyRedirects"
+    """
+    unique = list(dict.fromkeys(links))[:MAX_LINKS]
+
+    results: Dict[str, Dict[str, Any]] = {}
+    futures = {}
+    for link in _interleave_hosts(unique):
+        cached = _cached(link, max_bytes)
+        if cached is not None:
+            results[link] = cached
+        else:
+            futures[_pool.submit(deadline.bind(_fetch_one), link, max_bytes, timeout)] = link
+    progress.emit(list(results.values()), "articles")
+
+    left = deadline.remaining()
+    try:
+        for future in as_completed(futures, timeout=None if left is None else max(0.0, left)):
+            result = future.result()
+            if not result["error"]:
+                _cache.set(futures[future], result)
+            results[futures[future]] = result
+            progress.emit([result], "articles")
+    except TimeoutError:
+        for future, link in futures.items():
+            if link not in results:
+                future.cancel()
+                results[link] = _empty_result(link, "Deadline exceeded", DeadlineExceededError.__name__)
+
+    return [results[link] for link in unique]
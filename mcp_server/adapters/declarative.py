@@ -0,0 +1,139 @@
+"""
+declarative.py
+
+Runs the declarative site specs from mcp_server/sites.py.
+
+Each spec is compiled once into an `ExtractionPlan`: its selectors are
+compiled with soupsieve and its parsers resolved to functions, so a fetch
+only parses the page and walks the item elements. Pages go through the
+shared client (pooling, retries, rate limits, metrics) and extractions
+through parse_memo, like the hand-written adapters.
+"""
+
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import soupsieve  # type: ignore
+from bs4 import Tag  # type: ignore
+
+from ..sites import SITES, SiteSpec
+from ..utils.http_client import fetch_page
+from ..utils.parser import parse_html, parse_memo, safe_int
+
+
+_INT_RE = re.compile(r"-?\d[\d,]*")
+
+
+def _parse_text(value: str, base_url: str) -> Optional[str]:
+    return value.strip() or None
+
+
+def _parse_int(value: str, base_url: str) -> Optional[int]:
+    match = _INT_RE.search(value)
+    return safe_int(match.group().replace(",", "")) if match else None
+
+
+def _parse_url(value: str, base_url: str) -> Optional[str]:
+    value = value.strip()
+    return urljoin(base_url, value) if value else None
+
+
+_PARSERS: Dict[str, Callable[[str, str], Any]] = {
+    "text": _parse_text,
+    "int": _parse_int,
+    "url": _parse_url,
+}
+
+
+# (name, compiled selector or None for the item itself, attribute, parser)
+_Step = Tuple[str, Optional[Any], Optional[str], Callable[[str, str], Any]]
+
+
+class ExtractionPlan:
+    """A spec with its selectors compiled and parsers resolved."""
+
+    def __init__(self, spec: SiteSpec) -> None:
+        self.spec = spec
+        self._rows = soupsieve.compile(spec.rows)
+        self._steps: List[_Step] = [
+            (
+                name,
+                soupsieve.compile(field.selector) if field.selector else None,
+                field.attr,
+                _PARSERS[field.parse],
+            )
+            for name, field in spec.fields.items()
+        ]
+
+    def extract(self, content: bytes, encoding: str, base_url: str) -> List[Dict[str, Any]]:
+        """Extract every item on the page, in page order; rows without a title are skipped."""
+        soup = parse_html(content, encoding)
+        items: List[Dict[str, Any]] = []
+        for row in self._rows.iselect(soup):
+            item = self._extract_row(row, base_url)
+            if item.get("title"):
+                item["rank"] = len(items) + 1
+                items.append(item)
+                if len(items) >= self.spec.max_items:
+                    break
+        return items
+
+    def _extract_row(self, row: Tag, base_url: str) -> Dict[str, Any]:
+        item: Dict[str, Any] = {}
+        for name, selector, attr, parse in self._steps:
+            element = selector.select_one(row) if selector is not None else row
+            if element is None:
+                item[name] = None
+                continue
+            raw = element.get(attr) if attr else element.get_text(" ", strip=True)
+            if isinstance(raw, list):
+                # Multi-valued attributes such as class.
+                raw = " ".join(raw)
+            item[name] = parse(raw, base_url) if raw is not None else None
+        return item
+
+
+_plans: Dict[str, ExtractionPlan] = {}
+_plans_lock = threading.Lock()
+
+
+def get_plan(key: str) -> ExtractionPlan:
+    """Return the compiled plan for a site, compiling it on first use."""
+    plan = _plans.get(key)
+    if plan is None:
+        with _plans_lock:
+            plan = _plans.get(key)
+            if plan is None:
+                plan = _plans[key] = ExtractionPlan(SITES[key])
+    return plan
+
+
+def fetch_site(key: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Fetch a declarative site's items.
+
+    Args:
+        key: site key in sites.SITES.
+        limit: maximum number of items to return.
+
+    Returns:
+        A list of dicts with the spec's fields plus rank (int).
+
+    Raises:
+        KeyError: for an unknown site.
+        HttpError: if the page can't be fetched.
+    """
+    plan = get_plan(key)
+    page = fetch_page(plan.spec.url, keep_stale=True)
+    items = parse_memo.get_or_parse(
+        f"site.{key}",
+        plan.spec.version,
+        page.content,
+        lambda: plan.extract(page.content, page.encoding, page.url),
+        # Relative links resolve against the page URL.
+        extra=(page.encoding, page.url),
+    )
+    # Memoized items are shared between calls; hand out copies.
+    return [dict(item) for item in items[: max(0, limit)]]
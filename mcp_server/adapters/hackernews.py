@@ -1,16 +1,42 @@
 """
 hackernews.py
 
-Adapter for fetching top posts from Hacker News front page.
+Adapter for fetching top posts from Hacker News front page, and comment
+threads from the official HN Firebase API.
 """
 
-from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
 
-from ..utils.http_client import get_html, HttpError
-from ..utils.parser import parse_html, safe_int
+import soupsieve  # type: ignore
+from bs4 import Tag  # type: ignore
+
+from ..utils import deadline, jsonio, metrics, progress
+from ..utils.cache import LRUCache
+from ..utils.errors import DeadlineExceededError, RateLimitedError
+from ..utils.http_client import HttpError, fetch_page
+from ..utils.parser import html_to_text, parse_html, parse_memo, safe_int
+from ..utils.resilience import RetryPolicy
+from ..utils.settings import env_int
 
 
 HN_URL = "https://news.ycombinator.com/"
+HN_ITEM_URL = "https://hacker-news.firebaseio.com/v0/item/{item_id}.json"
+
+# Bump whenever _extract_posts() output changes, to invalidate parse_memo.
+ADAPTER_VERSION = "2"
+
+# Parallel item fetches per comment thread level.
+COMMENT_PARALLELISM = env_int("WEB2API_HN_COMMENT_PARALLELISM", 8)
+
+ITEM_RETRY = RetryPolicy(retries=1, base_delay=0.1, max_delay=0.3)
+
+# Raw items by id. Short TTL: scores and replies change, but follow-up
+# questions about the same thread should not refetch it.
+_items: LRUCache[Dict[str, Any]] = LRUCache(max_entries=5000, ttl=120.0)
+metrics.register("hackernews.items", _items.stats)
+
+_comment_pool = ThreadPoolExecutor(max_workers=COMMENT_PARALLELISM, thread_name_prefix="web2api-hn")
 
 
 def fetch_top_posts(limit: int = 10) -> List[Dict[str, Any]]:
@@ -28,65 +54,225 @@ def fetch_top_posts(limit: int = 10) -> List[Dict[str, Any]]:
         - points (int or None)
         - comments (int or None)
     """
-    html = get_html(HN_URL)
-    soup = parse_html(html)
+    page = fetch_page(HN_URL, keep_stale=True)
+    posts = parse_memo.get_or_parse(
+        "hackernews",
+        ADAPTER_VERSION,
+        page.content,
+        lambda: _extract_posts(page.content, page.encoding),
+        extra=page.encoding,
+    )
+    # Memoized items are shared between calls; hand out copies.
+    return [dict(post) for post in posts[: max(0, limit)]]
+
+
+def _extract_posts(content: bytes, encoding: str) -> List[Dict[str, Any]]:
+    """
+    Extract every story on the front page, in page order.
+
+    Walks the story table's rows once: each `tr.athing` row is paired with
+    the row right after it (its subtext: points and comments).
+    """
+    soup = parse_html(content, encoding)
+
+    first = soup.find("tr", class_="athing")
+    if first is None:
+        return []
 
     posts: List[Dict[str, Any]] = []
+    story: Optional[Dict[str, Any]] = None
+
+    for row in first.parent.find_all("tr", recursive=False):
+        if "athing" in (row.get("class") or ()):
+            story = _story_fields(row)
+            if story is not None:
+                posts.append(story)
+        elif story is not None:
+            # Only the row right after a story is its subtext.
+            _add_subtext_fields(story, row)
+            story = None
+
+    return posts
+
+
+# Compiled once; Tag.select_one() would re-parse the selector on every call.
+_RANK = soupsieve.compile("span.rank")
+_TITLE_LINK = soupsieve.compile("span.titleline > a")
+_SUBTEXT = soupsieve.compile("td.subtext")
+_SCORE = soupsieve.compile("span.score")
+
+
+def _story_fields(row: Tag) -> Optional[Dict[str, Any]]:
+    """Return title/link/rank of a `tr.athing` row, or None if it has no title."""
+    title_link = _TITLE_LINK.select_one(row)
+    if title_link is None:
+        return None
+
+    rank = None
+    rank_el = _RANK.select_one(row)
+    if rank_el is not None:
+        rank_text = rank_el.get_text().strip()
+        if rank_text.endswith("."):
+            rank = safe_int(rank_text.rstrip("."))
+
+    return {
+        "title": title_link.get_text().strip(),
+        "link": title_link.get("href", "").strip(),
+        "rank": rank,
+        "points": None,
+        "comments": None,
+    }
+
+
+def _add_subtext_fields(story: Dict[str, Any], row: Tag) -> None:
+    """Fill in points and comments from a story's subtext row."""
+    subtext = _SUBTEXT.select_one(row)
+    if subtext is None:
+        return
 
-    # Each story row has class "athing"
-    story_rows = soup.select("tr.athing")
-
-    for story in story_rows:
-        try:
-            # Rank
-            rank = None
-            rank_text = story.select_one("span.rank")
-            if rank_text and rank_text.text.strip().endswith("."):
-                rank_value = rank_text.text.strip().rstrip(".")
-                rank = safe_int(rank_value)
-
-            # Title + link
-            title_link = story.select_one("span.titleline > a")
-            if not title_link:
+    score = _SCORE.select_one(subtext)
+    if score is not None:
+        # e.g., "123 points"
+        parts = score.get_text().split()
+        if parts:
+            story["points"] = safe_int(parts[0])
+
+    # The last <a> in subtext is usually the comments link: "45 comments"
+    links = subtext.find_all("a")
+    if links:
+        text = links[-1].get_text()
+        if "comment" in text:
+            parts = text.split()
+            if parts and parts[0].isdigit():
+                story["comments"] = safe_int(parts[0])
+
+
+def _fetch_item(item_id: int) -> Optional[Dict[str, Any]]:
+    """Return one HN item (cached), or None if it doesn't exist."""
+    cached = _items.get(item_id)
+    if cached is not None:
+        return cached
+    page = fetch_page(HN_ITEM_URL.format(item_id=item_id), retry=ITEM_RETRY)
+    item = jsonio.loads(page.content)
+    if item is not None:
+        _items.set(item_id, item)
+    return item
+
+
+def _fetch_item_quietly(item_id: int) -> Optional[Dict[str, Any]]:
+    try:
+        return _fetch_item(item_id)
+    except (DeadlineExceededError, RateLimitedError):
+        # Not this comment's fault: the caller marks the thread partial.
+        raise
+    except (HttpError, ValueError):
+        # One missing comment shouldn't fail the whole thread.
+        return None
+
+
+def _without_replies(node: Dict[str, Any]) -> Dict[str, Any]:
+    # Replies are still being filled in; progress batches carry flat comments.
+    return {key: value for key, value in node.items() if key != "replies"}
+
+
+def fetch_comments(item_id: int, max_depth: int = 3, max_comments: int = 100) -> Dict[str, Any]:
+    """
+    Fetch a story's discussion as a comment tree.
+
+    The tree is built breadth-first, one depth level at a time; each level's
+    items are fetched in parallel (COMMENT_PARALLELISM at a time), and no
+    more items are requested once max_depth or max_comments is reached.
+    Deleted and dead comments are skipped. If the caller's deadline (see
+    utils/deadline.py) runs out, the comments fetched so far are returned.
+    Each finished level is emitted to utils/progress.py (without replies).
+
+    Args:
+        item_id: HN story (or comment) id.
+        max_depth: deepest reply level to include (1 = top-level comments).
+        max_comments: maximum number of comments in the tree.
+
+    Returns:
+        A dict with keys:
+        - id, title, link, points, by, descendants (story fields)
+        - comments (list of {id, by, time, text, depth, replies})
+        - comment_count (int): comments included
+        - truncated (bool): True if limits cut the thread short
+        - partial (bool): True if the deadline (or the host's rate limit)
+          cut the thread short
+    """
+    root = _fetch_item(item_id)
+    if root is None:
+        raise HttpError(f"Hacker News item {item_id} not found")
+
+    thread: Dict[str, Any] = {
+        "id": root.get("id"),
+        "title": root.get("title"),
+        "link": root.get("url") or f"https://news.ycombinator.com/item?id={item_id}",
+        "points": root.get("score"),
+        "by": root.get("by"),
+        "descendants": root.get("descendants"),
+        "comments": [],
+        "comment_count": 0,
+        "truncated": False,
+        "partial": False,
+    }
+
+    # (parent's reply list, child id) pairs for the current level.
+    frontier = [(thread["comments"], kid) for kid in root.get("kids", [])]
+    depth = 1
+    count = 0
+
+    while frontier:
+        if depth > max_depth or count >= max_comments:
+            thread["truncated"] = True
+            break
+
+        # Fetch no more than the remaining budget; deleted/dead items may
+        # leave it underused, which the next level then fills.
+        batch = frontier[: max_comments - count]
+        if len(batch) < len(frontier):
+            thread["truncated"] = True
+        fetch = deadline.bind(_fetch_item_quietly)
+        futures = [_comment_pool.submit(fetch, kid) for _, kid in batch]
+        left = deadline.remaining()
+        done, pending = wait(futures, timeout=None if left is None else max(0.0, left))
+        if pending:
+            # Out of time: keep what arrived, drop the rest of this level.
+            for future in pending:
+                future.cancel()
+            thread["truncated"] = thread["partial"] = True
+        items = []
+        for future in futures:
+            try:
+                items.append(future.result() if future in done else None)
+            except (DeadlineExceededError, RateLimitedError):
+                items.append(None)
+                thread["truncated"] = thread["partial"] = True
+
+        level = []
+        next_frontier = []
+        for (replies, _), item in zip(batch, items):
+            if not item or item.get("deleted") or item.get("dead"):
                 continue
+            node = {
+                "id": item.get("id"),
+                "by": item.get("by"),
+                "time": item.get("time"),
+                "text": html_to_text(item.get("text")),
+                "depth": depth,
+                "replies": [],
+            }
+            replies.append(node)
+            level.append(node)
+            count += 1
+            next_frontier.extend((node["replies"], kid) for kid in item.get("kids", []))
+
+        if progress.active():
+            progress.emit([_without_replies(node) for node in level], "hn_comments")
+        if thread["partial"]:
+            break
+        frontier = next_frontier
+        depth += 1
 
-            title = title_link.text.strip()
-            link = title_link.get("href", "").strip()
-
-            # Subtext row (points, comments) is the next <tr>
-            subtext_row = story.find_next_sibling("tr")
-            points = None
-            comments = None
-            if subtext_row:
-                subtext = subtext_row.select_one("td.subtext")
-                if subtext:
-                    score_span = subtext.select_one("span.score")
-                    if score_span and score_span.text:
-                        # e.g., "123 points"
-                        score_text = score_span.text.split()[0]
-                        points = safe_int(score_text)
-
-                    # The last <a> in subtext is usually the comments link: "45 comments"
-                    links = subtext.find_all("a")
-                    if links:
-                        last_a = links[-1]
-                        if "comment" in last_a.text:
-                            parts = last_a.text.split()
-                            if parts and parts[0].isdigit():
-                                comments = safe_int(parts[0])
-
-            posts.append(
-                {
-                    "title": title,
-                    "link": link,
-                    "rank": rank,
-                    "points": points,
-                    "comments": comments,
-                }
-            )
-
-        except Exception:
-            # Skip bad rows but keep going
-            continue
-
-    return posts[: max(0, limit)]
+    thread["comment_count"] = count
+    return thread
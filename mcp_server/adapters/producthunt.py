@@ -10,12 +10,15 @@ might need adjustment if parsing stops working.
 
 from typing import Any, Dict, List, Optional
 
-from ..utils.http_client import get_html, HttpError
-from ..utils.parser import parse_html, safe_int
+from ..utils.http_client import fetch_page
+from ..utils.parser import parse_html, parse_memo, safe_int
 
 
 PH_URL = "https://www.producthunt.com/"
 
+# Bump whenever _extract_products() output changes, to invalidate parse_memo.
+ADAPTER_VERSION = "1"
+
 
 def fetch_top_products(limit: int = 10) -> List[Dict[str, Any]]:
     """
@@ -33,8 +36,21 @@ def fetch_top_products(limit: int = 10) -> List[Dict[str, Any]]:
         - comments (int or None)
         - rank (int or None)
     """
-    html = get_html(PH_URL)
-    soup = parse_html(html)
+    page = fetch_page(PH_URL, keep_stale=True)
+    products = parse_memo.get_or_parse(
+        "producthunt",
+        ADAPTER_VERSION,
+        page.content,
+        lambda: _extract_products(page.content, page.encoding),
+        extra=page.encoding,
+    )
+    # Memoized items are shared between calls; hand out copies.
+    return [dict(product) for product in products[: max(0, limit)]]
+
+
+def _extract_products(content: bytes, encoding: str) -> List[Dict[str, Any]]:
+    """Extract every product on the front page, in page order."""
+    soup = parse_html(content, encoding)
 
     products: List[Dict[str, Any]] = []
 
@@ -118,4 +134,4 @@ def fetch_top_products(limit: int = 10) -> List[Dict[str, Any]]:
             # Skip bad rows and move on
             continue
 
-    return products[: max(0, limit)]
+    return products
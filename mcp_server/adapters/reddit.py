@@ -1,27 +1,176 @@
 """
 reddit.py
 
-Adapter for fetching top posts from Reddit (r/all, hot).
+Adapter for fetching posts from Reddit listings (r/all hot by default, or
+any subreddit, sort and time window).
 
 Uses Reddit's JSON endpoint. This is a simple, lightweight
 integration suitable for demo purposes.
+
+Every listing, the default one included, goes through `get_listing()`,
+which keeps them in an LRU bounded by total size
+(WEB2API_REDDIT_CACHE_BYTES) and hands out copies of the cached posts. Each entry holds the largest limit fetched
+for its (subreddit, sort, window), so smaller limits are served from its
+first posts without another request.
 """
 
-from typing import Any, Dict, List
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils import jsonio, metrics
+from ..utils.cache import LRUCache
+from ..utils.http_client import fetch_page
+from ..utils.settings import env_float, env_int
+
+
+REDDIT_URL = "https://www.reddit.com/r/{subreddit}/{sort}.json"
+
+DEFAULT_SUBREDDIT = "all"
+DEFAULT_SORT = "hot"
+SORTS = ("hot", "new", "top", "rising")
+# Time windows; Reddit only applies them to "top".
+WINDOWS = ("hour", "day", "week", "month", "year", "all")
+
+# Names like "python" or multireddits like "python+rust".
+_SUBREDDIT_RE = re.compile(r"^[A-Za-z0-9_]{2,21}(\+[A-Za-z0-9_]{2,21})*$")
+
+# Misses are fetched at the next of these sizes, so nearby limits share
+# one entry.
+_FETCH_SIZES = (10, 25, 50)
+
+CACHE_TTL = env_float("WEB2API_REDDIT_CACHE_TTL", 60.0)
+CACHE_BYTES = env_int("WEB2API_REDDIT_CACHE_BYTES", 4 * 1024 * 1024)
+
+ListingKey = Tuple[str, str, Optional[str]]
+
+# The only listing fields fetch_top_posts() maps; each post in Reddit's
+# listing carries ~100 more.
+POST_FIELDS = ("title", "permalink", "url", "subreddit", "ups", "num_comments", "over_18", "id")
+
+
+def _select_posts(body: bytes) -> List[Dict[str, Any]]:
+    """
+    Decode a listing and keep only POST_FIELDS of each post.
+
+    The full decoded tree is dropped as soon as the slim dicts are built,
+    so a 50-post listing doesn't stay alive while we build the response.
+    """
+    data = jsonio.loads(body)
+    children = data.get("data", {}).get("children", [])
+    selected = []
+    for child in children:
+        d = child.get("data", {})
+        selected.append({field: d[field] for field in POST_FIELDS if field in d})
+    return selected
+
 
-import requests
+def _entry_size(entry: Tuple[int, List[Dict[str, Any]]]) -> int:
+    # The serialized size tracks the real footprint closely enough to
+    # budget by, and is cheap next to the fetch it follows.
+    return len(jsonio.dumps_bytes(entry[1]))
 
-from ..utils.http_client import HttpError
 
+# (subreddit, sort, window) -> (limit fetched, posts)
+_listings: LRUCache[Tuple[int, List[Dict[str, Any]]]] = LRUCache(
+    max_entries=4096, ttl=CACHE_TTL, max_bytes=CACHE_BYTES, sizeof=_entry_size
+)
+metrics.register("reddit.listings", _listings.stats)
 
-REDDIT_URL = "https://www.reddit.com/r/all/hot.json"
+# Collapses concurrent misses for one listing into a single request.
+_fetch_locks = [threading.Lock() for _ in range(16)]
+
+
+def listing_key(
+    subreddit: str = DEFAULT_SUBREDDIT, sort: str = DEFAULT_SORT, window: Optional[str] = None
+) -> ListingKey:
+    """
+    Validate and normalize listing parameters.
+
+    Raises:
+        ValueError: for an invalid subreddit name, sort or window.
+    """
+    subreddit = (subreddit or DEFAULT_SUBREDDIT).strip()
+    if subreddit.lower().startswith("r/"):
+        subreddit = subreddit[2:]
+    if not _SUBREDDIT_RE.match(subreddit):
+        raise ValueError(f"Invalid subreddit {subreddit!r}")
+    sort = (sort or DEFAULT_SORT).strip().lower()
+    if sort not in SORTS:
+        raise ValueError(f"Invalid sort {sort!r}. Use one of: {', '.join(SORTS)}.")
+    if window:
+        window = window.strip().lower()
+        if window not in WINDOWS:
+            raise ValueError(f"Invalid window {window!r}. Use one of: {', '.join(WINDOWS)}.")
+    # The window means nothing to other sorts; drop it so they share an entry.
+    return subreddit.lower(), sort, (window or "day") if sort == "top" else None
+
+
+def _clamp_limit(limit: int) -> int:
+    if limit <= 0:
+        return 10
+    return min(limit, 50)
+
+
+def get_listing(
+    subreddit: str = DEFAULT_SUBREDDIT,
+    sort: str = DEFAULT_SORT,
+    window: Optional[str] = None,
+    limit: int = 10,
+) -> List[Dict[str, Any]]:
+    """
+    Posts of a listing, through the size-bounded listing cache.
+
+    A cached entry serves any limit up to the one it was fetched at (or
+    any limit at all, if the listing had fewer posts than that).
+
+    Raises:
+        ValueError: for invalid parameters (see listing_key).
+        HttpError: if the listing can't be fetched.
+    """
+    key = listing_key(subreddit, sort, window)
+    limit = _clamp_limit(limit)
+
+    def cached() -> Optional[List[Dict[str, Any]]]:
+        entry = _listings.get(key)
+        if entry is not None:
+            fetched, posts = entry
+            if limit <= fetched or len(posts) < fetched:
+                # Copies, so callers can't change the cached listing.
+                return [dict(p) for p in posts[:limit]]
+        return None
+
+    posts = cached()
+    if posts is not None:
+        return posts
+    with _fetch_locks[hash(key) % len(_fetch_locks)]:
+        posts = cached()
+        if posts is not None:
+            return posts
+        size = next(size for size in _FETCH_SIZES if size >= limit)
+        posts = fetch_listing(*key, limit=size)
+        _listings.set(key, (size, posts))
+    return [dict(p) for p in posts[:limit]]
 
 
 def fetch_top_posts(limit: int = 10) -> List[Dict[str, Any]]:
+    """Fetch top posts from r/all (hot) on Reddit, through the listing cache."""
+    return get_listing(limit=limit)
+
+
+def fetch_listing(
+    subreddit: str = DEFAULT_SUBREDDIT,
+    sort: str = DEFAULT_SORT,
+    window: Optional[str] = None,
+    limit: int = 10,
+) -> List[Dict[str, Any]]:
     """
-    Fetch top posts from r/all (hot) on Reddit.
+    Fetch posts from a Reddit listing, e.g. r/python (top, week).
 
     Args:
+        subreddit: subreddit name, or several joined with "+".
+        sort: one of SORTS.
+        window: one of WINDOWS; only used with sort="top" (default "day").
         limit: maximum number of posts to return (clamped to 1–50).
 
     Returns:
@@ -35,32 +184,28 @@ def fetch_top_posts(limit: int = 10) -> List[Dict[str, Any]]:
         - over_18 (bool)
         - id (str)
     """
-    if limit <= 0:
-        limit = 10
-    if limit > 50:
-        limit = 50
+    subreddit, sort, window = listing_key(subreddit, sort, window)
+    limit = _clamp_limit(limit)
 
-    params = {"limit": limit}
+    params: Dict[str, Any] = {"limit": limit}
+    if window:
+        params["t"] = window
 
     headers = {
         # A simple User-Agent string to be polite to Reddit
         "User-Agent": "web2api-mcp-agent/0.1 (demo script)",
     }
 
-    try:
-        resp = requests.get(REDDIT_URL, params=params, headers=headers, timeout=5.0)
-        resp.raise_for_status()
-    except requests.RequestException as exc:
-        raise HttpError(f"Failed to fetch Reddit data: {exc}") from exc
-
-    data = resp.json()
-    children = data.get("data", {}).get("children", [])
+    # Retries, circuit breaking and pooling come from the shared client.
+    url = REDDIT_URL.format(subreddit=subreddit, sort=sort)
+    # Only the default listing is a front page worth a stale fallback.
+    front_page = subreddit == DEFAULT_SUBREDDIT and sort == DEFAULT_SORT
+    page = fetch_page(url, params=params, headers=headers, keep_stale=front_page)
 
     posts: List[Dict[str, Any]] = []
     rank = 0
 
-    for child in children:
-        d = child.get("data", {})
+    for d in _select_posts(page.content):
         title = d.get("title", "").strip()
         if not title:
             continue
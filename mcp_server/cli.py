@@ -10,13 +10,15 @@ This is NOT the full MCP implementation yet, but it lets you:
 
 Example:
     python3 -m mcp_server.cli --tool hn_get_top_posts --limit 5
+    python3 -m mcp_server.cli --tool hn_get_top_posts --profile
 """
 
 import argparse
-import json
+import sys
 from typing import Any, Dict
 
-from .tools import get_tool_registry
+from .tools import call_tool, get_tool_map
+from .utils import jsonio, profiling
 
 
 def parse_args() -> argparse.Namespace:
@@ -34,6 +36,16 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Optional 'limit' argument for tools that support it (e.g., hn_get_top_posts)",
     )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Indent the JSON output (default: compact, one line)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Run the handler under cProfile and print its top functions to stderr",
+    )
     return parser.parse_args()
 
 
@@ -46,8 +58,7 @@ def main() -> None:
         tool_args["limit"] = args.limit
 
     # Look up the tool
-    tools = get_tool_registry()
-    tool_map = {t.name: t for t in tools}
+    tool_map = get_tool_map()
 
     if args.tool not in tool_map:
         available = ", ".join(tool_map.keys())
@@ -55,13 +66,15 @@ def main() -> None:
             f"Unknown tool {args.tool!r}. Available tools: {available}"
         )
 
-    tool = tool_map[args.tool]
-
     # Call the handler
-    result = tool.handler(tool_args)
+    result = call_tool(args.tool, tool_args, profile=args.profile)
+
+    last = profiling.last_profile()
+    if args.profile and last is not None:
+        print(jsonio.dumps(last.summary(limit=15), indent=True), file=sys.stderr)
 
-    # Print as pretty JSON
-    print(json.dumps(result, indent=2, ensure_ascii=False))
+    # Compact by default for scripts; indented with --pretty
+    print(jsonio.dumps(result, indent=args.pretty))
 
 
 if __name__ == "__main__":
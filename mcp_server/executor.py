@@ -0,0 +1,205 @@
+"""
+executor.py
+
+Admission control for MCP tool calls.
+
+Tool handlers block (HTTP, parsing), so `mcp_server.py` runs them on a
+bounded thread pool instead of inline on the event loop. Each key (usually
+a source, e.g. "reddit") may only have a few calls running at once; extra
+calls wait in a queue of fixed total depth. When that queue is full, new
+calls are rejected straight away with `OverloadedError`, which clients can
+retry after a short pause, instead of piling up until they time out.
+
+Calls run in a copy of the submitter's contextvars context, so per-call
+state such as the deadline (see utils/deadline.py) follows them onto the
+worker thread.
+"""
+
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Optional
+
+from .utils import metrics
+from .utils.metrics import LatencyWindow
+from .utils.settings import env_int, env_str
+
+
+MAX_WORKERS = env_int("WEB2API_TOOL_WORKERS", 8)
+MAX_QUEUE = env_int("WEB2API_TOOL_QUEUE", 32)
+
+# Seconds clients are told to wait before retrying a rejected call.
+RETRY_AFTER = 1.0
+
+
+class OverloadedError(RuntimeError):
+    """Raised when a call is rejected because the queue is full. Retryable."""
+
+    def __init__(self, key: str, queued: int, retry_after: float = RETRY_AFTER) -> None:
+        super().__init__(
+            f"Server busy: {queued} calls already queued (at {key!r}). "
+            f"This is temporary; retry in about {retry_after:g}s."
+        )
+        self.key = key
+        self.retry_after = retry_after
+
+
+@dataclass
+class _Job:
+    future: Future
+    func: Callable[..., Any]
+    args: tuple
+    submitted: float
+    context: contextvars.Context
+    queued: bool = False
+
+
+@dataclass
+class _KeyState:
+    limit: int
+    running: int = 0
+    waiting: Deque[_Job] = field(default_factory=deque)
+    rejected: int = 0
+    wait_times: LatencyWindow = field(default_factory=LatencyWindow)
+
+
+class ToolExecutor:
+    """
+    Bounded pool with per-key concurrency limits and a fixed-depth queue.
+
+    A call is queued when it can't start right away, either because its
+    key is at its limit or because every worker is busy. It stays queued
+    until a worker starts it. At most `max_queue` calls can be queued.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = MAX_WORKERS,
+        max_queue: int = MAX_QUEUE,
+        key_limits: Optional[Dict[str, int]] = None,
+        default_limit: Optional[int] = None,
+    ) -> None:
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.default_limit = default_limit or max(1, self.max_workers // 2)
+        self._key_limits = dict(key_limits or {})
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="web2api-tool")
+        self._keys: Dict[str, _KeyState] = {}
+        self._lock = threading.Lock()
+        self._in_pool = 0
+        self._queued = 0
+        self.max_queue_depth = 0
+        self.rejected = 0
+
+    def _state(self, key: str) -> _KeyState:
+        # Caller holds self._lock.
+        state = self._keys.get(key)
+        if state is None:
+            limit = self._key_limits.get(key, self.default_limit)
+            state = self._keys[key] = _KeyState(limit=max(1, limit))
+        return state
+
+    def submit(self, key: str, func: Callable[..., Any], *args: Any) -> Future:
+        """
+        Schedule func(*args) under key's limit.
+
+        Raises:
+            OverloadedError: if the call would have to wait and the queue is full.
+        """
+        job = _Job(Future(), func, args, time.monotonic(), contextvars.copy_context())
+        with self._lock:
+            state = self._state(key)
+            key_free = state.running < state.limit
+            if not key_free or self._in_pool >= self.max_workers:
+                if self._queued >= self.max_queue:
+                    self.rejected += 1
+                    state.rejected += 1
+                    raise OverloadedError(key, self._queued)
+                job.queued = True
+                self._queued += 1
+                self.max_queue_depth = max(self.max_queue_depth, self._queued)
+            if not key_free:
+                state.waiting.append(job)
+                return job.future
+            state.running += 1
+            self._in_pool += 1
+        self._pool.submit(self._run, key, job)
+        return job.future
+
+    def _run(self, key: str, job: _Job) -> None:
+        with self._lock:
+            if job.queued:
+                self._queued -= 1
+            state = self._keys[key]
+        state.wait_times.observe(time.monotonic() - job.submitted)
+
+        if job.future.set_running_or_notify_cancel():
+            try:
+                job.future.set_result(job.context.run(job.func, *job.args))
+            except BaseException as exc:  # noqa: BLE001 - handed to the caller
+                job.future.set_exception(exc)
+
+        with self._lock:
+            if not state.waiting:
+                state.running -= 1
+                self._in_pool -= 1
+                return
+            # Hand our key slot and pool slot straight to the next waiter.
+            next_job = state.waiting.popleft()
+        self._pool.submit(self._run, key, next_job)
+
+    @property
+    def queue_depth(self) -> int:
+        with self._lock:
+            return self._queued
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            keys = {
+                key: {
+                    "limit": state.limit,
+                    "running": state.running,
+                    "waiting": len(state.waiting),
+                    "rejected": state.rejected,
+                    "wait": state.wait_times.stats(),
+                }
+                for key, state in self._keys.items()
+            }
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._queued,
+                "max_queue_depth": self.max_queue_depth,
+                "rejected": self.rejected,
+                "keys": keys,
+            }
+
+
+def _parse_limits(spec: Optional[str]) -> Dict[str, int]:
+    """Parse "reddit=2,articles=4" into {key: limit}."""
+    limits: Dict[str, int] = {}
+    for part in (spec or "").split(","):
+        key, _, value = part.strip().partition("=")
+        try:
+            limits[key] = int(value)
+        except ValueError:
+            continue
+    return limits
+
+
+_executor: Optional[ToolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ToolExecutor:
+    """Return the process-wide tool executor (configured from WEB2API_TOOL_*)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ToolExecutor(key_limits=_parse_limits(env_str("WEB2API_TOOL_LIMITS")))
+                metrics.register("tools.executor", _executor.stats)
+    return _executor
@@ -0,0 +1,265 @@
+"""
+export.py
+
+Bulk export of stored snapshots for analysis.
+
+Reads the shared snapshot cache (see mcp_server.shared_cache), opened
+read-only: every stored version of each feed (the history) or, with
+--current, just the latest snapshots. Snapshots and history are only
+recorded by servers running with WEB2API_SHARED_CACHE set; without it
+there is nothing to export. Output is one row per item:
+
+    {"source": "hackernews", "fetched_at": 1767225600.1, "version": "9f2c...",
+     "rank": 1, "title": "...", "link": "...", "points": 120, "comments": 48}
+
+Formats:
+    ndjson   one JSON row per line (default)
+    columns  one JSON line per chunk in columnar form, {field: [values]}
+    parquet  a Parquet file with one row group per chunk (needs pyarrow)
+
+Rows are streamed from SQLite and written in chunks of --chunk-size, so
+memory stays bounded however large the export is.
+
+Examples:
+    python3 -m mcp_server.export > feeds.ndjson
+    python3 -m mcp_server.export --source hackernews --since 2026-10-01 --until 2026-10-08 -o hn.ndjson.gz
+    python3 -m mcp_server.export --format parquet -o feeds.parquet
+"""
+
+import argparse
+import gzip
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional
+
+from .shared_cache import DEFAULT_PATH, SharedSnapshotCache
+from .snapshots import SOURCES, Snapshot
+from .utils import jsonio
+from .utils.settings import env_str
+
+
+EXPORT_FIELDS = ("source", "fetched_at", "version", "rank", "title", "link", "points", "comments")
+FORMATS = ("ndjson", "columns", "parquet")
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def iter_rows(snapshots: Iterable[Snapshot]) -> Iterator[Dict[str, Any]]:
+    """Flatten snapshots into one row per item (see EXPORT_FIELDS)."""
+    for snapshot in snapshots:
+        for item in snapshot.items:
+            yield {
+                "source": snapshot.source,
+                "fetched_at": snapshot.fetched_at,
+                "version": snapshot.version,
+                "rank": item.get("rank"),
+                "title": item.get("title"),
+                "link": item.get("link"),
+                "points": item.get("points"),
+                "comments": item.get("comments"),
+            }
+
+
+def chunked(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk: List[Dict[str, Any]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class NdjsonWriter:
+    def __init__(self, out: IO[bytes]) -> None:
+        self.out = out
+
+    def write(self, chunk: List[Dict[str, Any]]) -> None:
+        self.out.write(b"".join(jsonio.dumps_bytes(row) + b"\n" for row in chunk))
+
+    def close(self) -> None:
+        self.out.flush()
+
+
+class ColumnsWriter(NdjsonWriter):
+    def write(self, chunk: List[Dict[str, Any]]) -> None:
+        columns = {field: [row[field] for row in chunk] for field in EXPORT_FIELDS}
+        self.out.write(jsonio.dumps_bytes(columns) + b"\n")
+
+
+class ParquetWriter:
+    def __init__(self, out: IO[bytes]) -> None:
+        try:
+            import pyarrow as pa  # type: ignore
+            import pyarrow.parquet as pq  # type: ignore
+        except ImportError as exc:
+            raise SystemExit("--format parquet needs pyarrow (pip install pyarrow)") from exc
+        self._pa = pa
+        self.schema = pa.schema(
+            [
+                ("source", pa.string()),
+                ("fetched_at", pa.float64()),
+                ("version", pa.string()),
+                ("rank", pa.int64()),
+                ("title", pa.string()),
+                ("link", pa.string()),
+                ("points", pa.int64()),
+                ("comments", pa.int64()),
+            ]
+        )
+        self._writer = pq.ParquetWriter(out, self.schema)
+
+    def write(self, chunk: List[Dict[str, Any]]) -> None:
+        self._writer.write_table(self._pa.Table.from_pylist(chunk, schema=self.schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+_WRITERS = {"ndjson": NdjsonWriter, "columns": ColumnsWriter, "parquet": ParquetWriter}
+
+
+def export(
+    cache: SharedSnapshotCache,
+    out: IO[bytes],
+    fmt: str = "ndjson",
+    sources: Optional[List[str]] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    history: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Write the selected snapshots to `out` in `fmt`; return the row count."""
+    writer = _WRITERS[fmt](out)
+    rows = 0
+    try:
+        snapshots = cache.iter_snapshots(sources, since, until, history=history)
+        for chunk in chunked(iter_rows(snapshots), max(1, chunk_size)):
+            writer.write(chunk)
+            rows += len(chunk)
+    finally:
+        writer.close()
+    return rows
+
+
+def parse_time(value: str) -> float:
+    """
+    Parse epoch seconds, an ISO 8601 date/time (UTC unless it has an
+    offset) or an age like "90m", "24h", "7d" (that long ago).
+    """
+    value = value.strip()
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    try:
+        if value[-1:] in units and value[:-1].replace(".", "", 1).isdigit():
+            return time.time() - float(value[:-1]) * units[value[-1]]
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid time {value!r} (use epoch seconds, ISO 8601 or an age like 24h)"
+        ) from None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Export stored feed snapshots",
+        epilog=(
+            "Snapshots and their history are only recorded by servers running with "
+            "WEB2API_SHARED_CACHE set (history for WEB2API_SNAPSHOT_HISTORY_DAYS days)."
+        ),
+    )
+    parser.add_argument(
+        "--db",
+        default=None,
+        help="Snapshot cache file (default: WEB2API_SHARED_CACHE, else ~/.cache/web2api/snapshots.db)",
+    )
+    parser.add_argument("--format", choices=FORMATS, default="ndjson", help="Output format (default ndjson)")
+    parser.add_argument("-o", "--output", default="-", help="Output file ('-' for stdout; .gz is gzipped)")
+    parser.add_argument(
+        "--source",
+        action="append",
+        default=None,
+        help=f"Only these sources (repeatable or comma-separated): {', '.join(SOURCES)}",
+    )
+    parser.add_argument("--since", type=parse_time, default=None, help="Fetched at or after (epoch, ISO 8601 or age like 24h)")
+    parser.add_argument("--until", type=parse_time, default=None, help="Fetched before (same formats)")
+    parser.add_argument("--current", action="store_true", help="Only the latest snapshot of each source, not the history")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk / row group")
+    return parser.parse_args(argv)
+
+
+def _db_path(arg: Optional[str]) -> str:
+    if arg:
+        return arg
+    setting = env_str("WEB2API_SHARED_CACHE")
+    if setting is None or setting.lower() in ("0", "false", "no", "off", "1", "true", "yes", "on"):
+        return DEFAULT_PATH
+    return setting
+
+
+def _open_output(path: str, fmt: str) -> IO[bytes]:
+    if path == "-":
+        if fmt == "parquet":
+            raise SystemExit("--format parquet needs an output file (-o)")
+        return sys.stdout.buffer
+    if path.endswith(".gz"):
+        return gzip.open(path, "wb")  # type: ignore[return-value]
+    return open(path, "wb")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+
+    sources = None
+    if args.source:
+        sources = [name.strip().lower() for value in args.source for name in value.split(",") if name.strip()]
+        unknown = [name for name in sources if name not in SOURCES]
+        if unknown:
+            raise SystemExit(f"Unknown source(s) {', '.join(unknown)}. Use: {', '.join(SOURCES)}")
+
+    path = _db_path(args.db)
+    if not os.path.exists(path):
+        raise SystemExit(
+            f"No snapshot cache at {path}. Snapshots are only recorded by servers running with "
+            "WEB2API_SHARED_CACHE set; pass --db for a cache file elsewhere."
+        )
+    try:
+        cache = SharedSnapshotCache.open_readonly(path)
+    except sqlite3.Error as exc:
+        raise SystemExit(f"Cannot read snapshot cache at {path}: {exc}") from exc
+
+    out = _open_output(args.output, args.format)
+    try:
+        rows = export(
+            cache,
+            out,
+            args.format,
+            sources=sources,
+            since=args.since,
+            until=args.until,
+            history=not args.current,
+            chunk_size=args.chunk_size,
+        )
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    print(f"Exported {rows} rows", file=sys.stderr)
+    if rows == 0 and not args.current:
+        print(
+            "No history rows; it is only recorded while WEB2API_SHARED_CACHE is set "
+            "and WEB2API_SNAPSHOT_HISTORY_DAYS is above 0.",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
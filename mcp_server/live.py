@@ -0,0 +1,199 @@
+"""
+live.py
+
+Fan-out of snapshot updates to many live subscribers (e.g. SSE clients).
+
+One `FeedHub` per process keeps, for each source with at least one
+subscriber, a single poller thread that keeps the source's snapshot fresh.
+Whenever the snapshot version changes, the update is encoded once and the
+same bytes are handed to every subscriber's bounded queue. Subscribers whose
+queue is full (slow readers) are dropped instead of buffering without limit.
+"""
+
+import logging
+import queue
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+from .snapshots import SOURCES, Snapshot, SnapshotError, SnapshotStore, get_store
+from .utils import jsonio, metrics
+from .utils.settings import env_int
+
+
+logger = logging.getLogger(__name__)
+
+
+MAX_SUBSCRIBERS = env_int("WEB2API_LIVE_MAX_SUBSCRIBERS", 5000)
+SUBSCRIBER_QUEUE = env_int("WEB2API_LIVE_QUEUE", 8)
+
+# Poll no faster than this even if a snapshot's TTL is shorter.
+MIN_POLL_INTERVAL = 1.0
+# Wait this long after a failed refresh before trying again.
+ERROR_RETRY_INTERVAL = 5.0
+
+# Fields pushed to live clients.
+LIVE_FIELDS = ("rank", "title", "link", "points", "comments", "source")
+
+
+class HubFullError(Exception):
+    """Raised when the hub already has MAX_SUBSCRIBERS subscribers."""
+
+
+class Subscription:
+    """A subscriber's bounded queue of pre-encoded events."""
+
+    def __init__(self, source: str, maxsize: int) -> None:
+        self.source = source
+        self.queue: "queue.Queue[bytes]" = queue.Queue(maxsize=maxsize)
+        self.dropped = False
+
+    def next_event(self, timeout: float) -> Optional[bytes]:
+        """Return the next event, or None if none arrived within timeout."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+def encode_event(snapshot: Snapshot) -> bytes:
+    """Encode a snapshot as one SSE `snapshot` event."""
+    data = {
+        "source": snapshot.source,
+        "version": snapshot.version,
+        "fetched_at": snapshot.fetched_at,
+        "items": [{k: item.get(k) for k in LIVE_FIELDS} for item in snapshot.items],
+    }
+    header = f"id: {snapshot.version}\nevent: snapshot\ndata: ".encode("utf-8")
+    return header + jsonio.dumps_bytes(data) + b"\n\n"
+
+
+class FeedHub:
+    def __init__(self, store: SnapshotStore) -> None:
+        self.store = store
+        self._subscribers: Dict[str, Set[Subscription]] = {source: set() for source in SOURCES}
+        self._pollers: Dict[str, threading.Thread] = {}
+        self._wakeups: Dict[str, threading.Event] = {source: threading.Event() for source in SOURCES}
+        self._lock = threading.Lock()
+        self.published = 0
+        self.dropped = 0
+        store.add_listener(self._on_refresh)
+
+    def subscribe(self, source: str, last_version: Optional[str] = None) -> Subscription:
+        """
+        Register a subscriber for a source and start its poller if needed.
+
+        The current snapshot (if any and newer than last_version) is queued
+        immediately so new clients don't wait for the next change.
+
+        Raises:
+            KeyError: for unknown sources.
+            HubFullError: if MAX_SUBSCRIBERS is reached.
+        """
+        if source not in SOURCES:
+            raise KeyError(source)
+        sub = Subscription(source, SUBSCRIBER_QUEUE)
+        with self._lock:
+            if sum(len(subs) for subs in self._subscribers.values()) >= MAX_SUBSCRIBERS:
+                raise HubFullError(f"Too many live subscribers (max {MAX_SUBSCRIBERS})")
+            self._subscribers[source].add(sub)
+            self._ensure_poller(source)
+
+        current = self.store.peek(source)
+        if current is not None and current.version != last_version:
+            sub.queue.put_nowait(encode_event(current))
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            self._subscribers[sub.source].discard(sub)
+            if not self._subscribers[sub.source]:
+                # Let the idle poller notice and exit now rather than after its TTL sleep.
+                self._wakeups[sub.source].set()
+
+    def subscriber_count(self, source: Optional[str] = None) -> int:
+        with self._lock:
+            if source is not None:
+                return len(self._subscribers[source])
+            return sum(len(subs) for subs in self._subscribers.values())
+
+    def _on_refresh(self, snapshot: Snapshot, previous: Optional[Snapshot]) -> None:
+        if previous is not None and previous.version == snapshot.version:
+            return
+        self.publish(snapshot)
+
+    def publish(self, snapshot: Snapshot) -> None:
+        """Encode a snapshot once and offer it to every subscriber."""
+        with self._lock:
+            subs: List[Subscription] = list(self._subscribers[snapshot.source])
+        if not subs:
+            return
+
+        event = encode_event(snapshot)
+        slow: List[Subscription] = []
+        for sub in subs:
+            try:
+                sub.queue.put_nowait(event)
+            except queue.Full:
+                slow.append(sub)
+
+        with self._lock:
+            self.published += 1
+            for sub in slow:
+                sub.dropped = True
+                self._subscribers[sub.source].discard(sub)
+                self.dropped += 1
+        if slow:
+            logger.info("Dropped %d slow live subscriber(s) for %s", len(slow), snapshot.source)
+
+    def _ensure_poller(self, source: str) -> None:
+        # Caller holds self._lock.
+        poller = self._pollers.get(source)
+        if poller is not None and poller.is_alive():
+            return
+        poller = threading.Thread(
+            target=self._poll, args=(source,), name=f"web2api-live-{source}", daemon=True
+        )
+        self._pollers[source] = poller
+        poller.start()
+
+    def _poll(self, source: str) -> None:
+        """Keep a source's snapshot fresh while it has subscribers."""
+        wakeup = self._wakeups[source]
+        while True:
+            with self._lock:
+                if not self._subscribers[source]:
+                    self._pollers.pop(source, None)
+                    return
+            try:
+                # Refreshes (and therefore publishes) only when expired.
+                snapshot = self.store.get(source)
+                delay = max(MIN_POLL_INTERVAL, snapshot.ttl_remaining())
+            except SnapshotError as exc:
+                logger.warning("Live refresh of %s failed: %s", source, exc)
+                delay = ERROR_RETRY_INTERVAL
+            wakeup.wait(delay)
+            wakeup.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "subscribers": {source: len(subs) for source, subs in self._subscribers.items()},
+                "pollers": sorted(self._pollers),
+                "published": self.published,
+                "dropped": self.dropped,
+            }
+
+
+_hub: Optional[FeedHub] = None
+_hub_lock = threading.Lock()
+
+
+def get_hub() -> FeedHub:
+    """Return the process-wide hub bound to the process-wide snapshot store."""
+    global _hub
+    if _hub is None:
+        with _hub_lock:
+            if _hub is None:
+                _hub = FeedHub(get_store())
+                metrics.register("live.hub", _hub.stats)
+    return _hub
@@ -9,8 +9,26 @@ can fetch top items from:
 - Hacker News
 - Product Hunt
 - Reddit
+- any declarative sites configured in mcp_server.sites (WEB2API_SITES)
 
-It reuses the existing handlers in mcp_server.tools.
+It reuses the existing handlers in mcp_server.tools, through the shared
+snapshot cache in mcp_server.snapshots (so repeated calls - and, with
+WEB2API_SHARED_CACHE set, other processes - reuse one upstream fetch).
+
+Set WEB2API_RECORD=/path/to/trace.ndjson to log every tool call with its
+timing (see mcp_server.utils.recorder and scripts/replay_trace.py).
+
+Clients that send a progress token get results progressively: each batch
+of items an adapter finishes (a source's feed, an article, a level of
+comments) arrives as a progress notification whose message is JSON
+{"source": ..., "items": [...]}, before the full result.
+
+Pass profile=true to a tool (or set WEB2API_PROFILE) to run its handler
+under cProfile; debug_last_profile summarizes the latest profile (see
+mcp_server.utils.profiling).
+
+With WEB2API_WARMUP=1, connections to the upstreams are opened and the
+default snapshots prefetched in the background on startup.
 """
 
 """
@@ -18,52 +36,69 @@ mcp_server.py
 
 MCP server for the Web2API project.
 """
+import asyncio
+import logging
 import os
 import sys
 import traceback
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Union
 
 # --- ensure project root is on sys.path so `mcp_server.*` imports work ---
 ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
 if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
 
-from mcp.server.fastmcp import FastMCP  # type: ignore[import]
-
-# Import tools via the package name, NOT relative
-from mcp_server.tools import (
-    hn_get_top_posts_handler,
-    ph_get_top_products_handler,
-    reddit_get_top_posts_handler,
+from mcp.server.fastmcp import Context, FastMCP  # type: ignore[import]
+
+# Import via the package name, NOT relative
+from mcp_server.executor import OverloadedError, get_executor
+from mcp_server.sites import SITES, SiteSpec
+from mcp_server.snapshots import (
+    SOURCES,
+    Snapshot,
+    SnapshotError,
+    get_store,
+    normalize_items,
+    parse_fields,
+    project,
+    to_columns,
 )
+from mcp_server.tools import call_tool
+from mcp_server.utils import deadline, jsonio, profiling, progress
+from mcp_server.utils.errors import DeadlineExceededError
+from mcp_server.utils.recorder import recorded
+from mcp_server.warmup import start_warmup
 
 
 
+logger = logging.getLogger(__name__)
+
 # Create the MCP server instance
 mcp = FastMCP("web2api")
 
 
-def _call_handler_safely(handler, args: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """
-    Call a legacy handler (which returns either a list or an error dict)
-    and normalize error handling.
-    """
-    result = handler(args)
-
-    if isinstance(result, dict) and result.get("error"):
-        # Surface a clear error back to the MCP client
-        details = result.get("details") or ""
-        raise RuntimeError(f"{result['error']}. {details}")
-
-    # We expect a list of dict-like items
-    return list(result)  # type: ignore[arg-type]
+# Items as rows, or {field: [values]} when the caller asks for columnar
+# output; with a deadline, {"items": <either form>, "partial": bool}.
+Items = Union[List[Dict[str, Any]], Dict[str, Any]]
 
 
-def _normalize_items(source: str, raw_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def _get_items(
+    source: str,
+    limit: int,
+    fields: Optional[List[str]] = None,
+    columns: bool = False,
+    with_partial: bool = False,
+) -> Items:
     """
-    Normalize different adapter outputs into a common schema.
+    Return the first `limit` normalized items of a source's snapshot,
+    restricted to `fields` and optionally in columnar form.
 
-    Output item shape:
+    With `with_partial`, the result is {"items": ..., "partial": bool}, and
+    if the call's deadline runs out before the source can be refreshed,
+    the last snapshot we have (or nothing) is returned marked partial
+    instead of raising.
+
+    Normalized item shape:
       {
           "rank": int,
           "title": str,
@@ -73,120 +108,537 @@ def _normalize_items(source: str, raw_items: List[Dict[str, Any]]) -> List[Dict[
           "source": str,   # e.g., "HackerNews", "ProductHunt", "Reddit"
       }
     """
-    normalized: List[Dict[str, Any]] = []
-    rank_counter = 1
+    # Validate before fetching so a typo doesn't cost an upstream request.
+    names = parse_fields(fields)
+    store = get_store()
+    partial = False
+    try:
+        snapshot: Optional[Snapshot] = store.get(source)
+    except (SnapshotError, DeadlineExceededError) as exc:
+        if not (with_partial and deadline.expired()):
+            # Surface a clear error back to the MCP client
+            raise RuntimeError(str(exc)) from exc
+        snapshot = store.peek(source)
+        partial = True
+
+    items = snapshot.head(max(1, min(limit, 50))) if snapshot is not None else []
+    if progress.active():
+        progress.emit(project(items, names), source)
+    shaped = to_columns(items, names) if columns else project(items, names)
+    if with_partial:
+        return {"items": shaped, "partial": partial}
+    return shaped
+
+
+def _get_reddit_listing(
+    args: Dict[str, Any],
+    fields: Optional[List[str]],
+    columns: bool,
+    with_partial: bool,
+) -> Items:
+    """
+    Like _get_items, for Reddit listings other than r/all (hot). Those are
+    cached by the adapter (per subreddit, sort and window) rather than as
+    snapshots.
+    """
+    names = parse_fields(fields)
+    result = call_tool("reddit_get_top_posts", args)
+    partial = False
+    if isinstance(result, dict) and result.get("error"):
+        if not (with_partial and deadline.expired()):
+            details = result.get("details")
+            raise RuntimeError(f"{result['error']}. {details}" if details else result["error"])
+        result, partial = [], True
+
+    items = normalize_items("Reddit", list(result))
+    if progress.active():
+        progress.emit(project(items, names), "reddit")
+    shaped = to_columns(items, names) if columns else project(items, names)
+    if with_partial:
+        return {"items": shaped, "partial": partial}
+    return shaped
+
+
+def _get_articles(args: Dict[str, Any], with_partial: bool) -> Items:
+    result = call_tool("fetch_articles", args)
+    if isinstance(result, dict) and result.get("error"):
+        raise ValueError(result["error"])
+    if with_partial:
+        # Links cut short by the deadline (still pending, or timed out
+        # mid-fetch) say so in their error_type; other failures aren't partial.
+        partial = any(item.get("error_type") == DeadlineExceededError.__name__ for item in result)
+        return {"items": result, "partial": partial}
+    return result
+
+
+def _get_comments(args: Dict[str, Any]) -> Dict[str, Any]:
+    result = call_tool("hn_get_comments", args)
+    if result.get("error"):
+        details = result.get("details") or ""
+        raise RuntimeError(f"{result['error']}. {details}")
+    return result
 
-    for item in raw_items:
-        title = (
-            item.get("title")
-            or item.get("name")
-            or "(no title)"
-        )
-        link = (
-            item.get("link")
-            or item.get("url")
-            or item.get("discussion_url")
-            or ""
-        )
-        points = (
-            item.get("points")
-            or item.get("score")
-            or item.get("votes")
-            or item.get("votes_count")
-        )
-        comments = (
-            item.get("comments")
-            or item.get("num_comments")
-            or item.get("comments_count")
-        )
 
-        normalized.append(
-            {
-                "rank": item.get("rank", rank_counter),
-                "title": title,
-                "link": link,
-                "points": points,
-                "comments": comments,
-                "source": source,
-            }
-        )
-        rank_counter += 1
+class _ProgressRelay:
+    """
+    Forwards batches emitted on worker threads (utils/progress.py) to the
+    client as MCP progress notifications, in order, from the event loop.
+    """
 
-    return normalized
+    def __init__(self, ctx: Context, total: Optional[float] = None) -> None:
+        self._ctx = ctx
+        self._loop = asyncio.get_running_loop()
+        self._queue: "asyncio.Queue[tuple]" = asyncio.Queue()
+        self.total = total
+        self.sent = 0
+
+    @classmethod
+    def for_context(
+        cls, ctx: Optional[Context], total: Optional[float] = None
+    ) -> Optional["_ProgressRelay"]:
+        """A relay if the client asked for progress (sent a token), else None."""
+        if ctx is None:
+            return None
+        try:
+            meta = ctx.request_context.meta
+        except ValueError:
+            # Not inside a request (e.g. called directly from Python).
+            return None
+        if meta is None or meta.progressToken is None:
+            return None
+        return cls(ctx, total)
+
+    def __call__(self, items: List[Dict[str, Any]], label: Optional[str]) -> None:
+        # Called from worker threads.
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (items, label))
+
+    async def _send(self, items: List[Dict[str, Any]], label: Optional[str]) -> None:
+        self.sent += len(items)
+        message = jsonio.dumps({"source": label, "items": items})
+        try:
+            await self._ctx.report_progress(self.sent, self.total, message)
+        except Exception as exc:  # noqa: BLE001 - progress is best effort
+            logger.debug("Dropping progress notification: %s", exc)
+
+    async def pump(self, result: "asyncio.Future[Any]") -> Any:
+        """Send batches as they arrive until `result` is done, then return it."""
+        while not result.done():
+            getter = asyncio.ensure_future(self._queue.get())
+            await asyncio.wait({getter, result}, return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                await self._send(*getter.result())
+            else:
+                getter.cancel()
+        # Batches emitted just before the handler returned.
+        while not self._queue.empty():
+            await self._send(*self._queue.get_nowait())
+        return await result
+
+
+def _submit(
+    key: str,
+    func: Callable[..., Any],
+    *args: Any,
+    deadline_ms: Optional[int] = None,
+    relay: Optional[_ProgressRelay] = None,
+    profile: bool = False,
+) -> "asyncio.Future[Any]":
+    budget = None if deadline_ms is None else max(0, deadline_ms) / 1000.0
+    # The executor copies our context, so the deadline, the progress sink
+    # and the profiling request follow the call onto the worker thread.
+    with deadline.deadline_scope(budget), progress.progress_scope(relay), profiling.profile_scope(profile):
+        future = get_executor().submit(key, func, *args)
+    return asyncio.wrap_future(future)
+
+
+async def _run_tool(
+    key: str,
+    func: Callable[..., Any],
+    *args: Any,
+    deadline_ms: Optional[int] = None,
+    ctx: Optional[Context] = None,
+    total: Optional[float] = None,
+    profile: bool = False,
+) -> Any:
+    """
+    Run a blocking handler on the bounded tool executor, under `key`'s
+    concurrency limit and within `deadline_ms` (if given), relaying any
+    batches it emits as progress notifications when the client asked for
+    them, and profiling the tool handlers it calls if `profile` is set.
+    Raises OverloadedError (retryable) when the queue is full.
+    """
+    relay = _ProgressRelay.for_context(ctx, total)
+    future = _submit(key, func, *args, deadline_ms=deadline_ms, relay=relay, profile=profile)
+    if relay is None:
+        return await future
+    return await relay.pump(future)
+
+
+async def _feed(
+    source: str,
+    limit: int,
+    fields: Optional[List[str]],
+    columnar: bool,
+    deadline_ms: Optional[int],
+    ctx: Optional[Context],
+    profile: bool = False,
+) -> Items:
+    return await _run_tool(
+        source,
+        _get_items,
+        source,
+        limit,
+        fields,
+        columnar,
+        deadline_ms is not None,
+        deadline_ms=deadline_ms,
+        ctx=ctx,
+        profile=profile,
+    )
+
+
+def _source_key(source: str) -> str:
+    source_key = source.lower().strip()
+    if source_key not in SOURCES:
+        raise ValueError(f"Invalid source. Use one of: {', '.join(SOURCES)}.")
+    return source_key
 
 
 @mcp.tool()
-async def hn_get_top_posts(limit: int = 10) -> List[Dict[str, Any]]:
+@recorded
+async def hn_get_top_posts(
+    limit: int = 10,
+    fields: Optional[List[str]] = None,
+    columnar: bool = False,
+    deadline_ms: Optional[int] = None,
+    profile: bool = False,
+    ctx: Optional[Context] = None,
+) -> Items:
     """
     Fetch top posts from the Hacker News front page.
 
     Args:
         limit: Maximum number of posts to return (default 10, max 50).
+        fields: Optional subset of [rank, title, link, points, comments, source].
+        columnar: Return {field: [values]} instead of one dict per item.
+        deadline_ms: Optional time budget; the result is then
+            {"items": ..., "partial": bool} and never fails for lack of time.
+        profile: Profile the source's handler if this call refreshes it
+            (see debug_last_profile).
     """
-    limit = max(1, min(limit, 50))
-    raw_items = _call_handler_safely(hn_get_top_posts_handler, {"limit": limit})
-    return _normalize_items("HackerNews", raw_items)
+    return await _feed("hackernews", limit, fields, columnar, deadline_ms, ctx, profile)
 
 
 @mcp.tool()
-async def ph_get_top_products(limit: int = 10) -> List[Dict[str, Any]]:
+@recorded
+async def ph_get_top_products(
+    limit: int = 10,
+    fields: Optional[List[str]] = None,
+    columnar: bool = False,
+    deadline_ms: Optional[int] = None,
+    profile: bool = False,
+    ctx: Optional[Context] = None,
+) -> Items:
     """
     Fetch top products from the Product Hunt front page.
 
     Args:
         limit: Maximum number of products to return (default 10, max 50).
+        fields: Optional subset of [rank, title, link, points, comments, source].
+        columnar: Return {field: [values]} instead of one dict per item.
+        deadline_ms: Optional time budget; the result is then
+            {"items": ..., "partial": bool} and never fails for lack of time.
+        profile: Profile the source's handler if this call refreshes it
+            (see debug_last_profile).
     """
-    limit = max(1, min(limit, 50))
-    raw_items = _call_handler_safely(ph_get_top_products_handler, {"limit": limit})
-    return _normalize_items("ProductHunt", raw_items)
+    return await _feed("producthunt", limit, fields, columnar, deadline_ms, ctx, profile)
 
 
 @mcp.tool()
-async def reddit_get_top_posts(limit: int = 10) -> List[Dict[str, Any]]:
+@recorded
+async def reddit_get_top_posts(
+    limit: int = 10,
+    subreddit: str = "all",
+    sort: str = "hot",
+    window: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    columnar: bool = False,
+    deadline_ms: Optional[int] = None,
+    profile: bool = False,
+    ctx: Optional[Context] = None,
+) -> Items:
     """
-    Fetch top posts from r/all (hot) on Reddit.
+    Fetch posts from a Reddit listing (r/all, hot by default).
 
     Args:
         limit: Maximum number of posts to return (default 10, max 50).
+        subreddit: Subreddit name, or several joined with "+" (default "all").
+        sort: One of "hot", "new", "top", "rising" (default "hot").
+        window: For sort="top": "hour", "day" (default), "week", "month",
+            "year" or "all".
+        fields: Optional subset of [rank, title, link, points, comments, source].
+        columnar: Return {field: [values]} instead of one dict per item.
+        deadline_ms: Optional time budget; the result is then
+            {"items": ..., "partial": bool} and never fails for lack of time.
+        profile: Profile the source's handler if this call refreshes it
+            (see debug_last_profile).
     """
-    limit = max(1, min(limit, 50))
-    raw_items = _call_handler_safely(reddit_get_top_posts_handler, {"limit": limit})
-    return _normalize_items("Reddit", raw_items)
+    listing = ((subreddit or "all").strip().lower(), (sort or "hot").strip().lower(), window)
+    if listing == ("all", "hot", None):
+        return await _feed("reddit", limit, fields, columnar, deadline_ms, ctx, profile)
+    return await _run_tool(
+        "reddit",
+        _get_reddit_listing,
+        {"limit": limit, "subreddit": listing[0], "sort": listing[1], "window": window},
+        fields,
+        columnar,
+        deadline_ms is not None,
+        deadline_ms=deadline_ms,
+        ctx=ctx,
+        profile=profile,
+    )
 
 
 @mcp.tool()
-async def get_feed(source: str, limit: int = 10) -> List[Dict[str, Any]]:
+@recorded
+async def get_feed(
+    source: str,
+    limit: int = 10,
+    fields: Optional[List[str]] = None,
+    columnar: bool = False,
+    deadline_ms: Optional[int] = None,
+    profile: bool = False,
+    ctx: Optional[Context] = None,
+) -> Items:
     """
     Unified feed tool.
 
     Args:
-        source: One of "hackernews", "producthunt", "reddit"
+        source: One of "hackernews", "producthunt", "reddit", or the key
+            of a site configured with WEB2API_SITES, e.g. "lobsters"
         limit: Maximum number of items to return (default 10, max 50).
+        fields: Optional subset of [rank, title, link, points, comments, source].
+        columnar: Return {field: [values]} instead of one dict per item.
+        deadline_ms: Optional time budget in milliseconds.
+        profile: Profile the source's handler if this call refreshes it
+            (see debug_last_profile).
 
     Returns:
         A list of normalized items with fields:
         [rank, title, link, points, comments, source]
+        (only the requested fields), or with columnar=True a dict of
+        one list per field. With deadline_ms, {"items": <that>,
+        "partial": bool}: if time runs out, the last items we have are
+        returned with partial=true instead of an error.
     """
-    source_key = source.lower().strip()
-    limit = max(1, min(limit, 50))
+    return await _feed(_source_key(source), limit, fields, columnar, deadline_ms, ctx, profile)
 
-    if source_key == "hackernews":
-        raw = _call_handler_safely(hn_get_top_posts_handler, {"limit": limit})
-        return _normalize_items("HackerNews", raw)
-    elif source_key == "producthunt":
-        raw = _call_handler_safely(ph_get_top_products_handler, {"limit": limit})
-        return _normalize_items("ProductHunt", raw)
-    elif source_key == "reddit":
-        raw = _call_handler_safely(reddit_get_top_posts_handler, {"limit": limit})
-        return _normalize_items("Reddit", raw)
 
-    raise ValueError("Invalid source. Use one of: hackernews, producthunt, reddit.")
+@mcp.tool()
+@recorded
+async def get_feeds(
+    sources: List[str],
+    limit: int = 10,
+    fields: Optional[List[str]] = None,
+    columnar: bool = False,
+    deadline_ms: Optional[int] = None,
+    profile: bool = False,
+    ctx: Optional[Context] = None,
+) -> Dict[str, Any]:
+    """
+    Fetch several feeds at once.
+
+    Args:
+        sources: Any of the sources get_feed accepts.
+        limit: Maximum number of items per source (default 10, max 50).
+        fields: Optional subset of [rank, title, link, points, comments, source].
+        columnar: Return {field: [values]} per source instead of one dict per item.
+        deadline_ms: Optional time budget in milliseconds.
+        profile: Profile the handlers of the sources this call refreshes
+            (see debug_last_profile).
+
+    Returns:
+        {"feeds": {source: items}, "errors": {source: message}}, items as
+        get_feed returns them. Sources are fetched in parallel; with a
+        progress token, each source's items are sent as soon as it is done.
+    """
+    keys = [_source_key(source) for source in dict.fromkeys(sources)]
+    parse_fields(fields)
+    relay = _ProgressRelay.for_context(ctx)
+
+    feeds: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    pending: Dict[str, "asyncio.Future[Any]"] = {}
+    for key in keys:
+        try:
+            pending[key] = _submit(
+                key,
+                _get_items,
+                key,
+                limit,
+                fields,
+                columnar,
+                deadline_ms is not None,
+                deadline_ms=deadline_ms,
+                relay=relay,
+                profile=profile,
+            )
+        except OverloadedError as exc:
+            errors[key] = str(exc)
+
+    gathered = asyncio.gather(*pending.values(), return_exceptions=True)
+    results = await (relay.pump(gathered) if relay is not None else gathered)
+    for key, result in zip(pending, results):
+        if isinstance(result, Exception):
+            errors[key] = str(result)
+        else:
+            feeds[key] = result
+    return {"feeds": feeds, "errors": errors}
+
+
+def _register_site_tool(spec: SiteSpec) -> None:
+    """Expose a declarative site as a feed tool, like hn_get_top_posts."""
+
+    async def site_tool(
+        limit: int = 10,
+        fields: Optional[List[str]] = None,
+        columnar: bool = False,
+        deadline_ms: Optional[int] = None,
+        profile: bool = False,
+        ctx: Optional[Context] = None,
+    ) -> Items:
+        return await _feed(spec.key, limit, fields, columnar, deadline_ms, ctx, profile)
+
+    site_tool.__name__ = spec.tool_name
+    description = spec.description or f"Fetch top items from {spec.display}."
+    site_tool.__doc__ = f"""
+    {description}
+
+    Args:
+        limit: Maximum number of items to return (default 10, max 50).
+        fields: Optional subset of [rank, title, link, points, comments, source].
+        columnar: Return {{field: [values]}} instead of one dict per item.
+        deadline_ms: Optional time budget; the result is then
+            {{"items": ..., "partial": bool}} and never fails for lack of time.
+        profile: Profile the source's handler if this call refreshes it
+            (see debug_last_profile).
+    """
+    mcp.add_tool(recorded(site_tool), name=spec.tool_name)
+
+
+for _spec in SITES.values():
+    _register_site_tool(_spec)
+
+
+@mcp.tool()
+@recorded
+async def hn_get_comments(
+    item_id: int,
+    max_depth: int = 3,
+    max_comments: int = 100,
+    deadline_ms: Optional[int] = None,
+    profile: bool = False,
+    ctx: Optional[Context] = None,
+) -> Dict[str, Any]:
+    """
+    Fetch the discussion of a Hacker News story as a comment tree.
+
+    Args:
+        item_id: Hacker News item id (the "id=" in an item link).
+        max_depth: Deepest reply level to include (default 3, max 10).
+        max_comments: Maximum number of comments to return (default 100, max 500).
+        deadline_ms: Optional time budget in milliseconds; comments fetched
+            by then are returned with "partial": true.
+        profile: Profile the handler call (see debug_last_profile).
+
+    Returns:
+        The story's [id, title, link, points, by, descendants] plus
+        "comments" (nested [id, by, time, text, depth, replies]),
+        "comment_count", "truncated" and "partial". With a progress token,
+        each depth level is sent as soon as it is fetched.
+    """
+    return await _run_tool(
+        "hn_comments",
+        _get_comments,
+        {"item_id": item_id, "max_depth": max_depth, "max_comments": max_comments},
+        deadline_ms=deadline_ms,
+        ctx=ctx,
+        profile=profile,
+    )
+
+
+@mcp.tool()
+@recorded
+async def fetch_articles(
+    links: List[str],
+    max_bytes: int = 500_000,
+    timeout: float = 10.0,
+    deadline_ms: Optional[int] = None,
+    profile: bool = False,
+    ctx: Optional[Context] = None,
+) -> Items:
+    """
+    Download the articles behind feed items and extract their main text.
+
+    Args:
+        links: Article URLs, e.g. the "link" fields returned by get_feed (max 50).
+        max_bytes: Per-article download cap in bytes (default 500000).
+        timeout: Per-request timeout in seconds (default 10).
+        deadline_ms: Optional time budget for the whole call in milliseconds.
+        profile: Profile the handler call (see debug_last_profile).
+
+    Returns:
+        One item per unique link with fields:
+        [link, title, text, bytes, truncated, error, error_type]
+        With deadline_ms, {"items": <that list>, "partial": bool}; links
+        not fetched in time have error_type "DeadlineExceededError". With a
+        progress token, each article is sent as soon as it is done.
+    """
+    return await _run_tool(
+        "articles",
+        _get_articles,
+        {"links": links, "max_bytes": max_bytes, "timeout": timeout},
+        deadline_ms is not None,
+        deadline_ms=deadline_ms,
+        ctx=ctx,
+        total=min(len(set(links)), 50),
+        profile=profile,
+    )
+
+
+@mcp.tool()
+async def debug_last_profile(limit: int = 20, sort: str = "cumulative") -> Dict[str, Any]:
+    """
+    Summarize the most recent profiled tool call in this server process.
+
+    Calls are profiled when made with profile=true, or for the tools named
+    in WEB2API_PROFILE ("all" for every tool).
+
+    Args:
+        limit: Number of functions to list (default 20).
+        sort: "cumulative" (default), "tottime" or "calls".
+
+    Returns:
+        [tool, path, started, duration_ms, error, total_calls, sort] and
+        "functions": the top functions with [function, calls, tottime_ms,
+        cumtime_ms]. `path` is the full .prof file, for pstats or snakeviz.
+    """
+    last = profiling.last_profile()
+    if last is None:
+        raise RuntimeError(
+            "No profile recorded yet. Call a tool with profile=true, or set WEB2API_PROFILE."
+        )
+    return last.summary(max(1, min(limit, 200)), sort)
 
 
 def main() -> None:
     """
     Entry point for running the MCP server over stdio.
+
+    Warmup (connections, snapshot prefetch; see mcp_server.warmup), when
+    enabled, runs in the background, so the handshake is not delayed.
     """
+    start_warmup()
     try:
         mcp.run(transport="stdio")
     except Exception:
@@ -0,0 +1,275 @@
+"""
+shared_cache.py
+
+Cross-process snapshot cache backed by a local SQLite file.
+
+Lets several web_app workers and every `mcp_server.mcp_server` stdio process
+on a machine share one set of snapshots:
+
+- snapshots are written in a single transaction, so readers never see a
+  half-written feed (WAL mode keeps readers and the writer from blocking)
+- before fetching upstream, a process must win a short-lived lease for
+  that source; everyone else waits for the winner's result instead of
+  scraping the same page in parallel
+
+Enable it with WEB2API_SHARED_CACHE=/path/to/cache.db (or "1" for the
+default path under ~/.cache/web2api/).
+
+Every new version of a snapshot is also appended to a history table, kept
+for WEB2API_SNAPSHOT_HISTORY_DAYS (default 2; 0 turns history off), for
+bulk export with `python3 -m mcp_server.export`, which opens the file with
+`SharedSnapshotCache.open_readonly()`.
+"""
+
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+from .snapshots import Snapshot
+from .utils import jsonio
+from .utils.settings import env_float, env_str
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "web2api", "snapshots.db")
+
+# How long past versions of each snapshot are kept, in days.
+HISTORY_DAYS = env_float("WEB2API_SNAPSHOT_HISTORY_DAYS", 2.0)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    source     TEXT PRIMARY KEY,
+    version    TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    items      TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS history (
+    source     TEXT NOT NULL,
+    version    TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    items      TEXT NOT NULL,
+    PRIMARY KEY (source, fetched_at)
+);
+CREATE INDEX IF NOT EXISTS history_fetched_at ON history (fetched_at);
+CREATE TABLE IF NOT EXISTS leases (
+    source     TEXT PRIMARY KEY,
+    owner      TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+class SharedSnapshotCache:
+    """
+    SQLite-backed snapshot table plus per-source refresh leases.
+
+    With readonly=True the file must already exist and is opened read-only:
+    nothing is created or written (see `open_readonly()`).
+    """
+
+    def __init__(self, path: str, history_days: float = HISTORY_DAYS, readonly: bool = False) -> None:
+        self.path = path
+        self.history_days = history_days
+        self.readonly = readonly
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._local = threading.local()
+        if readonly:
+            self._conn()
+            return
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+
+    @classmethod
+    def open_readonly(cls, path: str) -> "SharedSnapshotCache":
+        """
+        Open an existing cache file for reading only, e.g. for export.
+
+        Raises:
+            sqlite3.Error: if the file doesn't exist, can't be read or has no
+            snapshot tables.
+        """
+        cache = cls(path, readonly=True)
+        tables = {
+            name
+            for (name,) in cache._conn().execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+        missing = {"snapshots", "history"} - tables
+        if missing:
+            raise sqlite3.DatabaseError(f"no {', '.join(sorted(missing))} table in {path}; not a snapshot cache")
+        return cache
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.readonly:
+            uri = f"{Path(self.path).absolute().as_uri()}?mode=ro"
+            return sqlite3.connect(uri, uri=True, timeout=10.0, isolation_level=None)
+        return sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared across threads.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            conn.execute("PRAGMA busy_timeout=10000")
+            if not self.readonly:
+                conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def load(self, source: str) -> Optional[Snapshot]:
+        row = self._conn().execute(
+            "SELECT version, fetched_at, expires_at, items FROM snapshots WHERE source = ?",
+            (source,),
+        ).fetchone()
+        if row is None:
+            return None
+        version, fetched_at, expires_at, items = row
+        return Snapshot(source, jsonio.loads(items), version, fetched_at, expires_at)
+
+    def save(self, snapshot: Snapshot) -> None:
+        """
+        Atomically replace a source's snapshot and release our lease; a new
+        version is also appended to the history.
+        """
+        items = jsonio.dumps(snapshot.items)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self.history_days > 0:
+                self._append_history(conn, snapshot, items)
+            conn.execute(
+                "INSERT INTO snapshots (source, version, fetched_at, expires_at, items) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(source) DO UPDATE SET version = excluded.version, "
+                "fetched_at = excluded.fetched_at, expires_at = excluded.expires_at, "
+                "items = excluded.items",
+                (snapshot.source, snapshot.version, snapshot.fetched_at, snapshot.expires_at, items),
+            )
+            conn.execute(
+                "DELETE FROM leases WHERE source = ? AND owner = ?", (snapshot.source, self.owner)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _append_history(self, conn: sqlite3.Connection, snapshot: Snapshot, items: str) -> None:
+        row = conn.execute(
+            "SELECT version FROM snapshots WHERE source = ?", (snapshot.source,)
+        ).fetchone()
+        if row is not None and row[0] == snapshot.version:
+            return
+        conn.execute(
+            "INSERT OR IGNORE INTO history (source, version, fetched_at, expires_at, items) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (snapshot.source, snapshot.version, snapshot.fetched_at, snapshot.expires_at, items),
+        )
+        conn.execute(
+            "DELETE FROM history WHERE fetched_at < ?",
+            (snapshot.fetched_at - self.history_days * 86400.0,),
+        )
+
+    def iter_snapshots(
+        self,
+        sources: Optional[Sequence[str]] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        history: bool = True,
+        batch_size: int = 100,
+    ) -> Iterator[Snapshot]:
+        """
+        Yield stored snapshots, oldest first, `batch_size` rows at a time.
+
+        With `history`, every stored version of each source; otherwise just
+        the current snapshots. `since`/`until` bound fetched_at (epoch
+        seconds, until exclusive). Rows are read from one transaction on a
+        dedicated connection, so a long export sees a consistent view and
+        never holds more than a batch in memory.
+        """
+        clauses = []
+        params: list = []
+        if sources:
+            clauses.append(f"source IN ({', '.join('?' * len(sources))})")
+            params.extend(sources)
+        if since is not None:
+            clauses.append("fetched_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("fetched_at < ?")
+            params.append(until)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        table = "history" if history else "snapshots"
+
+        conn = self._connect()
+        try:
+            # One read transaction for the whole export.
+            conn.execute("BEGIN")
+            cursor = conn.execute(
+                f"SELECT source, version, fetched_at, expires_at, items FROM {table}"
+                f"{where} ORDER BY fetched_at, source",
+                params,
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for source, version, fetched_at, expires_at, items in rows:
+                    yield Snapshot(source, jsonio.loads(items), version, fetched_at, expires_at)
+        finally:
+            conn.close()
+
+    def try_acquire_lease(self, source: str, ttl: float) -> bool:
+        """
+        Try to become the single process refreshing `source`.
+
+        Succeeds if nobody holds the lease, it has expired, or we already
+        hold it. The lease expires on its own if the holder dies.
+        """
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.execute(
+                "INSERT INTO leases (source, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(source) DO UPDATE SET owner = excluded.owner, "
+                "expires_at = excluded.expires_at "
+                "WHERE leases.expires_at < ? OR leases.owner = excluded.owner",
+                (source, self.owner, now + ttl, now),
+            )
+            acquired = cursor.rowcount == 1
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return acquired
+
+    def release_lease(self, source: str) -> None:
+        self._conn().execute(
+            "DELETE FROM leases WHERE source = ? AND owner = ?", (source, self.owner)
+        )
+
+
+def from_env() -> Optional[SharedSnapshotCache]:
+    """Build the shared cache configured by WEB2API_SHARED_CACHE, if any."""
+    setting = env_str("WEB2API_SHARED_CACHE")
+    if setting is None or setting.lower() in ("0", "false", "no", "off"):
+        return None
+    path = DEFAULT_PATH if setting.lower() in ("1", "true", "yes", "on") else setting
+    try:
+        return SharedSnapshotCache(path)
+    except (OSError, sqlite3.Error) as exc:
+        logger.warning("Shared snapshot cache at %s unavailable, using in-process cache: %s", path, exc)
+        return None
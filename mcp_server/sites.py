@@ -0,0 +1,191 @@
+"""
+sites.py
+
+Declarative site adapters.
+
+A `SiteSpec` describes a listing page the way the hand-written adapters
+scrape one: the page URL, a CSS selector matching one element per item,
+and for each field of an item a selector (relative to that element), the
+attribute to read and a parser. adapters/declarative.py compiles a spec
+into an extraction plan the first time it is used.
+
+Every spec in SITES is registered automatically: as a tool in tools.py, as
+a snapshot source (so get_feed, the web app and live updates serve it), and
+as an MCP tool. Fetching, pooling, caching and metrics come from the shared
+infrastructure; adding a site is a matter of listing its spec in the JSON
+file named by WEB2API_SITES (examples/sites.json has one for Lobsters):
+
+    [{"key": "example", "display": "Example", "url": "https://news.example.com/",
+      "rows": "li.story",
+      "fields": {"title": "a.title",
+                 "link": {"selector": "a.title", "attr": "href", "parse": "url"},
+                 "points": {"selector": ".score", "parse": "int"}}}]
+
+A spec in the file replaces a built-in spec with the same key. Specs are
+checked when loaded; one with a bad selector, or whose key or tool name
+is taken by a hand-written adapter, is skipped with a warning.
+
+This module only holds data, so importing it stays cheap.
+"""
+
+import json
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional
+
+from .utils.settings import env_str
+
+
+logger = logging.getLogger(__name__)
+
+# Parsers a field may name; implemented in adapters/declarative.py.
+#   text: the stripped text (None if empty)
+#   int:  the first integer in the text, e.g. "1,204 points" -> 1204
+#   url:  the value resolved against the page URL
+PARSERS = ("text", "int", "url")
+
+_KEY_RE = re.compile(r"^[a-z][a-z0-9_]*$")
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    # Selector relative to the item element; None means the element itself.
+    selector: Optional[str] = None
+    # Attribute to read; None means the element's text.
+    attr: Optional[str] = None
+    parse: str = "text"
+
+
+@dataclass(frozen=True)
+class SiteSpec:
+    key: str
+    display: str
+    url: str
+    rows: str
+    fields: Mapping[str, FieldSpec]
+    description: str = ""
+    # Bump when the spec changes, so memoized extractions are not reused.
+    version: str = "1"
+    max_items: int = 50
+
+    @property
+    def tool_name(self) -> str:
+        return f"{self.key}_get_top_posts"
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "SiteSpec":
+        """
+        Build a spec from its JSON form (fields given as dicts, or as a bare
+        selector string for plain text fields).
+
+        Raises:
+            ValueError: if the spec is incomplete or names an unknown parser.
+        """
+        try:
+            fields = {
+                name: FieldSpec(selector=value) if isinstance(value, str) else FieldSpec(**value)
+                for name, value in data["fields"].items()
+            }
+            spec = cls(
+                key=data["key"],
+                display=data.get("display") or data["key"],
+                url=data["url"],
+                rows=data["rows"],
+                fields=fields,
+                description=data.get("description", ""),
+                version=str(data.get("version", "1")),
+                max_items=int(data.get("max_items", 50)),
+            )
+        except (KeyError, TypeError) as exc:
+            raise ValueError(f"Invalid site spec: {exc}") from exc
+        spec.validate()
+        return spec
+
+    def validate(self) -> None:
+        if not _KEY_RE.match(self.key):
+            raise ValueError(f"Invalid site key {self.key!r}")
+        if "title" not in self.fields:
+            raise ValueError(f"Site {self.key!r} has no 'title' field")
+        for name, spec in self.fields.items():
+            if spec.parse not in PARSERS:
+                raise ValueError(f"Site {self.key!r} field {name!r}: unknown parser {spec.parse!r}")
+
+
+# Sites served by default. None yet: sites are opt-in through WEB2API_SITES
+# (examples/sites.json has a Lobsters spec to start from). Specs here are
+# validated at import, which loads soupsieve (see _check_selectors).
+BUILTIN_SITES: List[SiteSpec] = []
+
+
+def load_sites(path: Optional[str]) -> List[SiteSpec]:
+    """Read specs from a JSON file (a list of spec objects); bad ones are skipped."""
+    if not path:
+        return []
+    try:
+        with open(path, "rb") as f:
+            entries = json.load(f)
+    except (OSError, ValueError) as exc:
+        logger.warning("Cannot read site specs from %s: %s", path, exc)
+        return []
+    specs = []
+    for entry in entries if isinstance(entries, list) else []:
+        try:
+            specs.append(SiteSpec.from_dict(entry))
+        except ValueError as exc:
+            logger.warning("Skipping site spec in %s: %s", path, exc)
+    return specs
+
+
+def _check_selectors(spec: SiteSpec) -> None:
+    """
+    Compile every selector of a spec, so a typo fails at load time rather
+    than on the first call.
+
+    Raises:
+        ValueError: if a selector doesn't parse.
+    """
+    # Deferred: soupsieve imports BeautifulSoup, which startup avoids
+    # unless there are sites to check.
+    import soupsieve  # type: ignore
+
+    selectors = [spec.rows] + [field.selector for field in spec.fields.values() if field.selector]
+    for selector in selectors:
+        try:
+            soupsieve.compile(selector)
+        except soupsieve.SelectorSyntaxError as exc:
+            raise ValueError(f"invalid selector {selector!r}: {exc}") from exc
+
+
+def _collect(specs: List[SiteSpec], reserved: List[str], reserved_tools: List[str]) -> Dict[str, SiteSpec]:
+    sites: Dict[str, SiteSpec] = {}
+    for spec in specs:
+        if spec.key in reserved:
+            logger.warning("Skipping site spec %r: source already defined", spec.key)
+            continue
+        if spec.tool_name in reserved_tools:
+            logger.warning("Skipping site spec %r: tool %r already defined", spec.key, spec.tool_name)
+            continue
+        try:
+            _check_selectors(spec)
+        except ValueError as exc:
+            logger.warning("Skipping site spec %r: %s", spec.key, exc)
+            continue
+        sites[spec.key] = spec
+    return sites
+
+
+# Keys taken by the hand-written adapters, and the tools registered for
+# them in tools.py.
+_BUILTIN_SOURCES = ["hackernews", "producthunt", "reddit"]
+_BUILTIN_TOOLS = [
+    "hn_get_top_posts",
+    "ph_get_top_products",
+    "reddit_get_top_posts",
+    "hn_get_comments",
+    "fetch_articles",
+]
+
+SITES: Dict[str, SiteSpec] = _collect(
+    BUILTIN_SITES + load_sites(env_str("WEB2API_SITES")), _BUILTIN_SOURCES, _BUILTIN_TOOLS
+)
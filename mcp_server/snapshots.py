@@ -0,0 +1,432 @@
+"""
+snapshots.py
+
+Cached, versioned snapshots of each source's normalized feed.
+
+A snapshot is the full normalized item list for one source (fetched at
+SNAPSHOT_LIMIT items), tagged with a content-hash `version`. Callers slice
+it to the limit they need, so every limit for a source shares one upstream
+fetch. Concurrent refreshes of the same source are collapsed into one.
+
+Each source's TTL adapts to how often its content actually changes (see
+AdaptiveTTL): volatile feeds are refreshed often, static ones back off.
+
+With a shared backend (see shared_cache.py) the collapsing extends across
+processes: fresh snapshots written by another process are reused, and only
+the process holding a source's lease fetches it upstream.
+"""
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from . import tools
+from .sites import SITES
+from .utils import deadline, jsonio, metrics
+from .utils.errors import DeadlineExceededError
+from .utils.settings import env_float
+
+if TYPE_CHECKING:
+    from .shared_cache import SharedSnapshotCache
+
+
+# source key -> (display name used in the "source" field, tool name)
+SOURCES: Dict[str, tuple] = {
+    "hackernews": ("HackerNews", "hn_get_top_posts"),
+    "producthunt": ("ProductHunt", "ph_get_top_products"),
+    "reddit": ("Reddit", "reddit_get_top_posts"),
+}
+# Declarative sites (see sites.py) are sources like any other.
+SOURCES.update((key, (spec.display, spec.tool_name)) for key, spec in SITES.items())
+
+# Fields of a normalized item, in output order.
+FIELDS = ("rank", "title", "link", "points", "comments", "source")
+
+# Fields that identify an item. Points and comment counts move on almost
+# every poll, so they don't count as new content for the adaptive TTL.
+IDENTITY_FIELDS = ("title", "link")
+
+# Tools clamp `limit` to 50, so a snapshot at 50 covers every request.
+SNAPSHOT_LIMIT = 50
+
+DEFAULT_TTL = env_float("WEB2API_SNAPSHOT_TTL", 60.0)
+
+# Bounds for the adaptive TTL of the process-wide store. Setting both to
+# the same value gives a fixed TTL. By default a busy source is polled no
+# more often than before adaptive TTLs; set a lower minimum to opt in.
+MIN_TTL = env_float("WEB2API_SNAPSHOT_TTL_MIN", DEFAULT_TTL)
+MAX_TTL = env_float("WEB2API_SNAPSHOT_TTL_MAX", DEFAULT_TTL * 10)
+
+# How long a process may hold a source's refresh lease, and how long other
+# processes wait for the holder's result before fetching themselves.
+LEASE_TTL = 15.0
+LEASE_POLL_INTERVAL = 0.1
+
+
+class SnapshotError(Exception):
+    """Raised when a source can't be fetched; carries the handler's error dict."""
+
+    def __init__(self, error: str, details: Optional[str] = None) -> None:
+        super().__init__(f"{error}. {details or ''}".strip())
+        self.error = error
+        self.details = details
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """One fetched feed. `items` must be treated as read-only."""
+
+    source: str
+    items: List[Dict[str, Any]]
+    version: str
+    fetched_at: float
+    expires_at: float
+
+    def head(self, limit: int) -> List[Dict[str, Any]]:
+        return self.items[: max(0, limit)]
+
+    def ttl_remaining(self) -> float:
+        return max(0.0, self.expires_at - time.time())
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+def normalize_items(source: str, raw_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Normalize different adapter outputs into a common schema.
+
+    Output item shape:
+      {
+          "rank": int,
+          "title": str,
+          "link": str,
+          "points": int | None,
+          "comments": int | None,
+          "source": str,   # e.g., "HackerNews", "ProductHunt", "Reddit"
+      }
+    """
+    normalized: List[Dict[str, Any]] = []
+    rank_counter = 1
+
+    for item in raw_items:
+        title = (
+            item.get("title")
+            or item.get("name")
+            or "(no title)"
+        )
+        link = (
+            item.get("link")
+            or item.get("url")
+            or item.get("discussion_url")
+            or ""
+        )
+        points = (
+            item.get("points")
+            or item.get("score")
+            or item.get("votes")
+            or item.get("votes_count")
+        )
+        comments = (
+            item.get("comments")
+            or item.get("num_comments")
+            or item.get("comments_count")
+        )
+
+        normalized.append(
+            {
+                "rank": item.get("rank", rank_counter),
+                "title": title,
+                "link": link,
+                "points": points,
+                "comments": comments,
+                "source": source,
+            }
+        )
+        rank_counter += 1
+
+    return normalized
+
+
+def parse_fields(fields: Optional[Any]) -> Optional[List[str]]:
+    """
+    Validate a field projection given as a list or comma-separated string.
+
+    Returns None for "all fields". Raises ValueError on unknown fields.
+    """
+    if fields is None or fields == "" or fields == []:
+        return None
+    names = fields.split(",") if isinstance(fields, str) else list(fields)
+    names = [str(name).strip() for name in names if str(name).strip()]
+    unknown = [name for name in names if name not in FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}. Use: {', '.join(FIELDS)}")
+    return names or None
+
+
+def project(items: List[Dict[str, Any]], fields: Optional[List[str]]) -> List[Dict[str, Any]]:
+    """Return items restricted to `fields` (all fields when None)."""
+    if fields is None:
+        return items
+    return [{name: item.get(name) for name in fields} for item in items]
+
+
+def to_columns(items: List[Dict[str, Any]], fields: Optional[List[str]]) -> Dict[str, List[Any]]:
+    """
+    Return items as one list per field ({field: [value, ...]}).
+
+    Field names appear once instead of once per item, which keeps large
+    feeds small for clients that pay per token.
+    """
+    names = fields if fields is not None else list(FIELDS)
+    return {name: [item.get(name) for item in items] for name in names}
+
+
+def content_version(items: List[Dict[str, Any]]) -> str:
+    """Return a short, stable hash of the items' content."""
+    payload = jsonio.dumps_bytes(items, sort_keys=True)
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+
+def identity_version(items: List[Dict[str, Any]]) -> str:
+    """Return a short hash of which items a feed lists, and in what order."""
+    payload = jsonio.dumps_bytes([[item.get(name) for name in IDENTITY_FIELDS] for item in items])
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+
+def fetch_snapshot(source: str, ttl: float = DEFAULT_TTL) -> Snapshot:
+    """Fetch a source through its tool handler and wrap it as a Snapshot."""
+    display, tool_name = SOURCES[source]
+    result = tools.call_tool(tool_name, {"limit": SNAPSHOT_LIMIT})
+    if isinstance(result, dict) and result.get("error"):
+        raise SnapshotError(result["error"], result.get("details"))
+
+    items = normalize_items(display, list(result))
+    now = time.time()
+    return Snapshot(
+        source=source,
+        items=items,
+        version=content_version(items),
+        fetched_at=now,
+        expires_at=now + ttl,
+    )
+
+
+class AdaptiveTTL:
+    """
+    A source's TTL, adjusted after every refresh by whether it changed.
+
+    A refresh that finds new or reordered items (see identity_version)
+    shrinks the TTL; one that finds the same items grows it, always within
+    [min_ttl, max_ttl]. A source that
+    changes on every poll converges to min_ttl, a static one to max_ttl.
+    """
+
+    SHRINK = 0.5
+    GROW = 1.5
+
+    def __init__(self, initial: float, min_ttl: float, max_ttl: float) -> None:
+        self.min_ttl = min(min_ttl, max_ttl)
+        self.max_ttl = max(min_ttl, max_ttl)
+        self.ttl = min(self.max_ttl, max(self.min_ttl, initial))
+        self.changed = 0
+        self.unchanged = 0
+
+    def observe(self, changed: bool) -> float:
+        """Record one refresh outcome and return the new TTL."""
+        if changed:
+            self.changed += 1
+            self.ttl = max(self.min_ttl, self.ttl * self.SHRINK)
+        else:
+            self.unchanged += 1
+            self.ttl = min(self.max_ttl, self.ttl * self.GROW)
+        return self.ttl
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ttl": round(self.ttl, 3),
+            "min_ttl": self.min_ttl,
+            "max_ttl": self.max_ttl,
+            "changed": self.changed,
+            "unchanged": self.unchanged,
+        }
+
+
+class SnapshotStore:
+    """
+    In-process snapshot cache with single-flight refresh per source.
+
+    Listeners added with `add_listener()` are called after every refresh
+    with (new snapshot, previous snapshot or None). They run under the
+    source's refresh lock, so they must be quick and must not call back
+    into the store.
+
+    `ttl` is the starting TTL of every source. With `min_ttl`/`max_ttl`
+    given, each source's TTL then adapts within those bounds; by default
+    it stays fixed at `ttl`.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        fetcher: Callable[[str, float], Snapshot] = fetch_snapshot,
+        shared: Optional["SharedSnapshotCache"] = None,
+        min_ttl: Optional[float] = None,
+        max_ttl: Optional[float] = None,
+    ) -> None:
+        self.ttl = ttl
+        self._fetcher = fetcher
+        self.shared = shared
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._locks: Dict[str, threading.Lock] = {source: threading.Lock() for source in SOURCES}
+        self._ttls: Dict[str, AdaptiveTTL] = {
+            source: AdaptiveTTL(
+                ttl,
+                ttl if min_ttl is None else min_ttl,
+                ttl if max_ttl is None else max_ttl,
+            )
+            for source in SOURCES
+        }
+        self._listeners: List[Callable[[Snapshot, Optional[Snapshot]], None]] = []
+        self.refreshes = 0
+
+    def add_listener(self, listener: Callable[[Snapshot, Optional[Snapshot]], None]) -> None:
+        self._listeners.append(listener)
+
+    def current_ttl(self, source: str) -> float:
+        return self._ttls[source].ttl
+
+    def peek(self, source: str) -> Optional[Snapshot]:
+        """Return the current snapshot (fresh or not) without fetching."""
+        return self._snapshots.get(source)
+
+    def cached(self, source: str) -> Optional[Snapshot]:
+        """
+        Return a fresh snapshot from this process or the shared cache, or
+        None. Never fetches.
+        """
+        snapshot = self._snapshots.get(source)
+        if snapshot is not None and snapshot.fresh:
+            return snapshot
+        if self.shared is None:
+            return None
+        snapshot = self.shared.load(source)
+        if snapshot is None or not snapshot.fresh:
+            return None
+        with self._locks[source]:
+            self._adopt(snapshot)
+        return snapshot
+
+    def get(self, source: str) -> Snapshot:
+        """
+        Return a fresh snapshot for source, refreshing it if needed.
+
+        Waiting for another caller's refresh (in this process or, with a
+        shared backend, another one) is bounded by the caller's deadline
+        (see utils/deadline.py).
+
+        Raises:
+            KeyError: for unknown sources.
+            SnapshotError: if the refresh fails.
+            DeadlineExceededError: if the deadline runs out while waiting.
+        """
+        snapshot = self._snapshots.get(source)
+        if snapshot is not None and snapshot.fresh:
+            return snapshot
+
+        lock = self._locks[source]
+        left = deadline.remaining()
+        if not lock.acquire(timeout=-1 if left is None else max(0.0, left)):
+            raise DeadlineExceededError(f"Deadline exceeded waiting for the {source} refresh")
+        try:
+            # Another caller may have refreshed while we waited for the lock.
+            snapshot = self._snapshots.get(source)
+            if snapshot is not None and snapshot.fresh:
+                return snapshot
+            if self.shared is None:
+                return self._refresh_locked(source)
+            return self._get_shared_locked(source)
+        finally:
+            lock.release()
+
+    def refresh(self, source: str) -> Snapshot:
+        """Force a refresh regardless of TTL."""
+        with self._locks[source]:
+            return self._refresh_locked(source)
+
+    def _get_shared_locked(self, source: str) -> Snapshot:
+        """Reuse another process's fresh snapshot, or win the lease and fetch."""
+        assert self.shared is not None
+        give_up_at = time.monotonic() + LEASE_TTL
+        while True:
+            snapshot = self.shared.load(source)
+            if snapshot is not None and snapshot.fresh:
+                self._adopt(snapshot)
+                return snapshot
+            if self.shared.try_acquire_lease(source, LEASE_TTL):
+                try:
+                    # The previous holder may have saved between our load
+                    # and the lease becoming free.
+                    snapshot = self.shared.load(source)
+                    if snapshot is not None and snapshot.fresh:
+                        self._adopt(snapshot)
+                        return snapshot
+                    return self._refresh_locked(source)
+                finally:
+                    self.shared.release_lease(source)
+            if time.monotonic() >= give_up_at:
+                # The lease holder is stuck; its lease is about to expire anyway.
+                return self._refresh_locked(source)
+            left = deadline.remaining()
+            if left is not None and left <= 0:
+                raise DeadlineExceededError(f"Deadline exceeded waiting for another process's {source} refresh")
+            time.sleep(LEASE_POLL_INTERVAL if left is None else min(LEASE_POLL_INTERVAL, left))
+
+    def _adopt(self, snapshot: Snapshot) -> None:
+        previous = self._snapshots.get(snapshot.source)
+        self._snapshots[snapshot.source] = snapshot
+        for listener in self._listeners:
+            listener(snapshot, previous)
+
+    def _refresh_locked(self, source: str) -> Snapshot:
+        adaptive = self._ttls[source]
+        previous = self._snapshots.get(source)
+        if self.shared is not None:
+            # Another process may have refreshed since we last adopted.
+            previous = self.shared.load(source) or previous
+
+        snapshot = self._fetcher(source, adaptive.ttl)
+        self.refreshes += 1
+        if previous is not None:
+            ttl = adaptive.observe(identity_version(snapshot.items) != identity_version(previous.items))
+            snapshot = replace(snapshot, expires_at=snapshot.fetched_at + ttl)
+        if self.shared is not None:
+            self.shared.save(snapshot)
+        self._adopt(snapshot)
+        return snapshot
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "refreshes": self.refreshes,
+            "ttl": {source: adaptive.stats() for source, adaptive in self._ttls.items()},
+        }
+
+
+_store: Optional[SnapshotStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> SnapshotStore:
+    """Return the process-wide snapshot store."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                from .shared_cache import from_env
+
+                _store = SnapshotStore(shared=from_env(), min_ttl=MIN_TTL, max_ttl=MAX_TTL)
+                metrics.register("snapshots", _store.stats)
+    return _store
@@ -12,40 +12,52 @@ It just:
 Example request (stdin):
     {"tool": "hn_get_top_posts", "args": {"limit": 5}}
 
+Responses are compact JSON; add "pretty": true to the request to get
+indented output. With WEB2API_RECORD set, each tool call is appended to
+that trace file (see mcp_server.utils.recorder). Add "profile": true to
+run the handler under cProfile; the response then carries a "profile"
+summary of the top functions (see mcp_server.utils.profiling).
+
 Example run:
     echo '{"tool": "hn_get_top_posts", "args": {"limit": 3}}' | python3 -m mcp_server.stdio_server
 """
 
-import json
 import sys
 from typing import Any, Dict
 
-from .tools import get_tool_registry, get_tool_manifest
+from .tools import call_tool, get_tool_manifest, get_tool_map
+from .utils import jsonio, profiling
 
 
 def main() -> None:
     # Build tool lookup map
-    tools = get_tool_registry()
-    tool_map = {t.name: t for t in tools}
+    tool_map = get_tool_map()
 
     # Read all data from stdin
     raw_input = sys.stdin.read().strip()
     if not raw_input:
         error = {"ok": False, "error": "No input received on stdin"}
-        print(json.dumps(error, ensure_ascii=False))
+        print(jsonio.dumps(error))
         return
 
     try:
-        request: Dict[str, Any] = json.loads(raw_input)
-    except json.JSONDecodeError as exc:
+        request: Dict[str, Any] = jsonio.loads(raw_input)
+    except jsonio.JSONDecodeError as exc:
         error = {
             "ok": False,
             "error": "Invalid JSON in request",
             "details": str(exc),
         }
-        print(json.dumps(error, ensure_ascii=False))
+        print(jsonio.dumps(error))
+        return
+
+    if not isinstance(request, dict):
+        print(jsonio.dumps({"ok": False, "error": "Request must be a JSON object"}))
         return
 
+    pretty = bool(request.get("pretty", False))
+    profile = bool(request.get("profile", False))
+
     # Support a simple "list_tools" command for discovery
     command = request.get("command")
     if command == "list_tools":
@@ -55,11 +67,9 @@ def main() -> None:
             "command": "list_tools",
             "manifest": manifest,
         }
-        print(json.dumps(response, ensure_ascii=False, indent=2))
+        print(jsonio.dumps(response, indent=pretty))
         return
 
-
-
     tool_name = request.get("tool")
     args = request.get("args", {})
 
@@ -69,23 +79,21 @@ def main() -> None:
             "error": f"Unknown tool {tool_name!r}",
             "available_tools": list(tool_map.keys()),
         }
-        print(json.dumps(error, ensure_ascii=False))
+        print(jsonio.dumps(error))
         return
 
-    tool = tool_map[tool_name]
-
     # Ensure args is a dict
     if not isinstance(args, dict):
         error = {
             "ok": False,
             "error": "Request 'args' must be an object/dict",
         }
-        print(json.dumps(error, ensure_ascii=False))
+        print(jsonio.dumps(error))
         return
 
-    # Call the handler
+    # Call the handler (profiled and recorded as requested; see tools.call_tool)
     try:
-        result = tool.handler(args)
+        result = call_tool(tool_name, args, profile=profile, record=True)
         response: Dict[str, Any] = {
             "ok": True,
             "tool": tool_name,
@@ -98,7 +106,11 @@ def main() -> None:
             "details": str(exc),
         }
 
-    print(json.dumps(response, ensure_ascii=False, indent=2))
+    last = profiling.last_profile()
+    if profile and last is not None:
+        response["profile"] = last.summary()
+
+    print(jsonio.dumps(response, indent=pretty))
 
 
 if __name__ == "__main__":
@@ -11,19 +11,22 @@ Later, these will be wired into a real MCP server implementation.
 tools.py
 
 Defines the tools that the Web2API MCP Agent will expose.
+
+Importing this module is cheap on purpose: tools are registered by metadata
+only, and adapter modules (plus requests/BeautifulSoup behind them) are
+imported the first time a handler actually runs. That keeps the MCP
+handshake fast for clients like Claude Desktop.
 """
 
+import importlib
+import time
 from dataclasses import dataclass
 from typing import Any, Callable, Dict, List, Optional
 
-# Now that we're always importing through the `mcp_server` package,
-# these simple relative imports are safe.
-from .adapters.hackernews import fetch_top_posts
-from .adapters.producthunt import fetch_top_products
-from .adapters.reddit import fetch_top_posts as reddit_fetch_top_posts
-from .utils.http_client import HttpError
-
-
+from .sites import SITES, SiteSpec
+from .utils import profiling
+from .utils.errors import HttpError
+from .utils.recorder import get_recorder
 
 
 @dataclass
@@ -44,6 +47,11 @@ class Tool:
     args_schema: Optional[Dict[str, Any]] = None
 
 
+def _adapter(module: str, attr: str) -> Callable[..., Any]:
+    """Import `mcp_server.adapters.<module>` on first use and return `attr`."""
+    return getattr(importlib.import_module(f".adapters.{module}", __package__), attr)
+
+
 # --- Handlers ------------------------------------------------------------- #
 
 
@@ -66,7 +74,7 @@ def hn_get_top_posts_handler(args: Dict[str, Any]) -> Any:
         limit = 10
 
     try:
-        posts = fetch_top_posts(limit=limit)
+        posts = _adapter("hackernews", "fetch_top_posts")(limit=limit)
     except HttpError as exc:
         return {
             "error": "Failed to fetch Hacker News posts",
@@ -95,7 +103,7 @@ def ph_get_top_products_handler(args: Dict[str, Any]) -> Any:
         limit = 10
 
     try:
-        products = fetch_top_products(limit=limit)
+        products = _adapter("producthunt", "fetch_top_products")(limit=limit)
     except HttpError as exc:
         return {
             "error": "Failed to fetch Product Hunt products",
@@ -109,8 +117,11 @@ def reddit_get_top_posts_handler(args: Dict[str, Any]) -> Any:
     """
     Handler for Reddit tool.
 
-    - Reads 'limit' from args (default 10)
-    - Uses the Reddit adapter to fetch live data from r/all (hot)
+    - Reads 'limit' (default 10) and optional 'subreddit' (default "all"),
+      'sort' (hot/new/top/rising, default "hot") and 'window' (for "top")
+      from args
+    - Uses the Reddit adapter to fetch live data through its size-bounded
+      listing cache
     - Returns a list of posts (JSON-serializable)
     """
     raw_limit = args.get("limit", 10)
@@ -123,8 +134,17 @@ def reddit_get_top_posts_handler(args: Dict[str, Any]) -> Any:
     if limit <= 0:
         limit = 10
 
+    subreddit = args.get("subreddit") or "all"
+    sort = args.get("sort") or "hot"
+    window = args.get("window")
+
     try:
-        posts = reddit_fetch_top_posts(limit=limit)
+        if (subreddit, sort, window) == ("all", "hot", None):
+            posts = _adapter("reddit", "fetch_top_posts")(limit=limit)
+        else:
+            posts = _adapter("reddit", "get_listing")(subreddit, sort, window, limit=limit)
+    except ValueError as exc:
+        return {"error": str(exc)}
     except HttpError as exc:
         return {
             "error": "Failed to fetch Reddit posts",
@@ -134,65 +154,291 @@ def reddit_get_top_posts_handler(args: Dict[str, Any]) -> Any:
     return posts
 
 
+def hn_get_comments_handler(args: Dict[str, Any]) -> Any:
+    """
+    Handler for the Hacker News comment-thread tool.
+
+    - Reads 'item_id' (id or news.ycombinator.com item URL), 'max_depth'
+      (default 3) and 'max_comments' (default 100) from args
+    - Fetches the discussion through the HN API, level by level
+    - Returns the thread with a nested comment tree (JSON-serializable)
+    """
+    raw_id = str(args.get("item_id", "")).strip()
+    if "id=" in raw_id:
+        raw_id = raw_id.split("id=", 1)[1].split("&", 1)[0]
+    try:
+        item_id = int(raw_id)
+    except ValueError:
+        return {"error": "'item_id' must be a Hacker News item id"}
+
+    try:
+        max_depth = int(args.get("max_depth", 3))
+    except (TypeError, ValueError):
+        max_depth = 3
+    try:
+        max_comments = int(args.get("max_comments", 100))
+    except (TypeError, ValueError):
+        max_comments = 100
+
+    max_depth = max(1, min(max_depth, 10))
+    max_comments = max(1, min(max_comments, 500))
+
+    try:
+        return _adapter("hackernews", "fetch_comments")(
+            item_id, max_depth=max_depth, max_comments=max_comments
+        )
+    except HttpError as exc:
+        return {
+            "error": "Failed to fetch Hacker News comments",
+            "details": str(exc),
+        }
+
+
+def fetch_articles_handler(args: Dict[str, Any]) -> Any:
+    """
+    Handler for the article-content tool.
+
+    - Reads 'links' (list of URLs), 'max_bytes' and 'timeout' from args
+    - Downloads the articles concurrently and extracts their main text
+    - Returns a list of article dicts (JSON-serializable); per-link
+      failures are reported in each dict's 'error' field
+    """
+    links = args.get("links") or []
+    if isinstance(links, str):
+        links = [links]
+    if not isinstance(links, list):
+        return {"error": "'links' must be a list of URLs"}
+
+    try:
+        max_bytes = int(args.get("max_bytes", 500_000))
+    except (TypeError, ValueError):
+        max_bytes = 500_000
+    try:
+        timeout = float(args.get("timeout", 10.0))
+    except (TypeError, ValueError):
+        timeout = 10.0
+
+    max_bytes = max(1_000, min(max_bytes, 5_000_000))
+    timeout = max(1.0, min(timeout, 30.0))
+
+    fetch_articles = _adapter("articles", "fetch_articles")
+    return fetch_articles([str(link) for link in links], max_bytes=max_bytes, timeout=timeout)
+
+
 # --- Tool registry -------------------------------------------------------- #
 
 
-def get_tool_registry() -> List[Tool]:
+# Built once at import time; name -> Tool, in registration order.
+_TOOLS: Dict[str, Tool] = {}
+_manifest: Optional[Dict[str, Any]] = None
+
+
+def site_handler(spec: SiteSpec) -> Callable[[Dict[str, Any]], Any]:
     """
-    Return the list of tools that this MCP server will expose.
+    Build the handler for a declarative site (see sites.py).
 
-    As we add more sites, we'll add more Tool entries here.
+    - Reads 'limit' from args (default 10)
+    - Runs the site's compiled extraction plan on its live page
+    - Returns a list of items (JSON-serializable)
     """
-    return [
-        Tool(
-            name="hn_get_top_posts",
-            description="Fetch top posts from the Hacker News front page.",
-            handler=hn_get_top_posts_handler,
-            args_schema={
-                "type": "object",
-                "properties": {
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of posts to return.",
-                        "default": 10,
-                    }
+
+    def handler(args: Dict[str, Any]) -> Any:
+        try:
+            limit = int(args.get("limit", 10))
+        except (TypeError, ValueError):
+            limit = 10
+        if limit <= 0:
+            limit = 10
+
+        try:
+            return _adapter("declarative", "fetch_site")(spec.key, limit=limit)
+        except HttpError as exc:
+            return {
+                "error": f"Failed to fetch {spec.display} items",
+                "details": str(exc),
+            }
+
+    return handler
+
+
+def register_tool(tool: Tool) -> Tool:
+    """Add (or replace) a tool in the registry and return it."""
+    global _manifest
+    _TOOLS[tool.name] = tool
+    _manifest = None
+    return tool
+
+
+def _limit_schema(noun: str) -> Dict[str, Any]:
+    return {
+        "type": "object",
+        "properties": {
+            "limit": {
+                "type": "integer",
+                "description": f"Maximum number of {noun} to return.",
+                "default": 10,
+            }
+        },
+        "required": [],
+    }
+
+
+register_tool(
+    Tool(
+        name="hn_get_top_posts",
+        description="Fetch top posts from the Hacker News front page.",
+        handler=hn_get_top_posts_handler,
+        args_schema=_limit_schema("posts"),
+    )
+)
+register_tool(
+    Tool(
+        name="ph_get_top_products",
+        description="Fetch top products from the Product Hunt front page.",
+        handler=ph_get_top_products_handler,
+        args_schema=_limit_schema("products"),
+    )
+)
+register_tool(
+    Tool(
+        name="reddit_get_top_posts",
+        description="Fetch posts from a Reddit listing (r/all, hot by default).",
+        handler=reddit_get_top_posts_handler,
+        args_schema={
+            "type": "object",
+            "properties": {
+                **_limit_schema("posts")["properties"],
+                "subreddit": {
+                    "type": "string",
+                    "description": "Subreddit name, or several joined with '+'.",
+                    "default": "all",
+                },
+                "sort": {
+                    "type": "string",
+                    "enum": ["hot", "new", "top", "rising"],
+                    "default": "hot",
+                },
+                "window": {
+                    "type": "string",
+                    "enum": ["hour", "day", "week", "month", "year", "all"],
+                    "description": "Time window for sort='top' (default 'day').",
                 },
-                "required": [],
             },
-        ),
-        Tool(
-            name="ph_get_top_products",
-            description="Fetch top products from the Product Hunt front page.",
-            handler=ph_get_top_products_handler,
-            args_schema={
-                "type": "object",
-                "properties": {
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of products to return.",
-                        "default": 10,
-                    }
+            "required": [],
+        },
+    )
+)
+
+register_tool(
+    Tool(
+        name="hn_get_comments",
+        description="Fetch the comment tree of a Hacker News story.",
+        handler=hn_get_comments_handler,
+        args_schema={
+            "type": "object",
+            "properties": {
+                "item_id": {
+                    "type": "integer",
+                    "description": "Hacker News item id (or its news.ycombinator.com URL).",
+                },
+                "max_depth": {
+                    "type": "integer",
+                    "description": "Deepest reply level to include (1 = top-level only).",
+                    "default": 3,
+                },
+                "max_comments": {
+                    "type": "integer",
+                    "description": "Maximum number of comments to return.",
+                    "default": 100,
                 },
-                "required": [],
             },
-        ),
-        Tool(
-            name="reddit_get_top_posts",
-            description="Fetch top posts from r/all (hot) on Reddit.",
-            handler=reddit_get_top_posts_handler,
-            args_schema={
-                "type": "object",
-                "properties": {
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of posts to return.",
-                        "default": 10,
-                    }
+            "required": ["item_id"],
+        },
+    )
+)
+register_tool(
+    Tool(
+        name="fetch_articles",
+        description="Download the articles behind feed item links and extract their main text.",
+        handler=fetch_articles_handler,
+        args_schema={
+            "type": "object",
+            "properties": {
+                "links": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Article URLs, e.g. the 'link' fields of feed items (max 50).",
+                },
+                "max_bytes": {
+                    "type": "integer",
+                    "description": "Per-article download cap in bytes.",
+                    "default": 500000,
+                },
+                "timeout": {
+                    "type": "number",
+                    "description": "Per-request timeout in seconds.",
+                    "default": 10.0,
                 },
-                "required": [],
             },
-        ),
-    ]
+            "required": ["links"],
+        },
+    )
+)
+
+
+for _spec in SITES.values():
+    register_tool(
+        Tool(
+            name=_spec.tool_name,
+            description=_spec.description or f"Fetch top items from {_spec.display}.",
+            handler=site_handler(_spec),
+            args_schema=_limit_schema("items"),
+        )
+    )
+
+
+def get_tool_registry() -> List[Tool]:
+    """
+    Return the list of tools that this MCP server will expose.
+
+    The registry is built once; this just returns its current contents.
+    """
+    return list(_TOOLS.values())
+
+
+def get_tool_map() -> Dict[str, Tool]:
+    """Return the registry as a name -> Tool mapping (do not mutate)."""
+    return _TOOLS
+
+
+def call_tool(name: str, args: Dict[str, Any], profile: bool = False, record: bool = False) -> Any:
+    """
+    Run a registered tool's handler on `args`.
+
+    Every entry point (the MCP server, stdio_server, the CLI) calls
+    handlers through here, so a call can be profiled on demand
+    (WEB2API_PROFILE, profile=True or profiling.profile_scope; see
+    utils/profiling.py). With record=True the call is also appended to
+    the WEB2API_RECORD trace (see utils/recorder.py); the MCP server
+    records its own tools instead, so it leaves this off.
+
+    Raises:
+        KeyError: for an unknown tool.
+    """
+    handler = _TOOLS[name].handler
+    recorder = get_recorder() if record else None
+    started = time.monotonic()
+    try:
+        with profiling.profile_scope(profile):
+            result = profiling.run(name, handler, args)
+    except Exception as exc:
+        if recorder is not None:
+            recorder.record(name, args, started, time.monotonic() - started, f"{type(exc).__name__}: {exc}")
+        raise
+    if recorder is not None:
+        error = str(result["error"]) if isinstance(result, dict) and result.get("error") else None
+        recorder.record(name, args, started, time.monotonic() - started, error)
+    return result
 
 
 def get_tool_manifest() -> Dict[str, Any]:
@@ -200,20 +446,23 @@ def get_tool_manifest() -> Dict[str, Any]:
     Build a simple manifest describing available tools
     from the tool registry.
 
-    This is a first step toward MCP-style tool discovery.
+    This is a first step toward MCP-style tool discovery. The manifest is
+    cached until the registry changes.
     """
-    tools = get_tool_registry()
-    return {
-        "version": "0.1",
-        "tools": [
-            {
-                "name": t.name,
-                "description": t.description,
-                "input_schema": t.args_schema,
-            }
-            for t in tools
-        ],
-    }
+    global _manifest
+    if _manifest is None:
+        _manifest = {
+            "version": "0.1",
+            "tools": [
+                {
+                    "name": t.name,
+                    "description": t.description,
+                    "input_schema": t.args_schema,
+                }
+                for t in _TOOLS.values()
+            ],
+        }
+    return _manifest
 
 
 def list_tools() -> List[Tool]:
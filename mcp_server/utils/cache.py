@@ -0,0 +1,173 @@
+"""
+cache.py
+
+A small thread-safe LRU cache with optional TTL and byte budget, used by
+the HTTP layer and adapters to keep bounded amounts of recently fetched
+data, and a memo of parse results keyed by the hash of the parsed body.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+
+V = TypeVar("V")
+
+
+class LRUCache(Generic[V]):
+    """
+    Bounded LRU cache.
+
+    - max_entries: hard cap on the number of entries
+    - ttl: optional time-to-live in seconds; expired entries are treated as
+      misses by `get()` but can still be read with `get_stale()`
+    - max_bytes / sizeof: optional cap on the total size of the values, as
+      measured by sizeof(value); least recently used entries are evicted to
+      stay under it, and a value bigger than the whole budget isn't stored
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[V], int]] = None,
+    ) -> None:
+        if max_bytes is not None and sizeof is None:
+            raise ValueError("max_bytes needs a sizeof function")
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        # key -> (stored_at, value, size)
+        self._data: "OrderedDict[Hashable, Tuple[float, V, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Return a fresh value for key, or None on miss/expiry."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or self._expired(entry[0]):
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def get_stale(self, key: Hashable) -> Optional[V]:
+        """Return the value for key even if its TTL has passed."""
+        with self._lock:
+            entry = self._data.get(key)
+            return entry[1] if entry is not None else None
+
+    def set(self, key: Hashable, value: V) -> None:
+        # Measure outside the lock; sizeof may be costly.
+        size = self._sizeof(value) if self._sizeof is not None else 0
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= old[2]
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._data[key] = (time.monotonic(), value, size)
+            self.bytes += size
+            while len(self._data) > self.max_entries or (
+                self.max_bytes is not None and self.bytes > self.max_bytes
+            ):
+                _, evicted = self._data.popitem(last=False)
+                self.bytes -= evicted[2]
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is None:
+                return None
+            self.bytes -= entry[2]
+            return entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def items(self) -> List[Tuple[Hashable, V]]:
+        """Return a snapshot of (key, value) pairs, least recently used first."""
+        with self._lock:
+            return [(key, entry[1]) for key, entry in self._data.items()]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else None,
+            }
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.monotonic() - stored_at > self.ttl
+
+
+class ParseMemo:
+    """
+    Bounded memo of extraction results keyed by a hash of the input body.
+
+    Keys also carry the extractor's name and version, so bumping an
+    adapter's version makes its old entries unreachable (they then age out
+    of the LRU). Cached values are shared: callers must copy before
+    mutating.
+    """
+
+    def __init__(self, max_entries: int = 32) -> None:
+        self._cache: LRUCache[Any] = LRUCache(max_entries=max_entries)
+        self._lock = threading.Lock()
+        self._per_name: Dict[str, Dict[str, int]] = {}
+
+    def get_or_parse(
+        self,
+        name: str,
+        version: str,
+        body: bytes,
+        parse: Callable[[], V],
+        extra: Hashable = None,
+    ) -> V:
+        """Return the memoized result for body, calling parse() on a miss."""
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        key = (name, version, extra, digest)
+        value = self._cache.get(key)
+        hit = value is not None
+        if not hit:
+            value = parse()
+            self._cache.set(key, value)
+        with self._lock:
+            counts = self._per_name.setdefault(name, {"hits": 0, "misses": 0})
+            counts["hits" if hit else "misses"] += 1
+        return value
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._cache.stats()
+        with self._lock:
+            stats["by_name"] = {
+                name: dict(counts, hit_rate=counts["hits"] / (counts["hits"] + counts["misses"]))
+                for name, counts in self._per_name.items()
+            }
+        return stats
@@ -0,0 +1,87 @@
+"""
+deadline.py
+
+Per-call time budgets that follow a tool call through the fetch pipeline.
+
+A tool opens a `deadline_scope()`; everything it calls, including work
+handed to other threads through `bind()`, can then ask how much time is
+left. The HTTP client uses this to shrink timeouts and skip retries that
+no longer fit, and fan-out code uses it to stop waiting and return what it
+has so far.
+
+Built on contextvars, so concurrent calls never see each other's budgets.
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+from .errors import DeadlineExceededError
+
+
+T = TypeVar("T")
+
+# Absolute time.monotonic() at which the current call's budget runs out.
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "web2api_deadline", default=None
+)
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Run the block with `seconds` of budget (None = unlimited).
+
+    A nested scope can only tighten an enclosing deadline, never extend it.
+    """
+    if seconds is None:
+        yield
+        return
+    expires_at = time.monotonic() + max(0.0, seconds)
+    current = _deadline.get()
+    if current is not None:
+        expires_at = min(expires_at, current)
+    token = _deadline.set(expires_at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current budget, or None if there is no deadline."""
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def clamp(timeout: float) -> float:
+    """
+    Return `timeout` capped to the remaining budget.
+
+    Raises:
+        DeadlineExceededError: if the budget is already used up.
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceededError("Deadline exceeded")
+    return min(timeout, left)
+
+
+def bind(func: Callable[..., T]) -> Callable[..., T]:
+    """Wrap func to run in a copy of the caller's context (for thread pools)."""
+    context = contextvars.copy_context()
+
+    def run(*args: Any, **kwargs: Any) -> T:
+        return context.copy().run(func, *args, **kwargs)
+
+    return run
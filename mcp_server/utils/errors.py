@@ -0,0 +1,32 @@
+"""
+errors.py
+
+Exception types shared by the HTTP layer, adapters and tool handlers.
+
+Kept free of third-party imports so that tool registration can reference
+them without pulling in requests/BeautifulSoup at startup.
+"""
+
+
+class HttpError(Exception):
+    """Custom exception for HTTP-related errors."""
+
+
+class CircuitOpenError(HttpError):
+    """Raised when a host's circuit is open and no cached copy is available."""
+
+
+class RateLimitedError(HttpError):
+    """Raised when the host's rate-limit queue is longer than the max wait."""
+
+
+class ResponseTooLargeError(HttpError):
+    """Raised when a response body exceeds the configured size cap."""
+
+
+class DeadlineExceededError(HttpError):
+    """Raised when a call's time budget (see deadline.py) has run out."""
+
+
+class ForbiddenHostError(HttpError):
+    """Raised when a host resolves to a loopback, private or other non-public address."""
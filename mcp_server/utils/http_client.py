@@ -1,27 +1,579 @@
 """
 http_client.py
 
-Simple HTTP helpers for fetching HTML pages.
+Shared HTTP helpers for fetching pages from upstream sites.
+
+Every adapter goes through `fetch_page()` (or `fetch()` / `get_html()`), so
+all of them share:
+- one pooled `requests.Session` that negotiates gzip (and brotli when
+  available) compression
+- streamed downloads with a maximum body size, decoded once with the
+  charset from the response headers
+- retries with jittered backoff for idempotent GETs
+- a circuit breaker per host that fails fast (or, for feed front pages,
+  serves the last good copy) while the host is unhealthy
+- optional hedged requests: if the first attempt's response headers are
+  slower than the host's recent p95, a second identical request is sent;
+  only the body of whichever answers first is read, the other is closed
+- a token-bucket rate limiter per host (see ratelimit.py); 429 responses
+  pause the bucket and are retried
 """
 
+import importlib.util
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Type, TypeVar
+from urllib.parse import urlsplit
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from . import deadline, metrics, ratelimit
+from .cache import LRUCache
+from .errors import (  # noqa: F401 - re-exported
+    CircuitOpenError,
+    DeadlineExceededError,
+    ForbiddenHostError,
+    HttpError,
+    RateLimitedError,
+    ResponseTooLargeError,
+)
+from .metrics import LatencyWindow
+from .ratelimit import RateLimitTimeout, TokenBucket, get_limiter
+from .resilience import CircuitBreaker, RetryPolicy
+from .settings import env_bool, env_float, env_int
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_TIMEOUT = env_float("WEB2API_HTTP_TIMEOUT", 5.0)
+
+DEFAULT_RETRY = RetryPolicy(
+    retries=env_int("WEB2API_HTTP_RETRIES", 2),
+    base_delay=env_float("WEB2API_HTTP_BACKOFF", 0.2),
+    max_delay=env_float("WEB2API_HTTP_BACKOFF_MAX", 2.0),
+)
+
+BREAKER_FAILURE_THRESHOLD = env_int("WEB2API_BREAKER_FAILURES", 5)
+BREAKER_RESET_TIMEOUT = env_float("WEB2API_BREAKER_RESET", 30.0)
+
+# Hedging is off by default: it trades extra upstream load for tail latency.
+HEDGE_ENABLED = env_bool("WEB2API_HTTP_HEDGE", False)
+# Don't hedge until we have enough samples for a meaningful p95.
+HEDGE_MIN_SAMPLES = 20
+
+USER_AGENT = "web2api-mcp-agent/0.1"
+
+# Largest decoded body fetch_page() will read; bigger pages are rejected.
+MAX_BODY_BYTES = env_int("WEB2API_HTTP_MAX_BYTES", 5_000_000)
+
+# Total size of the last-good copies kept by fetch_page(keep_stale=True).
+STALE_PAGE_BYTES = env_int("WEB2API_STALE_PAGE_BYTES", 8 * 1024 * 1024)
+
+# urllib3 decodes brotli transparently, but only if a brotli module exists.
+_HAS_BROTLI = any(importlib.util.find_spec(m) is not None for m in ("brotli", "brotlicffi"))
+ACCEPT_ENCODING = "gzip, deflate, br" if _HAS_BROTLI else "gzip, deflate"
+
+# Used when the Content-Type header carries no charset.
+DEFAULT_CHARSET = "utf-8"
+
+
+@dataclass(frozen=True)
+class Page:
+    """A downloaded body plus the charset it should be decoded with."""
+
+    url: str
+    content: bytes
+    encoding: str
+    content_type: str
+
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+
+def _page_size(page: Page) -> int:
+    return len(page.content)
+
+
+class _HostState:
+    """Breaker + latency window for a single upstream host."""
+
+    def __init__(self) -> None:
+        self.breaker = CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT)
+        self.latency = LatencyWindow()
+
+    def hedge_delay(self) -> Optional[float]:
+        if len(self.latency) < HEDGE_MIN_SAMPLES:
+            return None
+        return self.latency.percentile(95)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.breaker.stats(), "latency": self.latency.stats()}
+
+
+_hosts: LRUCache[_HostState] = LRUCache(max_entries=ratelimit.MAX_HOSTS)
+_hosts_lock = threading.Lock()
+
+# Last good copy of each front page fetched with keep_stale=True, served
+# while its host's circuit is open.
+_stale_pages: LRUCache[Page] = LRUCache(max_entries=64, max_bytes=STALE_PAGE_BYTES, sizeof=_page_size)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+_hedge_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="web2api-hedge")
+
 
+def new_session(adapter_cls: Type[HTTPAdapter] = HTTPAdapter) -> requests.Session:
+    """A pooled session with this module's headers, using `adapter_cls` for transport."""
+    session = requests.Session()
+    adapter = adapter_cls(pool_connections=16, pool_maxsize=32)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    return session
 
-class HttpError(Exception):
-    """Custom exception for HTTP-related errors."""
 
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = new_session()
+    return _session
 
-def get_html(url: str, timeout: float = 5.0) -> str:
+
+def _host_state(host: str) -> _HostState:
+    with _hosts_lock:
+        state = _hosts.get(host)
+        if state is None:
+            state = _HostState()
+            _hosts.set(host, state)
+        return state
+
+
+def _cache_key(url: str, params: Optional[Mapping[str, Any]]) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    return (url, items)
+
+
+def _discard(future: "Future[requests.Response]") -> None:
+    """Close the response of a hedged request that lost the race."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+def _hedged(
+    send: Callable[[], requests.Response],
+    delay: float,
+    limiter: TokenBucket,
+) -> requests.Response:
+    """Run `send`, and a second copy if the first hasn't finished after `delay`."""
+    first = _hedge_pool.submit(send)
+    done, _ = wait([first], timeout=delay)
+    if done or not limiter.try_acquire():
+        # Either fast enough, or the host has no spare budget for a hedge.
+        return first.result()
+
+    pending = {first, _hedge_pool.submit(send)}
+    last_exc: Optional[BaseException] = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            exc = future.exception()
+            if exc is None:
+                for loser in pending:
+                    # Give back its connection (unread, if streamed) once it answers.
+                    loser.add_done_callback(_discard)
+                return future.result()
+            last_exc = exc
+    assert last_exc is not None
+    raise last_exc
+
+
+def _send(
+    state: _HostState,
+    limiter: TokenBucket,
+    url: str,
+    params: Optional[Mapping[str, Any]],
+    headers: Optional[Mapping[str, str]],
+    timeout: float,
+    hedge: bool,
+    stream: bool,
+    session: Optional[requests.Session] = None,
+    allow_redirects: bool = True,
+) -> requests.Response:
+    def once() -> requests.Response:
+        started = time.monotonic()
+        response = (session or get_session()).get(
+            url, params=params, headers=headers, timeout=timeout, stream=stream, allow_redirects=allow_redirects
+        )
+        state.latency.observe(time.monotonic() - started)
+        limiter.observe_response(response.status_code, response.headers)
+        return response
+
+    delay = state.hedge_delay() if hedge else None
+    if delay is None:
+        return once()
+    return _hedged(once, delay, limiter)
+
+
+def _reserve(limiter: TokenBucket, host: str, url: str, timeout: float) -> float:
     """
-    Fetch the raw HTML content for the given URL.
+    Take a token from the host's rate limiter within the caller's budget and
+    return the attempt's timeout, capped to what is left of that budget.
 
     Raises:
-        HttpError: if the request fails or returns a non-2xx status.
+        RateLimitedError: if the host's rate-limit queue is too long.
+        DeadlineExceededError: if the caller's time budget runs out.
     """
     try:
-        response = requests.get(url, timeout=timeout)
-        response.raise_for_status()
+        limiter.acquire(deadline.clamp(ratelimit.MAX_WAIT))
+    except RateLimitTimeout as exc:
+        left = deadline.remaining()
+        if left is not None and left < ratelimit.MAX_WAIT:
+            # The wait was cut short by the caller's budget, not the host.
+            raise DeadlineExceededError(f"Deadline exceeded waiting to fetch {url!r}") from exc
+        raise RateLimitedError(f"Rate limited by host {host!r}: {exc}") from exc
+    return deadline.clamp(timeout)
+
+
+def fetch(
+    url: str,
+    *,
+    params: Optional[Mapping[str, Any]] = None,
+    headers: Optional[Mapping[str, str]] = None,
+    timeout: Optional[float] = None,
+    retry: Optional[RetryPolicy] = None,
+    hedge: Optional[bool] = None,
+    stream: bool = False,
+) -> requests.Response:
+    """
+    GET a URL through the shared session with retries and circuit breaking.
+
+    Timeouts, connection errors, 429 and 5xx responses are retried according
+    to `retry` (default: DEFAULT_RETRY). Other 4xx responses are not retried.
+    Each attempt first takes a token from the host's rate limiter, queueing
+    for up to ratelimit.MAX_WAIT seconds.
+
+    With stream=True the body is left unread; a hedged request races on the
+    response headers and the losing response is closed. Prefer
+    `fetch_streamed()`, which reads the body inside the
+    attempt so that a failed read is retried too.
+
+    Inside a `deadline.deadline_scope()`, each attempt's timeout and rate
+    limit wait are capped to the remaining budget, and retries whose
+    backoff would not fit are skipped.
+
+    Raises:
+        CircuitOpenError: if the host's circuit is open.
+        RateLimitedError: if the host's rate-limit queue is too long.
+        DeadlineExceededError: if the caller's time budget runs out.
+        HttpError: if the request still fails after all retries.
+    """
+    return _fetch(url, params, headers, timeout, retry, hedge, stream, lambda response: response)
+
+
+def fetch_streamed(
+    url: str,
+    read: Callable[[requests.Response], T],
+    *,
+    params: Optional[Mapping[str, Any]] = None,
+    headers: Optional[Mapping[str, str]] = None,
+    timeout: Optional[float] = None,
+    retry: Optional[RetryPolicy] = None,
+    hedge: Optional[bool] = None,
+    session: Optional[requests.Session] = None,
+    allow_redirects: bool = True,
+) -> T:
+    """
+    GET a URL like `fetch(stream=True)` and return `read(response)`.
+
+    `read` runs inside each attempt and owns the response (see
+    `read_body()`). A body that fails mid-download (connection reset,
+    chunked encoding error, read timeout) counts as a failed attempt: the
+    host's breaker records it and the request is retried. An HttpError
+    raised by `read` (e.g. ResponseTooLargeError) is not retried.
+
+    `session` replaces the shared session (e.g. one with a
+    netguard.PublicOnlyAdapter). With allow_redirects=False a 3xx response
+    is handed to `read` as-is.
+
+    Raises:
+        The errors of `fetch()`, plus whatever `read` raises.
+    """
+    return _fetch(url, params, headers, timeout, retry, hedge, True, read, session, allow_redirects)
+
+
+def _fetch(
+    url: str,
+    params: Optional[Mapping[str, Any]],
+    headers: Optional[Mapping[str, str]],
+    timeout: Optional[float],
+    retry: Optional[RetryPolicy],
+    hedge: Optional[bool],
+    stream: bool,
+    read: Callable[[requests.Response], T],
+    session: Optional[requests.Session] = None,
+    allow_redirects: bool = True,
+) -> T:
+    timeout = DEFAULT_TIMEOUT if timeout is None else timeout
+    policy = DEFAULT_RETRY if retry is None else retry
+    use_hedge = HEDGE_ENABLED if hedge is None else hedge
+
+    host = urlsplit(url).netloc
+    state = _host_state(host)
+    limiter = get_limiter(host)
+    last_exc: Optional[Exception] = None
+
+    for attempt in range(policy.retries + 1):
+        if not state.breaker.allow():
+            raise CircuitOpenError(f"Circuit open for host {host!r}; not fetching {url!r}")
+
+        try:
+            attempt_timeout = _reserve(limiter, host, url, timeout)
+            response = _send(
+                state, limiter, url, params, headers, attempt_timeout, use_hedge, stream, session, allow_redirects
+            )
+            response.raise_for_status()
+            result = read(response)
+        except requests.HTTPError as exc:
+            status = exc.response.status_code if exc.response is not None else None
+            if stream and exc.response is not None:
+                exc.response.close()
+            if status == 429:
+                # Healthy but throttled; the limiter has already paused the
+                # bucket, so the next acquire() waits out the hint.
+                state.breaker.record_success()
+                last_exc = exc
+                continue
+            if status is not None and status < 500:
+                # The host answered; the request itself is bad. Don't retry.
+                state.breaker.record_success()
+                raise HttpError(f"Failed to fetch URL {url!r}: {exc}") from exc
+            state.breaker.record_failure()
+            last_exc = exc
+        except requests.RequestException as exc:
+            # Includes bodies that broke off mid-read.
+            state.breaker.record_failure()
+            last_exc = exc
+        except (DeadlineExceededError, RateLimitedError):
+            # Out of time (before sending or mid-read) or queued too long:
+            # says nothing about the host, so give back a half-open probe.
+            state.breaker.release()
+            raise
+        except ForbiddenHostError:
+            # Refused before connecting (see netguard.py); nothing was sent.
+            state.breaker.release()
+            raise
+        except HttpError:
+            # The reader rejected a good response (too large, wrong type).
+            state.breaker.record_success()
+            raise
+        except BaseException:
+            state.breaker.release()
+            raise
+        else:
+            state.breaker.record_success()
+            return result
+
+        if attempt < policy.retries:
+            delay = policy.backoff(attempt)
+            left = deadline.remaining()
+            if left is not None and left <= delay:
+                # No budget left for another attempt.
+                raise DeadlineExceededError(
+                    f"Deadline exceeded fetching {url!r}: {last_exc}"
+                ) from last_exc
+            time.sleep(delay)
+
+    if deadline.expired():
+        raise DeadlineExceededError(f"Deadline exceeded fetching {url!r}: {last_exc}") from last_exc
+    raise HttpError(f"Failed to fetch URL {url!r}: {last_exc}") from last_exc
+
+
+def open_connection(url: str, timeout: Optional[float] = None) -> None:
+    """
+    Send a HEAD request to url through the shared session, leaving a pooled
+    connection to its host for the next request to reuse.
+
+    Like one attempt of `fetch()`: it takes a token from the host's rate
+    limiter and goes through its circuit breaker, but is never retried.
+
+    Raises:
+        CircuitOpenError: if the host's circuit is open.
+        RateLimitedError: if the host's rate-limit queue is too long.
+        DeadlineExceededError: if the caller's time budget runs out.
+        HttpError: if the request fails or the host answers with a 5xx.
+    """
+    host = urlsplit(url).netloc
+    state = _host_state(host)
+    limiter = get_limiter(host)
+    if not state.breaker.allow():
+        raise CircuitOpenError(f"Circuit open for host {host!r}; not connecting to {url!r}")
+
+    try:
+        attempt_timeout = _reserve(limiter, host, url, DEFAULT_TIMEOUT if timeout is None else timeout)
+        response = get_session().head(url, timeout=attempt_timeout, allow_redirects=False)
+    except requests.RequestException as exc:
+        state.breaker.record_failure()
+        raise HttpError(f"Failed to connect to {url!r}: {exc}") from exc
+    except BaseException:
+        state.breaker.release()
+        raise
+    response.close()
+    limiter.observe_response(response.status_code, response.headers)
+    if response.status_code >= 500:
+        state.breaker.record_failure()
+        raise HttpError(f"Failed to connect to {url!r}: HTTP {response.status_code}")
+    # Any other answer (405, 404, 429, ...) still leaves a working connection.
+    state.breaker.record_success()
+
+
+def read_body(response: requests.Response, max_bytes: int, chunk_size: int = 16384) -> Tuple[bytes, bool]:
+    """
+    Read a streamed response body, stopping once `max_bytes` is reached.
+
+    Returns (body, truncated). The connection is released either way, so
+    an oversized body is abandoned instead of downloaded. Read errors are
+    raised as-is (requests.RequestException), for `fetch_streamed()` to
+    retry.
+
+    Raises:
+        DeadlineExceededError: if the caller's time budget runs out mid-body.
+    """
+    chunks = []
+    size = 0
+    truncated = False
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if deadline.expired():
+                raise DeadlineExceededError(f"Deadline exceeded reading body of {response.url!r}")
+            if size + len(chunk) > max_bytes:
+                chunks.append(chunk[: max_bytes - size])
+                truncated = True
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+    finally:
+        response.close()
+    return b"".join(chunks), truncated
+
+
+def read_capped(response: requests.Response, max_bytes: int, chunk_size: int = 16384) -> Tuple[bytes, bool]:
+    """
+    Like `read_body()`, for a response from `fetch(stream=True)`: read
+    errors are raised as HttpError (and are not retried).
+    """
+    try:
+        return read_body(response, max_bytes, chunk_size)
     except requests.RequestException as exc:
-        raise HttpError(f"Failed to fetch URL {url!r}: {exc}") from exc
+        raise HttpError(f"Failed to read body of {response.url!r}: {exc}") from exc
+
+
+def charset_from_headers(headers: Mapping[str, str], default: str = DEFAULT_CHARSET) -> str:
+    """
+    Return the charset named in the Content-Type header, or `default`.
+
+    Unlike `requests.Response.text`, this never sniffs the body.
+    """
+    for param in headers.get("Content-Type", "").split(";")[1:]:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "charset" and value.strip():
+            charset = value.strip().strip("\"'")
+            try:
+                "".encode(charset)
+            except LookupError:
+                break
+            return charset
+    return default
+
+
+def fetch_page(
+    url: str,
+    *,
+    params: Optional[Mapping[str, Any]] = None,
+    max_bytes: Optional[int] = None,
+    keep_stale: bool = False,
+    **kwargs: Any,
+) -> Page:
+    """
+    Download a page as bytes, streaming it and enforcing a size cap.
+
+    The body is read once into a single buffer and is not decoded here;
+    callers hand `page.content` and `page.encoding` straight to the parser.
+
+    With keep_stale=True the page is kept (within STALE_PAGE_BYTES in
+    total) and served again while the host's circuit is open. Meant for
+    the few feed front pages, not for per-item or per-article URLs.
+
+    Extra keyword arguments (headers, timeout, retry, hedge) go to
+    `fetch_streamed()`; a body that breaks off mid-read is retried.
+
+    Raises:
+        ResponseTooLargeError: if the body exceeds max_bytes.
+        HttpError: if the request fails (and no stale copy exists).
+    """
+    limit = MAX_BODY_BYTES if max_bytes is None else max_bytes
+    cache_key = _cache_key(url, params)
+
+    def read(response: requests.Response) -> Page:
+        declared = response.headers.get("Content-Length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            # Reject before reading. (Compressed bodies are also capped after
+            # decompression, while reading.)
+            response.close()
+            raise ResponseTooLargeError(f"Response from {url!r} is {declared} bytes (max {limit})")
+
+        content, truncated = read_body(response, limit)
+        if truncated:
+            raise ResponseTooLargeError(f"Response from {url!r} exceeds {limit} bytes")
+        return Page(
+            url=response.url or url,
+            content=content,
+            encoding=charset_from_headers(response.headers),
+            content_type=response.headers.get("Content-Type", "").split(";")[0].strip().lower(),
+        )
+
+    try:
+        page = fetch_streamed(url, read, params=params, **kwargs)
+    except CircuitOpenError:
+        stale = _stale_pages.get_stale(cache_key) if keep_stale else None
+        if stale is None:
+            raise
+        logger.warning("Circuit open for %s; serving cached page", url)
+        return stale
+
+    if keep_stale:
+        _stale_pages.set(cache_key, page)
+    return page
+
+
+def get_html(url: str, timeout: float = DEFAULT_TIMEOUT, **kwargs: Any) -> str:
+    """
+    Fetch the raw HTML content for the given URL.
+
+    Extra keyword arguments (max_bytes, retry, ...) are passed to
+    `fetch_page()`. Prefer `fetch_page()` plus `parse_html(content,
+    encoding)` in new code: it avoids holding a decoded copy of the body.
+
+    Raises:
+        HttpError: if the request fails or returns a non-2xx status.
+    """
+    return fetch_page(url, timeout=timeout, **kwargs).text()
+
+
+def host_stats() -> Dict[str, Any]:
+    """Return breaker state and latency percentiles for every known host."""
+    return {host: state.stats() for host, state in _hosts.items()}
+
 
-    return response.text
+metrics.register("http.hosts", host_stats)
+metrics.register("http.stale_pages", _stale_pages.stats)
@@ -0,0 +1,65 @@
+"""
+jsonio.py
+
+One place for JSON encoding and decoding.
+
+Uses orjson when it is installed (several times faster on both ends, and it
+produces UTF-8 bytes directly) and falls back to the stdlib `json` module
+otherwise. Output is compact by default; pass `indent=True` for humans.
+
+Set WEB2API_JSON_BACKEND=json to force the stdlib backend.
+"""
+
+import json
+from typing import Any, Union
+
+from .settings import env_str
+
+try:
+    if env_str("WEB2API_JSON_BACKEND", "auto") == "json":
+        raise ImportError("stdlib JSON backend forced")
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+# orjson.JSONDecodeError subclasses this, so callers can catch one type.
+JSONDecodeError = json.JSONDecodeError
+
+
+def dumps_bytes(obj: Any, *, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes (compact unless indent=True)."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, option=option)
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits; stdlib handles those.
+            pass
+    return _stdlib_dumps(obj, indent, sort_keys).encode("utf-8")
+
+
+def dumps(obj: Any, *, indent: bool = False, sort_keys: bool = False) -> str:
+    """Serialize obj to a JSON string (compact unless indent=True)."""
+    if orjson is not None:
+        return dumps_bytes(obj, indent=indent, sort_keys=sort_keys).decode("utf-8")
+    return _stdlib_dumps(obj, indent, sort_keys)
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """Parse JSON from str or bytes. Raises JSONDecodeError (a ValueError)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj: Any, indent: bool, sort_keys: bool) -> str:
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=sort_keys)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys)
@@ -0,0 +1,68 @@
+"""
+metrics.py
+
+Lightweight in-process metrics.
+
+Components register a zero-argument provider returning a dict of stats
+under a dotted name; `snapshot()` collects them all. Nothing here talks
+to an external system - callers decide how to expose the numbers.
+"""
+
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+
+_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+_providers_lock = threading.Lock()
+
+
+def register(name: str, provider: Callable[[], Dict[str, Any]]) -> None:
+    """Register (or replace) a stats provider under the given name."""
+    with _providers_lock:
+        _providers[name] = provider
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """Return the current stats of every registered provider."""
+    with _providers_lock:
+        providers = list(_providers.items())
+    return {name: provider() for name, provider in sorted(providers)}
+
+
+class LatencyWindow:
+    """
+    Keeps the most recent N samples (in seconds) and answers percentile
+    queries over them. Thread-safe.
+    """
+
+    def __init__(self, size: int = 200) -> None:
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._count = 0
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self._count += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Return the pct-th percentile (0-100) or None with no samples."""
+        with self._lock:
+            ordered: List[float] = sorted(self._samples)
+        if not ordered:
+            return None
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+        return ordered[index]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "count": self._count,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
@@ -0,0 +1,97 @@
+"""
+netguard.py
+
+Keeps requests made on behalf of tool callers on the public internet.
+
+`PublicOnlyAdapter` is a requests transport adapter whose connections
+resolve their host, refuse it unless every address is globally routable
+(not loopback, private, link-local, which includes cloud metadata
+endpoints, or otherwise reserved), and then connect to the address they
+just checked. Because the check and the connect use the same lookup, a
+host that re-resolves to a private address between the two (DNS
+rebinding) is still refused. TLS is verified against the hostname, not the
+address.
+
+The adapter does not follow redirects itself; send requests with
+allow_redirects=False and check each Location before following it.
+"""
+
+import ipaddress
+import socket
+from typing import Any, List, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .errors import ForbiddenHostError
+
+
+def is_public_address(address: str) -> bool:
+    """True if an IP address (v4 or v6, optionally with a %zone) is globally routable."""
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global
+
+
+def public_addresses(host: str, port: Optional[int] = None) -> List[str]:
+    """
+    Resolve host and return its addresses, provided all of them are public.
+
+    Raises:
+        ForbiddenHostError: if host doesn't resolve, or any of its addresses
+        is not public.
+    """
+    try:
+        infos = socket.getaddrinfo(host, port)
+    except (OSError, UnicodeError) as exc:
+        raise ForbiddenHostError(f"Cannot resolve host {host!r}: {exc}") from exc
+    addresses = list(dict.fromkeys(info[4][0] for info in infos))
+    if not addresses or not all(is_public_address(address) for address in addresses):
+        raise ForbiddenHostError(f"Host {host!r} is not a public address")
+    return addresses
+
+
+class _PublicOnlyConnection:
+    """Mixin for urllib3 connections: connect only to a vetted public address."""
+
+    def _new_conn(self) -> socket.socket:
+        host = self._dns_host  # type: ignore[attr-defined]
+        self._dns_host = public_addresses(host, self.port)[0]  # type: ignore[attr-defined]
+        try:
+            return super()._new_conn()  # type: ignore[misc]
+        finally:
+            self._dns_host = host
+
+
+class _PublicHTTPConnection(_PublicOnlyConnection, HTTPConnection):
+    pass
+
+
+class _PublicHTTPSConnection(_PublicOnlyConnection, HTTPSConnection):
+    pass
+
+
+class _PublicHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _PublicHTTPConnection
+
+
+class _PublicHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _PublicHTTPSConnection
+
+
+class PublicOnlyAdapter(HTTPAdapter):
+    """
+    An HTTPAdapter that only connects to public addresses.
+
+    Connecting to a host that isn't public raises ForbiddenHostError out of
+    `Session.send()` before anything is sent.
+    """
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _PublicHTTPConnectionPool,
+            "https": _PublicHTTPSConnectionPool,
+        }
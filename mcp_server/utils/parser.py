@@ -2,18 +2,55 @@
 parser.py
 
 Shared HTML parsing helpers.
+
+`parse_memo` lets adapters skip parsing entirely when a page body is
+byte-for-byte identical to one they already extracted.
 """
 
-from typing import Optional
+import html
+import re
+from typing import List, Optional, Tuple, Union
 
 from bs4 import BeautifulSoup  # type: ignore
 
+from . import metrics
+from .cache import ParseMemo
+
+
+parse_memo = ParseMemo(max_entries=32)
+metrics.register("parser.memo", parse_memo.stats)
+
 
-def parse_html(html: str) -> BeautifulSoup:
-    """Return a BeautifulSoup DOM for the given HTML string."""
+def parse_html(html: Union[str, bytes], encoding: Optional[str] = None) -> BeautifulSoup:
+    """
+    Return a BeautifulSoup DOM for the given HTML.
+
+    `html` may be raw bytes (e.g. `Page.content`) with the charset from the
+    response headers; BeautifulSoup then decodes it once, without guessing.
+    """
+    if isinstance(html, bytes):
+        return BeautifulSoup(html, "html.parser", from_encoding=encoding or "utf-8")
     return BeautifulSoup(html, "html.parser")
 
 
+_TAG_RE = re.compile(r"<[^>]+>")
+_PARAGRAPH_RE = re.compile(r"<p\s*/?>", re.IGNORECASE)
+
+
+def html_to_text(fragment: Optional[str]) -> str:
+    """
+    Convert a small HTML fragment (e.g. an HN comment) to plain text.
+
+    Cheaper than building a DOM: paragraphs become blank lines, other tags
+    are dropped and entities are unescaped.
+    """
+    if not fragment:
+        return ""
+    text = _PARAGRAPH_RE.sub("\n\n", fragment)
+    text = _TAG_RE.sub("", text)
+    return html.unescape(text).strip()
+
+
 def safe_int(value: str) -> Optional[int]:
     """
     Convert a string to int, returning None if conversion fails.
@@ -22,3 +59,53 @@ def safe_int(value: str) -> Optional[int]:
         return int(value)
     except (TypeError, ValueError):
         return None
+
+
+# Elements that never contain an article's main text.
+_BOILERPLATE_TAGS = ("script", "style", "noscript", "nav", "header", "footer", "aside", "form", "iframe", "svg")
+
+# Elements whose text we keep, in document order.
+_TEXT_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6", "p", "li", "pre", "blockquote")
+
+
+def extract_main_text(
+    html: Union[str, bytes],
+    max_chars: int = 20000,
+    encoding: Optional[str] = None,
+) -> Tuple[Optional[str], str]:
+    """
+    Extract (title, main text) from an article page.
+
+    Heuristic: drop boilerplate elements, prefer <article>, <main> or
+    [role=main] when present (otherwise the whole <body>), and join the text
+    of headings, paragraphs and list items. Text is capped at max_chars.
+    """
+    soup = parse_html(html, encoding)
+
+    title: Optional[str] = None
+    if soup.title and soup.title.string:
+        title = soup.title.string.strip() or None
+
+    for tag in soup(_BOILERPLATE_TAGS):
+        tag.decompose()
+
+    root = soup.find("article") or soup.find("main") or soup.find(attrs={"role": "main"}) or soup.body or soup
+
+    blocks: List[str] = []
+    size = 0
+    for element in root.find_all(_TEXT_TAGS):
+        # Skip containers whose text we'll also see via a nested text tag.
+        if element.find(_TEXT_TAGS):
+            continue
+        text = " ".join(element.get_text(" ", strip=True).split())
+        if not text:
+            continue
+        blocks.append(text)
+        size += len(text) + 2
+        if size >= max_chars:
+            break
+
+    if not blocks:
+        blocks = [" ".join(root.get_text(" ", strip=True).split())]
+
+    return title, "\n\n".join(blocks)[:max_chars]
@@ -0,0 +1,188 @@
+"""
+profiling.py
+
+On-demand profiling of tool handler calls.
+
+A profiled call runs its handler under cProfile and writes the profile to
+WEB2API_PROFILE_DIR (default: <tmp>/web2api-profiles), one .prof file per
+call, readable with `python -m pstats` or snakeviz. The most recent one is
+kept in memory and summarized by last_profile() (the debug_last_profile
+MCP tool).
+
+Which calls are profiled:
+
+    WEB2API_PROFILE=all                          every handler call
+    WEB2API_PROFILE=hn_get_comments,reddit_get_top_posts   just these tools
+    profile_scope(True)                          calls made in this context
+                                                 (the tools' `profile` argument)
+
+Profiling is deterministic and costs a lot more than a plain call, so it
+is off by default. cProfile only sees the calling thread: work a handler
+hands to other threads (article downloads, comment levels) shows up as
+time spent waiting for them. One call is profiled at a time; a call that
+would overlap another profiled call just runs unprofiled.
+"""
+
+import contextlib
+import contextvars
+import glob
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from .settings import env_int, env_str
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+PROFILE_DIR = env_str("WEB2API_PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "web2api-profiles")
+# Profiles kept on disk; older ones are deleted.
+PROFILE_KEEP = env_int("WEB2API_PROFILE_KEEP", 50)
+SORT_KEYS = ("cumulative", "tottime", "calls")
+
+
+def _profiled_tools(value: Optional[str]) -> Optional[frozenset]:
+    """None: nothing; empty set: every tool; otherwise these tool names."""
+    if not value or value.lower() in ("0", "false", "no", "off"):
+        return None
+    if value.lower() in ("1", "true", "yes", "on", "all", "*"):
+        return frozenset()
+    return frozenset(name.strip() for name in value.split(",") if name.strip())
+
+
+_tools = _profiled_tools(env_str("WEB2API_PROFILE"))
+_requested: contextvars.ContextVar[bool] = contextvars.ContextVar("web2api_profile", default=False)
+_busy = threading.Lock()
+
+
+@dataclass
+class Profile:
+    tool: str
+    path: Optional[str]
+    started: float  # wall-clock time
+    duration: float
+    error: Optional[str]
+    stats: Any  # pstats.Stats
+
+    def summary(self, limit: int = 20, sort: str = "cumulative") -> Dict[str, Any]:
+        """The profile's `limit` top functions by `sort` (see SORT_KEYS)."""
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Invalid sort. Use one of: {', '.join(SORT_KEYS)}.")
+        column = {"cumulative": 3, "tottime": 2, "calls": 1}[sort]
+        rows = sorted(self.stats.stats.items(), key=lambda entry: entry[1][column], reverse=True)
+        functions: List[Dict[str, Any]] = []
+        for (filename, line, name), (_, calls, tottime, cumtime, _) in rows[: max(1, limit)]:
+            functions.append(
+                {
+                    "function": name if filename == "~" else f"{_short_path(filename)}:{line}({name})",
+                    "calls": calls,
+                    "tottime_ms": round(tottime * 1000.0, 3),
+                    "cumtime_ms": round(cumtime * 1000.0, 3),
+                }
+            )
+        return {
+            "tool": self.tool,
+            "path": self.path,
+            "started": round(self.started, 3),
+            "duration_ms": round(self.duration * 1000.0, 3),
+            "error": self.error,
+            "total_calls": self.stats.total_calls,
+            "sort": sort,
+            "functions": functions,
+        }
+
+
+_last: Optional[Profile] = None
+
+
+def _short_path(filename: str) -> str:
+    """Trim a path to what identifies it: package-relative where possible."""
+    parts = filename.replace("\\", "/").split("/")
+    for marker in ("site-packages", "mcp_server"):
+        if marker in parts:
+            index = len(parts) - 1 - parts[::-1].index(marker)
+            return "/".join(parts[index + (marker == "site-packages"):])
+    return "/".join(parts[-2:])
+
+
+@contextlib.contextmanager
+def profile_scope(enabled: bool) -> Iterator[None]:
+    """Profile the handler calls made in this context (if enabled)."""
+    if not enabled:
+        yield
+        return
+    token = _requested.set(True)
+    try:
+        yield
+    finally:
+        _requested.reset(token)
+
+
+def wanted(tool: str) -> bool:
+    """Whether a call of `tool` here should be profiled."""
+    if _requested.get():
+        return True
+    return _tools is not None and (not _tools or tool in _tools)
+
+
+def run(tool: str, func: Callable[..., T], *args: Any) -> T:
+    """Call func(*args), under the profiler if `tool` should be profiled."""
+    if not wanted(tool):
+        return func(*args)
+    if not _busy.acquire(blocking=False):
+        logger.debug("Not profiling %s: another call is being profiled", tool)
+        return func(*args)
+    try:
+        return _profile(tool, func, *args)
+    finally:
+        _busy.release()
+
+
+def _profile(tool: str, func: Callable[..., T], *args: Any) -> T:
+    global _last
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    started = time.time()
+    t0 = time.perf_counter()
+    error: Optional[str] = None
+    try:
+        return profiler.runcall(func, *args)
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        duration = time.perf_counter() - t0
+        stats = pstats.Stats(profiler)
+        _last = Profile(tool, _save(profiler, tool, started), started, duration, error, stats)
+
+
+def _save(profiler: Any, tool: str, started: float) -> Optional[str]:
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(started)) + f"-{int(started * 1000) % 1000:03d}"
+    path = os.path.join(PROFILE_DIR, f"{tool}-{stamp}.prof")
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        profiler.dump_stats(path)
+    except OSError as exc:
+        logger.warning("Cannot write profile to %s: %s", path, exc)
+        return None
+    try:
+        profiles = sorted(glob.glob(os.path.join(PROFILE_DIR, "*.prof")), key=os.path.getmtime)
+        for old in profiles[: max(0, len(profiles) - PROFILE_KEEP)]:
+            os.remove(old)
+    except OSError:
+        # Another process pruning the same directory.
+        pass
+    return path
+
+
+def last_profile() -> Optional[Profile]:
+    """The most recent profile taken in this process, if any."""
+    return _last
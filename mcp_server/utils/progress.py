@@ -0,0 +1,54 @@
+"""
+progress.py
+
+Progressive results: adapters hand over batches of items as they finish,
+before the whole call is done.
+
+A caller that wants the batches (the MCP server, when a client asked for
+progress notifications) opens a `progress_scope()` with a sink; adapter
+code calls `emit()` whenever it has something ready. Without a sink,
+`emit()` does nothing, so adapters can call it unconditionally.
+
+Like utils/deadline.py this is built on contextvars: the sink follows a
+call onto worker threads through the tool executor and `deadline.bind()`,
+and concurrent calls never see each other's sinks. Sinks are called from
+whatever thread emits and must be thread-safe.
+"""
+
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+# sink(items, label): items is a non-empty list of JSON-ready dicts; label
+# says where they came from (e.g. a source name), if anything.
+Sink = Callable[[List[Dict[str, Any]], Optional[str]], None]
+
+_sink: contextvars.ContextVar[Optional[Sink]] = contextvars.ContextVar(
+    "web2api_progress", default=None
+)
+
+
+@contextmanager
+def progress_scope(sink: Optional[Sink]) -> Iterator[None]:
+    """Send batches emitted in the block to `sink` (None = keep the current one)."""
+    if sink is None:
+        yield
+        return
+    token = _sink.set(sink)
+    try:
+        yield
+    finally:
+        _sink.reset(token)
+
+
+def active() -> bool:
+    """True if someone is listening, i.e. building a batch is worth it."""
+    return _sink.get() is not None
+
+
+def emit(items: List[Dict[str, Any]], label: Optional[str] = None) -> None:
+    """Hand a batch of finished items to the current sink, if any."""
+    sink = _sink.get()
+    if sink is not None and items:
+        sink(items, label)
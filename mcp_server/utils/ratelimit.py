@@ -0,0 +1,235 @@
+"""
+ratelimit.py
+
+Per-host token-bucket rate limiting shared by every thread and coroutine
+in the process.
+
+Callers that find the bucket empty are queued (they sleep until their
+reserved token becomes available) instead of failing, up to a maximum
+wait. Upstream hints (`Retry-After`, `X-Ratelimit-Remaining/Reset`) pause
+the bucket so queued callers don't walk straight into another 429.
+"""
+
+import asyncio
+import email.utils
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+from . import metrics
+from .cache import LRUCache
+from .metrics import LatencyWindow
+from .settings import env_float, env_int, env_str
+
+
+# Default (requests per second, burst) for hosts without explicit config.
+DEFAULT_RATE = (5.0, 10)
+
+# Per-host (requests per second, burst) overrides.
+HOST_RATES: Dict[str, tuple] = {
+    # Reddit throttles unauthenticated clients hard, so be conservative there.
+    "www.reddit.com": (0.5, 5),
+    # HN's Firebase API is built for many small item reads.
+    "hacker-news.firebaseio.com": (50.0, 50),
+}
+
+MAX_WAIT = env_float("WEB2API_RATE_MAX_WAIT", 10.0)
+
+# Hosts to keep per-host state for (buckets here, breakers in http_client,
+# article download slots); the least recently used host is dropped first.
+# Article links can name any host, so this must not grow with them.
+MAX_HOSTS = env_int("WEB2API_MAX_HOSTS", 1024)
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a caller would have to wait longer than its max wait."""
+
+
+class TokenBucket:
+    """
+    Token bucket where each caller reserves a token up front.
+
+    `_tokens` may go negative: each queued caller takes one token of
+    "debt" and sleeps until the refill pays it back, which keeps the queue
+    FIFO without a condition variable.
+    """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = max(rate, 1e-6)
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self.max_queue_depth = 0
+        self.acquired = 0
+        self.rejected = 0
+        self.throttled = 0
+        self.wait_times = LatencyWindow()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def _reserve(self, max_wait: float) -> float:
+        """Reserve a token and return how long the caller must sleep."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            ready_at = self._updated + max(0.0, 1.0 - self._tokens) / self.rate
+            wait = max(0.0, ready_at - now)
+            if wait > max_wait:
+                self.rejected += 1
+                raise RateLimitTimeout(
+                    f"Rate limit queue wait {wait:.2f}s exceeds max wait {max_wait:.2f}s"
+                )
+            self._tokens -= 1.0
+            self.acquired += 1
+            if wait > 0:
+                self._waiting += 1
+                self.max_queue_depth = max(self.max_queue_depth, self._waiting)
+            return wait
+
+    def _done_waiting(self, wait: float) -> None:
+        self.wait_times.observe(wait)
+        if wait > 0:
+            with self._lock:
+                self._waiting -= 1
+
+    def acquire(self, max_wait: float = MAX_WAIT) -> float:
+        """Block until a token is available; return the time waited."""
+        wait = self._reserve(max_wait)
+        try:
+            if wait > 0:
+                time.sleep(wait)
+        finally:
+            self._done_waiting(wait)
+        return wait
+
+    async def acquire_async(self, max_wait: float = MAX_WAIT) -> float:
+        """Coroutine version of `acquire()` sharing the same bucket."""
+        wait = self._reserve(max_wait)
+        try:
+            if wait > 0:
+                await asyncio.sleep(wait)
+        finally:
+            self._done_waiting(wait)
+        return wait
+
+    def try_acquire(self) -> bool:
+        """Take a token only if one is available right now."""
+        try:
+            self._reserve(0.0)
+        except RateLimitTimeout:
+            return False
+        self._done_waiting(0.0)
+        return True
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for `seconds`, then resume with one token."""
+        if seconds <= 0:
+            return
+        with self._lock:
+            resume_at = time.monotonic() + seconds
+            if resume_at > self._updated:
+                self._updated = resume_at
+                self._tokens = min(self._tokens, 1.0)
+
+    def observe_response(self, status: int, headers: Mapping[str, str]) -> None:
+        """Pause the bucket according to the upstream's rate-limit headers."""
+        if status == 429:
+            with self._lock:
+                self.throttled += 1
+
+        retry_after = _parse_retry_after(headers.get("Retry-After"))
+        if retry_after is not None and status in (429, 503):
+            self.pause(retry_after)
+            return
+
+        remaining = _parse_float(headers.get("X-Ratelimit-Remaining"))
+        reset = _parse_float(headers.get("X-Ratelimit-Reset"))
+        if remaining is not None and reset is not None and remaining < 1:
+            self.pause(reset)
+        elif status == 429:
+            # Throttled without a hint: back off for one refill period.
+            self.pause(1.0 / self.rate)
+
+    @property
+    def queue_depth(self) -> int:
+        with self._lock:
+            return self._waiting
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate": self.rate,
+            "capacity": self.capacity,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "acquired": self.acquired,
+            "rejected": self.rejected,
+            "throttled": self.throttled,
+            "wait": self.wait_times.stats(),
+        }
+
+
+def _parse_float(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse Retry-After as delta-seconds or an HTTP date."""
+    if value is None:
+        return None
+    seconds = _parse_float(value)
+    if seconds is not None:
+        return max(0.0, seconds)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def _parse_rate_overrides(spec: Optional[str]) -> Dict[str, tuple]:
+    """Parse "host=rate:burst,host2=rate" into {host: (rate, burst)}."""
+    rates: Dict[str, tuple] = {}
+    for part in (spec or "").split(","):
+        host, _, value = part.strip().partition("=")
+        if not host or not value:
+            continue
+        rate, _, burst = value.partition(":")
+        try:
+            rates[host] = (float(rate), int(burst) if burst else DEFAULT_RATE[1])
+        except ValueError:
+            continue
+    return rates
+
+
+HOST_RATES.update(_parse_rate_overrides(env_str("WEB2API_RATE_LIMITS")))
+
+_buckets: LRUCache[TokenBucket] = LRUCache(max_entries=MAX_HOSTS)
+_buckets_lock = threading.Lock()
+
+
+def get_limiter(host: str) -> TokenBucket:
+    """Return the process-wide bucket for a host, creating it on first use."""
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            rate, capacity = HOST_RATES.get(host, DEFAULT_RATE)
+            bucket = TokenBucket(rate, capacity)
+            _buckets.set(host, bucket)
+        return bucket
+
+
+def limiter_stats() -> Dict[str, Any]:
+    """Return queue depth and wait-time stats for every host bucket."""
+    return {host: bucket.stats() for host, bucket in _buckets.items()}
+
+
+metrics.register("http.rate_limits", limiter_stats)
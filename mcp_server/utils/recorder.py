@@ -0,0 +1,120 @@
+"""
+recorder.py
+
+Record mode: append every tool call a server handles to an NDJSON trace,
+for replay with scripts/replay_trace.py.
+
+Enable it with WEB2API_RECORD=/path/to/trace.ndjson. Each line is one call:
+
+    {"ts": 1767225600.125, "tool": "get_feed", "args": {"source": "reddit"},
+     "duration_ms": 3.1, "ok": true, "error": null}
+
+`ts` is the wall-clock start of the call, so a replay can reproduce the
+original arrival times even when several processes append to one file.
+"""
+
+import functools
+import inspect
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from . import jsonio
+from .settings import env_str
+
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class TraceRecorder:
+    """Appends one JSON line per recorded call; safe to share across threads."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = open(path, "ab", buffering=0)
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def record(
+        self,
+        tool: str,
+        args: Dict[str, Any],
+        started: float,
+        duration: float,
+        error: Optional[str] = None,
+    ) -> None:
+        """Record one call; `started` is a time.monotonic() timestamp."""
+        # Convert the monotonic start to wall-clock time.
+        wall_start = time.time() - (time.monotonic() - started)
+        line = jsonio.dumps_bytes(
+            {
+                "ts": round(wall_start, 6),
+                "tool": tool,
+                "args": args,
+                "duration_ms": round(duration * 1000.0, 3),
+                "ok": error is None,
+                "error": error,
+            }
+        )
+        with self._lock:
+            self._file.write(line + b"\n")
+            self.recorded += 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+_recorder: Optional[TraceRecorder] = None
+_recorder_lock = threading.Lock()
+_configured = False
+
+
+def get_recorder() -> Optional[TraceRecorder]:
+    """Return the recorder configured by WEB2API_RECORD, if any."""
+    global _recorder, _configured
+    if not _configured:
+        with _recorder_lock:
+            if not _configured:
+                path = env_str("WEB2API_RECORD")
+                if path:
+                    try:
+                        _recorder = TraceRecorder(path)
+                    except OSError as exc:
+                        logger.warning("Cannot record tool calls to %s: %s", path, exc)
+                _configured = True
+    return _recorder
+
+
+def recorded(func: F) -> F:
+    """
+    Decorator recording calls of an async tool function under its name.
+
+    When recording is off the only overhead is a get_recorder() call. The
+    wrapper keeps the function's signature, so FastMCP still sees the real
+    arguments.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        recorder = get_recorder()
+        if recorder is None:
+            return await func(*args, **kwargs)
+        started = time.monotonic()
+        error: Optional[str] = None
+        try:
+            return await func(*args, **kwargs)
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            arguments = dict(signature.bind_partial(*args, **kwargs).arguments)
+            # FastMCP's request context is injected, not a call argument.
+            arguments.pop("ctx", None)
+            recorder.record(func.__name__, arguments, started, time.monotonic() - started, error)
+
+    return wrapper  # type: ignore[return-value]
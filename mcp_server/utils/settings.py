@@ -0,0 +1,41 @@
+"""
+settings.py
+
+Small helpers for reading tuning knobs from environment variables.
+
+Every knob is optional; modules keep their own defaults and only use these
+helpers to let operators override them (e.g. from ~/.web2api_mcp.env).
+"""
+
+import os
+from typing import Optional
+
+
+def env_str(name: str, default: Optional[str] = None) -> Optional[str]:
+    """Return the stripped value of an env var, or default if unset/empty."""
+    value = os.environ.get(name, "").strip()
+    return value or default
+
+
+def env_int(name: str, default: int) -> int:
+    """Return an env var as int, falling back to default on bad input."""
+    try:
+        return int(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    """Return an env var as float, falling back to default on bad input."""
+    try:
+        return float(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def env_bool(name: str, default: bool = False) -> bool:
+    """Return an env var as bool ("1", "true", "yes", "on" are truthy)."""
+    value = os.environ.get(name)
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
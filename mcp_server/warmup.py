@@ -0,0 +1,211 @@
+"""
+warmup.py
+
+Optional background warmup at server startup, so the first tool call
+doesn't pay for DNS, TLS, imports and empty caches. It is off unless
+WEB2API_WARMUP=1: every process start would otherwise send requests to
+every upstream.
+
+`start_warmup()` starts one daemon thread that, in parallel:
+- sends a HEAD request to every upstream host through the shared session
+  (within the host's rate limit and circuit breaker), leaving a pooled
+  connection (DNS lookup, TCP and TLS handshakes done) behind;
+- prefetches the snapshot of every source into the snapshot store, which
+  also imports the adapters (and BeautifulSoup behind them).
+
+Sources whose snapshot is still fresh in the shared cache (see
+shared_cache.py) are adopted instead: neither prefetched nor connected to.
+
+Nothing waits for it: the MCP handshake and the web app start serving
+right away, and a call that arrives mid-warmup simply joins the refresh
+already in flight (the store is single-flight per source). When it is done
+it logs a summary and marks itself finished in utils.metrics ("warmup").
+
+Settings:
+
+    WEB2API_WARMUP=1                       enable warmup
+    WEB2API_WARMUP_SOURCES=hackernews,reddit   prefetch only these ("none": no prefetch)
+    WEB2API_WARMUP_HOSTS=https://example.com   more hosts to connect to (comma-separated)
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .sites import SITES
+from .snapshots import SOURCES, get_store
+from .utils import metrics
+from .utils.settings import env_bool, env_str
+
+
+logger = logging.getLogger(__name__)
+
+# Upstreams of the hand-written adapters; site hosts come from their specs.
+UPSTREAM_URLS: Dict[str, Tuple[str, ...]] = {
+    "hackernews": ("https://news.ycombinator.com/", "https://hacker-news.firebaseio.com/"),
+    "producthunt": ("https://www.producthunt.com/",),
+    "reddit": ("https://www.reddit.com/",),
+}
+
+MAX_WORKERS = 8
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return [part.strip() for part in (value or "").split(",") if part.strip()]
+
+
+def source_urls() -> Dict[str, List[str]]:
+    """The upstream URLs behind each source, sites included."""
+    urls = {source: list(upstreams) for source, upstreams in UPSTREAM_URLS.items()}
+    for key, spec in SITES.items():
+        urls.setdefault(key, []).append(spec.url)
+    return urls
+
+
+def default_urls() -> List[str]:
+    """Every upstream the tools talk to, plus WEB2API_WARMUP_HOSTS."""
+    urls = [url for upstreams in source_urls().values() for url in upstreams]
+    for extra in _split(env_str("WEB2API_WARMUP_HOSTS")):
+        urls.append(extra if "://" in extra else f"https://{extra}/")
+    return list(dict.fromkeys(urls))
+
+
+def default_sources() -> List[str]:
+    """Sources to prefetch: WEB2API_WARMUP_SOURCES, or all of them."""
+    value = env_str("WEB2API_WARMUP_SOURCES")
+    if value is None:
+        return list(SOURCES)
+    if value.lower() == "none":
+        return []
+    names = [name.lower() for name in _split(value)]
+    unknown = [name for name in names if name not in SOURCES]
+    if unknown:
+        logger.warning("Ignoring unknown warmup sources: %s", ", ".join(unknown))
+    return [name for name in names if name in SOURCES]
+
+
+def connect(url: str) -> None:
+    """
+    Send a HEAD request to url through the shared session, leaving a
+    connection (DNS lookup, TCP and TLS done) in its pool for the next
+    request to that host to reuse. See http_client.open_connection().
+    """
+    from .utils.http_client import open_connection
+
+    open_connection(url)
+
+
+class Warmup:
+    """One warmup run: connects to `urls` and prefetches `sources`."""
+
+    def __init__(self, urls: Sequence[str], sources: Sequence[str]) -> None:
+        self.urls = list(urls)
+        self.sources = list(sources)
+        self.connected: List[str] = []
+        self.prefetched: List[str] = []
+        # Sources still fresh in the shared cache, and the URLs skipped for them.
+        self.fresh: List[str] = []
+        self.skipped: List[str] = []
+        self.errors: Dict[str, str] = {}
+        self.started_at: Optional[float] = None
+        self.duration: Optional[float] = None
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def finished(self) -> bool:
+        return self._done.is_set()
+
+    def start(self) -> "Warmup":
+        """Run in a daemon thread and return immediately."""
+        self._thread = threading.Thread(target=self.run, name="web2api-warmup", daemon=True)
+        self._thread.start()
+        return self
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until warmup finishes (or timeout); True if it finished."""
+        return self._done.wait(timeout)
+
+    def run(self) -> None:
+        self.started_at = time.monotonic()
+        try:
+            store = get_store()
+            self.fresh = [source for source in SOURCES if self._is_fresh(store, source)]
+            by_source = source_urls()
+            needed = {url for source, urls in by_source.items() if source not in self.fresh for url in urls}
+            known = {url for urls in by_source.values() for url in urls}
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="web2api-warmup") as pool:
+                for url in self.urls:
+                    if url in known and url not in needed:
+                        self.skipped.append(url)
+                        continue
+                    pool.submit(self._step, f"connect {url}", connect, url, self.connected)
+                for source in self.sources:
+                    if source not in self.fresh:
+                        pool.submit(self._step, f"prefetch {source}", store.get, source, self.prefetched)
+        finally:
+            self.duration = time.monotonic() - self.started_at
+            logger.info(
+                "Warmup finished in %.0f ms: %d/%d hosts connected, %d/%d sources prefetched, %d already fresh",
+                self.duration * 1000.0,
+                len(self.connected),
+                len(self.urls),
+                len(self.prefetched),
+                len(self.sources),
+                len(self.fresh),
+            )
+            for step, error in self.errors.items():
+                logger.info("Warmup step failed: %s: %s", step, error)
+            self._done.set()
+
+    def _is_fresh(self, store: Any, source: str) -> bool:
+        try:
+            return store.cached(source) is not None
+        except Exception as exc:  # noqa: BLE001 - warmup is best effort
+            self.errors[f"check {source}"] = f"{type(exc).__name__}: {exc}"
+            return False
+
+    def _step(self, name: str, func: Any, arg: str, done: List[str]) -> None:
+        try:
+            func(arg)
+        except Exception as exc:  # noqa: BLE001 - warmup is best effort
+            self.errors[name] = f"{type(exc).__name__}: {exc}"
+        else:
+            done.append(arg)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "finished": self.finished,
+            "duration_ms": None if self.duration is None else round(self.duration * 1000.0, 1),
+            "hosts": {"total": len(self.urls), "connected": len(self.connected), "skipped": len(self.skipped)},
+            "sources": {"total": len(self.sources), "prefetched": len(self.prefetched), "fresh": len(self.fresh)},
+            "errors": dict(self.errors),
+        }
+
+
+_warmup: Optional[Warmup] = None
+_warmup_lock = threading.Lock()
+
+
+def start_warmup() -> Optional[Warmup]:
+    """
+    Start this process's warmup (once) if WEB2API_WARMUP enables it.
+
+    Returns the running (or finished) Warmup, or None when disabled.
+    """
+    global _warmup
+    if not env_bool("WEB2API_WARMUP", False):
+        return None
+    with _warmup_lock:
+        if _warmup is None:
+            _warmup = Warmup(default_urls(), default_sources())
+            metrics.register("warmup", _warmup.stats)
+            _warmup.start()
+    return _warmup
+
+
+def get_warmup() -> Optional[Warmup]:
+    """The warmup started by start_warmup(), if any."""
+    return _warmup
@@ -0,0 +1,108 @@
+"""
+bench_startup.py
+
+Startup-time benchmark for the MCP server.
+
+Imports the server module in a fresh interpreter with `-X importtime`,
+then reports the slowest imports and the time spent in our own modules.
+It also flags heavy dependencies that should only load on first tool use.
+
+Run with:
+    python3 scripts/bench_startup.py
+    python3 scripts/bench_startup.py --module mcp_server.tools --budget-ms 150
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be imported just to start the server.
+LAZY_MODULES = ("bs4", "requests", "mcp_server.adapters")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure MCP server import time")
+    parser.add_argument(
+        "--module",
+        default="mcp_server.mcp_server",
+        help="Module to import (default: mcp_server.mcp_server)",
+    )
+    parser.add_argument("--top", type=int, default=15, help="How many slow imports to list")
+    parser.add_argument(
+        "--runs", type=int, default=3, help="Repeat and report the fastest run (default 3)"
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=None,
+        help="Exit non-zero if the total import time exceeds this budget",
+    )
+    return parser.parse_args()
+
+
+def run_once(module: str) -> Tuple[float, List[Tuple[str, int, int]]]:
+    """Import `module` in a subprocess; return wall time and importtime rows."""
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        raise SystemExit(f"Importing {module!r} failed")
+
+    rows: List[Tuple[str, int, int]] = []
+    for line in proc.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return wall, rows
+
+
+def main() -> None:
+    args = parse_args()
+
+    runs = [run_once(args.module) for _ in range(max(1, args.runs))]
+    wall, rows = min(runs, key=lambda r: r[0])
+
+    by_module: Dict[str, Tuple[int, int]] = {name: (s, c) for name, s, c in rows}
+    total_ms = by_module.get(args.module, (0, 0))[1] / 1000.0
+
+    print(f"{args.module}: {total_ms:.1f} ms import, {wall * 1000:.1f} ms interpreter wall time")
+    print()
+    print("Slowest imports (cumulative):")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda r: -r[2])[: args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {self_us / 1000:8.1f} ms self  {name}")
+
+    print()
+    print("Project modules:")
+    for name, self_us, cumulative_us in rows:
+        if name.startswith(("mcp_server", "web2api_mcp")):
+            print(f"  {cumulative_us / 1000:8.1f} ms  {self_us / 1000:8.1f} ms self  {name}")
+
+    eager = sorted(
+        name for name in by_module if any(name == m or name.startswith(m + ".") for m in LAZY_MODULES)
+    )
+    if eager:
+        print()
+        print("Imported eagerly but should be lazy:")
+        for name in eager:
+            print(f"  {name}")
+
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        raise SystemExit(f"Startup budget exceeded: {total_ms:.1f} ms > {args.budget_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""
+replay_trace.py
+
+Load generator for the MCP server: replays a recorded (or synthetic) trace
+of tool calls against a server it starts over stdio, then reports
+throughput, latency percentiles and error rates.
+
+Record a trace from real traffic with WEB2API_RECORD=/path/trace.ndjson
+(see mcp_server/utils/recorder.py), then:
+
+    python3 scripts/replay_trace.py trace.ndjson                  # original pacing
+    python3 scripts/replay_trace.py trace.ndjson --speedup 10     # 10x faster
+    python3 scripts/replay_trace.py trace.ndjson --speedup 0 --concurrency 32
+    python3 scripts/replay_trace.py --synthetic 500 --rate 50     # no trace needed
+
+By default calls go to one `mcp_server.mcp_server` process speaking MCP
+JSON-RPC; `--server stdio` instead runs one legacy `mcp_server.stdio_server`
+process per call (so latencies include interpreter startup).
+
+A call that can't get one of the --concurrency slots within --timeout
+(the server is saturated) is shed: it is counted, never sent, and left
+out of the latency figures.
+"""
+
+import argparse
+import itertools
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from mcp_server.utils import jsonio  # noqa: E402
+from mcp_server.utils.metrics import LatencyWindow  # noqa: E402
+
+
+PROTOCOL_VERSION = "2025-06-18"
+
+
+class Call(NamedTuple):
+    offset: float  # seconds after the first call
+    tool: str
+    args: Dict[str, Any]
+
+
+class Outcome(NamedTuple):
+    tool: str
+    latency: float
+    error: Optional[str]
+    shed: bool = False  # dropped for lack of a concurrency slot, never sent
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay tool-call traces against the MCP server")
+    parser.add_argument("trace", nargs="?", help="NDJSON trace recorded with WEB2API_RECORD")
+    parser.add_argument(
+        "--synthetic", type=int, default=0, help="Generate N synthetic feed calls instead of a trace"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=20.0, help="Synthetic arrival rate in calls/s (default 20)"
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for --synthetic")
+    parser.add_argument(
+        "--speedup",
+        type=float,
+        default=1.0,
+        help="Divide recorded inter-arrival times by this; 0 sends as fast as allowed (default 1)",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=16, help="Maximum calls in flight (default 16)"
+    )
+    parser.add_argument(
+        "--server",
+        choices=("mcp", "stdio"),
+        default="mcp",
+        help="mcp: one MCP server over stdio (default); stdio: one stdio_server process per call",
+    )
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-call timeout in seconds")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+    if not args.trace and not args.synthetic:
+        parser.error("give a trace file or --synthetic N")
+    return args
+
+
+def load_trace(path: str) -> List[Call]:
+    """Read a recorded trace; offsets are relative to the earliest call."""
+    records = []
+    with open(path, "rb") as fh:
+        for line in fh:
+            if line.strip():
+                records.append(jsonio.loads(line))
+    records.sort(key=lambda r: r["ts"])
+    if not records:
+        return []
+    first = records[0]["ts"]
+    return [Call(r["ts"] - first, r["tool"], r.get("args") or {}) for r in records]
+
+
+# Per-source tools exist on both servers (get_feed only on the MCP one).
+SYNTHETIC_TOOLS = ["hn_get_top_posts"] * 5 + ["reddit_get_top_posts"] * 3 + ["ph_get_top_products"] * 2
+
+
+def synthetic_trace(count: int, rate: float, seed: int) -> List[Call]:
+    """Poisson arrivals of feed calls with a skewed mix of sources and limits."""
+    rng = random.Random(seed)
+    calls = []
+    offset = 0.0
+    for _ in range(count):
+        offset += rng.expovariate(rate) if rate > 0 else 0.0
+        args: Dict[str, Any] = {"limit": rng.choice((5, 10, 10, 30, 50))}
+        if rng.random() < 0.3:
+            args["fields"] = ["title", "link"]
+        calls.append(Call(offset, rng.choice(SYNTHETIC_TOOLS), args))
+    return calls
+
+
+class McpStdioClient:
+    """Minimal MCP client: JSON-RPC over a child process's stdin/stdout."""
+
+    def __init__(self, command: List[str]) -> None:
+        self._proc = subprocess.Popen(
+            command,
+            cwd=PROJECT_ROOT,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            bufsize=0,
+            # Keep per-request INFO logs out of the report; errors still show.
+            env=dict(os.environ, FASTMCP_LOG_LEVEL="WARNING"),
+        )
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+    def initialize(self, timeout: float) -> None:
+        self.request(
+            "initialize",
+            {
+                "protocolVersion": PROTOCOL_VERSION,
+                "capabilities": {},
+                "clientInfo": {"name": "web2api-replay", "version": "0.1"},
+            },
+        ).result(timeout)
+        self._send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+    def request(self, method: str, params: Dict[str, Any]) -> Future:
+        future: Future = Future()
+        with self._lock:
+            request_id = next(self._ids)
+            self._pending[request_id] = future
+        self._send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+        return future
+
+    def call_tool(self, tool: str, args: Dict[str, Any]) -> Future:
+        return self.request("tools/call", {"name": tool, "arguments": args})
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        data = jsonio.dumps_bytes(message) + b"\n"
+        with self._lock:
+            assert self._proc.stdin is not None
+            self._proc.stdin.write(data)
+
+    def _read_loop(self) -> None:
+        assert self._proc.stdout is not None
+        for line in self._proc.stdout:
+            try:
+                message = jsonio.loads(line)
+            except jsonio.JSONDecodeError:
+                continue
+            with self._lock:
+                future = self._pending.pop(message.get("id"), None)
+            if future is not None:
+                future.set_result(message)
+        # Server exited: fail everything still waiting.
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(RuntimeError("server exited"))
+
+    def close(self) -> None:
+        if self._proc.stdin is not None:
+            self._proc.stdin.close()
+        try:
+            self._proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+
+
+def _mcp_error(message: Dict[str, Any]) -> Optional[str]:
+    if "error" in message:
+        return str(message["error"].get("message", message["error"]))
+    result = message.get("result") or {}
+    if result.get("isError"):
+        content = result.get("content") or [{}]
+        return str(content[0].get("text", "tool error"))
+    return None
+
+
+def replay_mcp(calls: List[Call], speedup: float, concurrency: int, timeout: float) -> List[Outcome]:
+    client = McpStdioClient([sys.executable, "-m", "mcp_server.mcp_server"])
+    try:
+        client.initialize(timeout)
+        slots = threading.Semaphore(max(1, concurrency))
+        outcomes: List[Outcome] = []
+        outcomes_lock = threading.Lock()
+
+        def finish(tool: str, sent: float, future: Future) -> None:
+            latency = time.perf_counter() - sent
+            try:
+                error = _mcp_error(future.result())
+            except Exception as exc:  # noqa: BLE001 - reported, not raised
+                error = str(exc)
+            with outcomes_lock:
+                outcomes.append(Outcome(tool, latency, error))
+            slots.release()
+
+        sent_calls = []
+        start = time.perf_counter()
+        for call in calls:
+            _wait_until(start, call.offset, speedup)
+            # Bounded so calls that never answer can't stall the replay. No
+            # slot means the target is saturated: shed the call rather than
+            # send it past the concurrency limit.
+            if not slots.acquire(timeout=timeout):
+                with outcomes_lock:
+                    outcomes.append(Outcome(call.tool, 0.0, None, shed=True))
+                continue
+            sent = time.perf_counter()
+            future = client.call_tool(call.tool, call.args)
+            future.add_done_callback(lambda f, tool=call.tool, sent=sent: finish(tool, sent, f))
+            sent_calls.append((call, future))
+
+        deadline = time.perf_counter() + timeout
+        for _, future in sent_calls:
+            try:
+                future.result(max(0.0, deadline - time.perf_counter()))
+            except Exception:  # noqa: BLE001 - counted below
+                pass
+        with outcomes_lock:
+            done = list(outcomes)
+        done.extend(
+            Outcome(call.tool, timeout, "timed out") for call, future in sent_calls if not future.done()
+        )
+        return done
+    finally:
+        client.close()
+
+
+def _run_stdio_call(call: Call, timeout: float) -> Outcome:
+    request = jsonio.dumps_bytes({"tool": call.tool, "args": call.args})
+    sent = time.perf_counter()
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-m", "mcp_server.stdio_server"],
+            cwd=PROJECT_ROOT,
+            input=request,
+            capture_output=True,
+            timeout=timeout,
+        )
+        response = jsonio.loads(proc.stdout)
+        error = None if response.get("ok") else str(response.get("error"))
+        if error is None and isinstance(response.get("result"), dict):
+            error = response["result"].get("error")
+    except (subprocess.TimeoutExpired, ValueError) as exc:
+        error = str(exc)
+    return Outcome(call.tool, time.perf_counter() - sent, error)
+
+
+def replay_stdio(calls: List[Call], speedup: float, concurrency: int, timeout: float) -> List[Outcome]:
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = []
+        start = time.perf_counter()
+        for call in calls:
+            _wait_until(start, call.offset, speedup)
+            futures.append(pool.submit(_run_stdio_call, call, timeout))
+        return [future.result() for future in futures]
+
+
+def _wait_until(start: float, offset: float, speedup: float) -> None:
+    if speedup <= 0:
+        return
+    delay = start + offset / speedup - time.perf_counter()
+    if delay > 0:
+        time.sleep(delay)
+
+
+def summarize(outcomes: List[Outcome], wall: float) -> Dict[str, Any]:
+    def stats(group: List[Outcome]) -> Dict[str, Any]:
+        sent = [outcome for outcome in group if not outcome.shed]
+        window = LatencyWindow(size=max(1, len(sent)))
+        for outcome in sent:
+            window.observe(outcome.latency)
+        errors = sum(1 for outcome in sent if outcome.error)
+        ms = {k: round(v * 1000, 2) if v is not None else None for k, v in window.stats().items() if k != "count"}
+        return {
+            "calls": len(group),
+            "shed": len(group) - len(sent),
+            "errors": errors,
+            "error_rate": round(errors / len(group), 4) if group else 0.0,
+            "latency_ms": ms,
+        }
+
+    by_tool: Dict[str, List[Outcome]] = {}
+    for outcome in outcomes:
+        by_tool.setdefault(outcome.tool, []).append(outcome)
+
+    report = stats(outcomes)
+    report["wall_s"] = round(wall, 3)
+    report["throughput"] = round((report["calls"] - report["shed"]) / wall, 2) if wall > 0 else None
+    report["tools"] = {tool: stats(group) for tool, group in sorted(by_tool.items())}
+    errors: Dict[str, int] = {}
+    for outcome in outcomes:
+        if outcome.error:
+            errors[outcome.error[:120]] = errors.get(outcome.error[:120], 0) + 1
+    report["top_errors"] = sorted(errors.items(), key=lambda e: -e[1])[:5]
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    def line(name: str, s: Dict[str, Any]) -> str:
+        lat = s["latency_ms"]
+        return (
+            f"  {name:<24} {s['calls']:>6} calls  {s['shed']:>5} shed  {s['error_rate'] * 100:5.1f}% errors  "
+            f"p50 {lat['p50']} ms  p95 {lat['p95']} ms  p99 {lat['p99']} ms"
+        )
+
+    print(f"{report['calls']} calls in {report['wall_s']} s: {report['throughput']} calls/s")
+    print(line("all", report))
+    for tool, stats in report["tools"].items():
+        print(line(tool, stats))
+    if report["top_errors"]:
+        print()
+        print("Top errors:")
+        for message, count in report["top_errors"]:
+            print(f"  {count:>6}  {message}")
+
+
+def main() -> None:
+    args = parse_args()
+    calls = load_trace(args.trace) if args.trace else synthetic_trace(args.synthetic, args.rate, args.seed)
+    if not calls:
+        raise SystemExit("Trace is empty")
+
+    replay = replay_mcp if args.server == "mcp" else replay_stdio
+    started = time.perf_counter()
+    outcomes = replay(calls, args.speedup, args.concurrency, args.timeout)
+    report = summarize(outcomes, time.perf_counter() - started)
+
+    if args.json:
+        print(jsonio.dumps(report, indent=True))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,564 @@
+"""
+soak.py
+
+Soak test for the MCP server and web app: drives both in-process for as
+long as you like against generated local fixtures, samples memory, and
+fails if memory keeps growing or a cache outgrows its bounds.
+
+    python3 scripts/soak.py --duration 2h
+    python3 scripts/soak.py --duration 5m --sample-every 10 --samples soak.ndjson
+    python3 scripts/soak.py --duration 60 --json
+
+No network is used. An HTTP adapter mounted on the shared session answers
+every upstream request from fixtures generated on the fly: the HN, Product
+Hunt, Reddit and Lobsters pages, HN API items, and article pages. Fixture
+content changes every --churn seconds. Calls are spread over many
+subreddits, comment threads and article hosts, so snapshots, parse memos
+and LRU caches keep filling and evicting as they do in production.
+
+Every --sample-every seconds the harness records:
+- RSS;
+- tracemalloc's traced memory;
+- the size of every cache registered with mcp_server.utils.metrics.
+
+The first sample after --warmup is the baseline. The run fails (exit code
+1) if, averaged over the last three samples:
+- RSS grew by more than --max-rss-growth MB, or
+- traced memory grew by more than --max-traced-growth MB.
+It also fails if any cache ever held more entries or bytes than its limit,
+or if more than --max-error-rate of calls failed. The report lists the
+lines whose allocations grew the most since the baseline.
+"""
+
+import argparse
+import asyncio
+import gc
+import io
+import os
+import random
+import re
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+# Short TTLs so snapshots and listings keep refreshing during the run, and
+# no rate limiting of the fixture hosts. Set before the server modules read
+# them; explicit settings in the environment win.
+FIXTURE_HOSTS = (
+    "news.ycombinator.com",
+    "hacker-news.firebaseio.com",
+    "www.producthunt.com",
+    "www.reddit.com",
+    "lobste.rs",
+)
+# The example Lobsters spec exercises the declarative site adapter.
+os.environ.setdefault("WEB2API_SITES", os.path.join(PROJECT_ROOT, "examples", "sites.json"))
+# Article hosts are made up and never resolve; the fixtures serve them.
+os.environ.setdefault("WEB2API_ARTICLES_ALLOW_PRIVATE", "1")
+os.environ.setdefault("WEB2API_SNAPSHOT_TTL", "2")
+os.environ.setdefault("WEB2API_SNAPSHOT_TTL_MIN", "1")
+os.environ.setdefault("WEB2API_SNAPSHOT_TTL_MAX", "5")
+os.environ.setdefault("WEB2API_REDDIT_CACHE_TTL", "5")
+os.environ.setdefault("WEB2API_RATE_LIMITS", ",".join(f"{host}=10000:10000" for host in FIXTURE_HOSTS))
+
+import urllib3  # noqa: E402
+from requests.adapters import HTTPAdapter  # noqa: E402
+
+import web_app  # noqa: E402
+from mcp_server import mcp_server  # noqa: E402
+from mcp_server.snapshots import SOURCES  # noqa: E402
+from mcp_server.utils import jsonio, metrics  # noqa: E402
+from mcp_server.utils.http_client import get_session  # noqa: E402
+from mcp_server.utils.metrics import LatencyWindow  # noqa: E402
+
+
+MB = 1024 * 1024
+
+
+# --- Fixtures --------------------------------------------------------------- #
+
+
+class Fixtures:
+    """Generates upstream responses; content changes every `churn` seconds."""
+
+    def __init__(self, churn: float) -> None:
+        self.churn = max(0.1, churn)
+        self.requests: Dict[str, int] = {}
+
+    @property
+    def generation(self) -> int:
+        return int(time.monotonic() / self.churn)
+
+    def respond(self, url: str) -> Tuple[bytes, str]:
+        parts = urlsplit(url)
+        host = parts.netloc
+        self.requests[host] = self.requests.get(host, 0) + 1
+        if host == "news.ycombinator.com":
+            return self.hn_front_page(), "text/html; charset=utf-8"
+        if host == "hacker-news.firebaseio.com":
+            item_id = int(re.search(r"/item/(\d+)\.json", parts.path).group(1))
+            return jsonio.dumps_bytes(self.hn_item(item_id)), "application/json"
+        if host == "www.producthunt.com":
+            return self.ph_front_page(), "text/html; charset=utf-8"
+        if host == "www.reddit.com":
+            limit = int(parse_qs(parts.query).get("limit", ["25"])[0])
+            return jsonio.dumps_bytes(self.reddit_listing(parts.path, limit)), "application/json"
+        if host == "lobste.rs":
+            return self.lobsters_page(), "text/html; charset=utf-8"
+        return self.article(host, parts.path), "text/html; charset=utf-8"
+
+    def hn_front_page(self) -> bytes:
+        g = self.generation
+        rows = []
+        for i in range(1, 31):
+            rows.append(
+                f'<tr class="athing submission" id="{i}"><td class="title"><span class="rank">{i}.</span></td>'
+                f'<td class="title"><span class="titleline"><a href="https://site{i}.example/{g}">'
+                f"Story {i} (generation {g})</a></span></td></tr>"
+                f'<tr><td colspan="2"></td><td class="subtext"><span class="score">{i * 7 + g} points</span>'
+                f' | <a href="item?id={i}">{i + g}&nbsp;comments</a></td></tr>'
+                '<tr class="spacer"></tr>'
+            )
+        return (
+            '<html><body><table id="hnmain"><tr><td><table>'
+            + "".join(rows)
+            + "</table></td></tr></table></body></html>"
+        ).encode("utf-8")
+
+    def hn_item(self, item_id: int) -> Dict[str, Any]:
+        kids = [item_id * 4 + k for k in (1, 2, 3)] if item_id < 1_000_000 else []
+        return {
+            "id": item_id,
+            "by": f"user{item_id % 97}",
+            "time": 1_700_000_000 + item_id,
+            "title": f"Story {item_id}",
+            "text": "<p>" + f"Comment {item_id} says something. " * 12,
+            "kids": kids,
+        }
+
+    def ph_front_page(self) -> bytes:
+        g = self.generation
+        items = "".join(
+            f'<article data-test="post-item"><a data-test="post-name" href="/posts/p{i}">Product {i} v{g}</a>'
+            f'<p data-test="post-tagline">Does thing {i}</p>'
+            f'<span data-test="post-vote-count">{i * 11 + g}</span><a href="/posts/p{i}">{i} comments</a>'
+            "</article>"
+            for i in range(1, 21)
+        )
+        return f"<html><body>{items}</body></html>".encode("utf-8")
+
+    def reddit_listing(self, path: str, limit: int) -> Dict[str, Any]:
+        g = self.generation
+        children = [
+            {
+                "data": {
+                    "title": f"{path} post {i} (gen {g})",
+                    "permalink": f"{path.rsplit('/', 1)[0]}/comments/{i}/",
+                    "url": f"https://i.example/{i}",
+                    "subreddit": path.split("/")[2],
+                    "ups": i * 13 + g,
+                    "num_comments": i,
+                    "over_18": False,
+                    "id": f"t{i}",
+                    # Fields the adapter drops; real listings carry many.
+                    "selftext": "x" * 400,
+                    "thumbnail": "https://i.example/thumb.jpg",
+                }
+            }
+            for i in range(1, limit + 1)
+        ]
+        return {"data": {"children": children}}
+
+    def lobsters_page(self) -> bytes:
+        g = self.generation
+        stories = "".join(
+            f'<li class="story"><div class="voters"><a class="upvoter">{i + g}</a></div>'
+            f'<span class="link"><a class="u-url" href="https://lob{i}.example/{g}">Lobsters {i} ({g})</a></span>'
+            f'<span class="comments_label"><a href="/s/{i}/x">{i} comments</a></span></li>'
+            for i in range(1, 26)
+        )
+        return f'<html><body><ol class="stories">{stories}</ol></body></html>'.encode("utf-8")
+
+    def article(self, host: str, path: str) -> bytes:
+        paragraphs = "".join(f"<p>{host}{path} paragraph {i}. " + "Lorem ipsum dolor sit amet. " * 8 + "</p>" for i in range(60))
+        return (
+            f"<html><head><title>{host}{path}</title></head><body><nav>menu</nav>"
+            f"<article>{paragraphs}</article><footer>footer</footer></body></html>"
+        ).encode("utf-8")
+
+
+class FixtureAdapter(HTTPAdapter):
+    """Transport adapter answering every request from Fixtures."""
+
+    def __init__(self, fixtures: Fixtures) -> None:
+        super().__init__()
+        self.fixtures = fixtures
+
+    def send(self, request, **kwargs):  # type: ignore[override]
+        body, content_type = self.fixtures.respond(request.url)
+        raw = urllib3.HTTPResponse(
+            body=io.BytesIO(body),
+            headers={"Content-Type": content_type, "Content-Length": str(len(body))},
+            status=200,
+            preload_content=False,
+            decode_content=False,
+            request_method=request.method,
+        )
+        return self.build_response(request, raw)
+
+
+# --- Workload --------------------------------------------------------------- #
+
+
+SUBREDDITS = [f"sub{i}" for i in range(400)]
+ARTICLE_HOSTS = [f"news{i}.example" for i in range(200)]
+
+
+class Workload:
+    """A weighted mix of tool calls and web requests."""
+
+    def __init__(self, seed: int) -> None:
+        self.random = random.Random(seed)
+        self.client = web_app.app.test_client()
+        sources = list(SOURCES)
+        rnd = self.random
+        self.ops: List[Tuple[str, int, Callable[[], Any]]] = [
+            ("get_feed", 30, lambda: mcp_server.get_feed(rnd.choice(sources), limit=rnd.randint(1, 50))),
+            ("get_feeds", 5, lambda: mcp_server.get_feeds(sources, limit=10, fields=["title", "link"])),
+            (
+                "reddit_listing",
+                20,
+                lambda: mcp_server.reddit_get_top_posts(
+                    limit=rnd.choice((5, 10, 25, 50)),
+                    subreddit=rnd.choice(SUBREDDITS),
+                    sort=rnd.choice(("hot", "new", "top", "rising")),
+                ),
+            ),
+            (
+                "hn_get_comments",
+                10,
+                lambda: mcp_server.hn_get_comments(rnd.randint(1, 3000), max_depth=3, max_comments=40),
+            ),
+            (
+                "fetch_articles",
+                10,
+                lambda: mcp_server.fetch_articles(
+                    [f"https://{rnd.choice(ARTICLE_HOSTS)}/a/{rnd.randint(1, 50)}" for _ in range(5)]
+                ),
+            ),
+            ("web_index", 15, lambda: self.web(f"/?source={rnd.choice(sources)}&limit={rnd.randint(1, 50)}")),
+            ("web_api", 10, lambda: self.web(f"/api/feeds?limit={rnd.randint(1, 50)}")),
+        ]
+        self._weights = [weight for _, weight, _ in self.ops]
+
+    async def web(self, path: str) -> None:
+        def get() -> None:
+            response = self.client.get(path)
+            response.get_data()
+            if response.status_code >= 400:
+                raise RuntimeError(f"GET {path}: HTTP {response.status_code}")
+
+        await asyncio.to_thread(get)
+
+    def pick(self) -> Tuple[str, Callable[[], Any]]:
+        name, _, call = self.random.choices(self.ops, weights=self._weights)[0]
+        return name, call
+
+
+# --- Sampling --------------------------------------------------------------- #
+
+
+def rss_bytes() -> int:
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def cache_sizes() -> Dict[str, Dict[str, Any]]:
+    """Every cache-like stats dict (with entries/max_entries) in utils.metrics."""
+    found: Dict[str, Dict[str, Any]] = {}
+
+    def walk(name: str, value: Any) -> None:
+        if not isinstance(value, dict):
+            return
+        if "entries" in value and "max_entries" in value:
+            found[name] = {k: value.get(k) for k in ("entries", "max_entries", "bytes", "max_bytes")}
+            return
+        for key, child in value.items():
+            walk(f"{name}.{key}", child)
+
+    for name, stats in metrics.snapshot().items():
+        walk(name, stats)
+    return found
+
+
+def bound_violations(caches: Dict[str, Dict[str, Any]]) -> List[str]:
+    problems = []
+    for name, size in caches.items():
+        if size["entries"] > size["max_entries"]:
+            problems.append(f"{name}: {size['entries']} entries > max {size['max_entries']}")
+        if size.get("max_bytes") is not None and (size.get("bytes") or 0) > size["max_bytes"]:
+            problems.append(f"{name}: {size['bytes']} bytes > max {size['max_bytes']}")
+    return problems
+
+
+def take_sample(started: float, calls: int, traced: bool) -> Dict[str, Any]:
+    gc.collect()
+    return {
+        "t": round(time.monotonic() - started, 1),
+        "calls": calls,
+        "rss_mb": round(rss_bytes() / MB, 2),
+        "traced_mb": round(tracemalloc.get_traced_memory()[0] / MB, 2) if traced else None,
+        "caches": cache_sizes(),
+    }
+
+
+def top_growth(baseline: Optional[tracemalloc.Snapshot], limit: int) -> List[Dict[str, Any]]:
+    if baseline is None:
+        return []
+    ignore = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    )
+    current = tracemalloc.take_snapshot().filter_traces(ignore)
+    stats = current.compare_to(baseline.filter_traces(ignore), "lineno")
+    return [
+        {"where": str(stat.traceback), "growth_kb": round(stat.size_diff / 1024, 1), "count_diff": stat.count_diff}
+        for stat in stats[:limit]
+        if stat.size_diff > 0
+    ]
+
+
+# --- Driver ----------------------------------------------------------------- #
+
+
+def parse_duration(value: str) -> float:
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smh]?)\s*", value)
+    if not match:
+        raise argparse.ArgumentTypeError(f"Invalid duration {value!r} (use e.g. 90, 30m, 2h)")
+    return float(match.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Soak test with memory-growth tracking")
+    parser.add_argument("--duration", type=parse_duration, default=600.0, help="Run time, e.g. 90, 30m, 2h (default 10m)")
+    parser.add_argument("--warmup", type=parse_duration, default=None, help="Time before the baseline sample (default 10%% of duration)")
+    parser.add_argument("--sample-every", type=parse_duration, default=30.0, help="Sampling interval (default 30s)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Calls in flight (default 8)")
+    parser.add_argument("--churn", type=float, default=5.0, help="Seconds between fixture content changes (default 5)")
+    parser.add_argument("--max-rss-growth", type=float, default=50.0, help="Allowed RSS growth in MB (default 50)")
+    parser.add_argument("--max-traced-growth", type=float, default=20.0, help="Allowed traced-memory growth in MB (default 20)")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="Allowed share of failed calls (default 0.01)")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="Only sample RSS (tracemalloc slows calls down)")
+    parser.add_argument("--top", type=int, default=10, help="Allocation sites to report (default 10)")
+    parser.add_argument("--samples", help="Also write every sample to this NDJSON file")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the workload")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    return parser.parse_args(argv)
+
+
+async def soak(args: argparse.Namespace) -> Dict[str, Any]:
+    fixtures = Fixtures(args.churn)
+    session = get_session()
+    adapter = FixtureAdapter(fixtures)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    traced = not args.no_tracemalloc
+    if traced:
+        tracemalloc.start()
+    workload = Workload(args.seed)
+    latencies: Dict[str, LatencyWindow] = {name: LatencyWindow(size=1000) for name, _, _ in workload.ops}
+    calls: Dict[str, int] = {name: 0 for name, _, _ in workload.ops}
+    errors: Dict[str, int] = {}
+    violations: List[str] = []
+    samples: List[Dict[str, Any]] = []
+    baseline_index: Optional[int] = None
+    baseline_snapshot: Optional[tracemalloc.Snapshot] = None
+
+    started = time.monotonic()
+    deadline = started + args.duration
+    warmup = args.duration * 0.1 if args.warmup is None else args.warmup
+    samples_file = open(args.samples, "wb") if args.samples else None
+
+    async def worker() -> None:
+        while time.monotonic() < deadline:
+            name, call = workload.pick()
+            t0 = time.perf_counter()
+            try:
+                await call()
+            except Exception as exc:  # noqa: BLE001 - counted and reported
+                key = f"{name}: {type(exc).__name__}: {str(exc)[:100]}"
+                errors[key] = errors.get(key, 0) + 1
+            latencies[name].observe(time.perf_counter() - t0)
+            calls[name] += 1
+
+    async def sampler() -> None:
+        nonlocal baseline_index, baseline_snapshot
+        while True:
+            now = time.monotonic()
+            sample = take_sample(started, sum(calls.values()), traced)
+            violations.extend(bound_violations(sample["caches"]))
+            if baseline_index is None and now - started >= warmup:
+                baseline_index = len(samples)
+                sample["baseline"] = True
+                if traced:
+                    baseline_snapshot = tracemalloc.take_snapshot()
+            samples.append(sample)
+            if samples_file is not None:
+                samples_file.write(jsonio.dumps_bytes(sample) + b"\n")
+                samples_file.flush()
+            if not args.json:
+                print(
+                    f"[{sample['t']:>8.0f}s] {sample['calls']:>8} calls  rss {sample['rss_mb']:8.1f} MB"
+                    + (f"  traced {sample['traced_mb']:7.1f} MB" if traced else ""),
+                    file=sys.stderr,
+                )
+            if now >= deadline:
+                return
+            await asyncio.sleep(min(args.sample_every, max(0.0, deadline - now)))
+
+    try:
+        sampling = asyncio.create_task(sampler())
+        await asyncio.gather(*(worker() for _ in range(max(1, args.concurrency))))
+        await sampling
+    finally:
+        if samples_file is not None:
+            samples_file.close()
+
+    growth = top_growth(baseline_snapshot, args.top)
+    if traced:
+        tracemalloc.stop()
+    return report(args, samples, baseline_index or 0, calls, latencies, errors, violations, growth, fixtures)
+
+
+def report(
+    args: argparse.Namespace,
+    samples: List[Dict[str, Any]],
+    baseline_index: int,
+    calls: Dict[str, int],
+    latencies: Dict[str, LatencyWindow],
+    errors: Dict[str, int],
+    violations: List[str],
+    growth: List[Dict[str, Any]],
+    fixtures: Fixtures,
+) -> Dict[str, Any]:
+    baseline = samples[baseline_index]
+    tail = samples[max(baseline_index, len(samples) - 3):]
+
+    def grown(key: str) -> Optional[float]:
+        if baseline[key] is None:
+            return None
+        return round(sum(s[key] for s in tail) / len(tail) - baseline[key], 2)
+
+    total = sum(calls.values())
+    failed = sum(errors.values())
+    rss_growth = grown("rss_mb")
+    traced_growth = grown("traced_mb")
+
+    failures = []
+    if len(samples) - baseline_index < 2:
+        failures.append("Too few samples after warmup to measure growth; run longer or sample more often")
+    if rss_growth is not None and rss_growth > args.max_rss_growth:
+        failures.append(f"RSS grew {rss_growth} MB (max {args.max_rss_growth})")
+    if traced_growth is not None and traced_growth > args.max_traced_growth:
+        failures.append(f"Traced memory grew {traced_growth} MB (max {args.max_traced_growth})")
+    if total and failed / total > args.max_error_rate:
+        failures.append(f"{failed} of {total} calls failed (max rate {args.max_error_rate})")
+    failures.extend(sorted(set(violations)))
+
+    return {
+        "ok": not failures,
+        "failures": failures,
+        "duration_s": samples[-1]["t"],
+        "calls": total,
+        "errors": failed,
+        "throughput": round(total / samples[-1]["t"], 2) if samples[-1]["t"] else None,
+        "memory": {
+            "baseline_at_s": baseline["t"],
+            "baseline_rss_mb": baseline["rss_mb"],
+            "final_rss_mb": samples[-1]["rss_mb"],
+            "rss_growth_mb": rss_growth,
+            "baseline_traced_mb": baseline["traced_mb"],
+            "final_traced_mb": samples[-1]["traced_mb"],
+            "traced_growth_mb": traced_growth,
+        },
+        "ops": {
+            name: {"calls": calls[name], "latency_ms": {
+                k: round(v * 1000, 2) if v is not None else None
+                for k, v in latencies[name].stats().items() if k != "count"
+            }}
+            for name in calls
+        },
+        "caches": samples[-1]["caches"],
+        "top_growth": growth,
+        "top_errors": sorted(errors.items(), key=lambda e: -e[1])[:5],
+        "upstream_requests": dict(sorted(fixtures.requests.items(), key=lambda e: -e[1])[:10]),
+    }
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    memory = result["memory"]
+    print()
+    print(f"{result['calls']} calls in {result['duration_s']} s ({result['throughput']} calls/s), {result['errors']} errors")
+    print(
+        f"RSS {memory['baseline_rss_mb']} -> {memory['final_rss_mb']} MB "
+        f"(growth {memory['rss_growth_mb']} MB since {memory['baseline_at_s']} s)"
+    )
+    if memory["traced_growth_mb"] is not None:
+        print(
+            f"Traced {memory['baseline_traced_mb']} -> {memory['final_traced_mb']} MB "
+            f"(growth {memory['traced_growth_mb']} MB)"
+        )
+    print()
+    print("Operations:")
+    for name, op in result["ops"].items():
+        lat = op["latency_ms"]
+        print(f"  {name:<18} {op['calls']:>8} calls  p50 {lat['p50']} ms  p95 {lat['p95']} ms")
+    print()
+    print("Caches (final):")
+    for name, size in sorted(result["caches"].items()):
+        line = f"  {name:<32} {size['entries']:>6} / {size['max_entries']} entries"
+        if size.get("max_bytes") is not None:
+            line += f"  {size['bytes']} / {size['max_bytes']} bytes"
+        print(line)
+    if result["top_growth"]:
+        print()
+        print("Top allocation growth since baseline:")
+        for site in result["top_growth"]:
+            print(f"  {site['growth_kb']:>10} KB  {site['count_diff']:>+8} blocks  {site['where']}")
+    if result["top_errors"]:
+        print()
+        print("Top errors:")
+        for message, count in result["top_errors"]:
+            print(f"  {count:>6}  {message}")
+    print()
+    print("PASS" if result["ok"] else "FAIL")
+    for failure in result["failures"]:
+        print(f"  - {failure}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    result = asyncio.run(soak(args))
+    if args.json:
+        print(jsonio.dumps(result, indent=True))
+    else:
+        print_report(result)
+    return 0 if result["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
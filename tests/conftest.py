@@ -0,0 +1,51 @@
+"""
+Helpers shared by the test modules.
+
+pytest loads this file on its own; the unittest-style test modules import
+the helpers from it (`from tests.conftest import ...`), so they also run
+with `python3 -m unittest` from the project root.
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from mcp_server.snapshots import Snapshot, content_version
+
+
+def make_response(
+    status: int = 200,
+    body: bytes = b"<html></html>",
+    url: Optional[str] = "https://example.com/",
+    content_type: str = "text/html; charset=utf-8",
+) -> requests.Response:
+    """A finished requests.Response, as the shared session would return it."""
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response._content_consumed = True
+    response.url = url
+    response.encoding = "utf-8"
+    response.headers["Content-Type"] = content_type
+    return response
+
+
+def make_snapshot(source: str, items: List[Dict[str, Any]], ttl: float = 60.0) -> Snapshot:
+    """A snapshot of `items` fetched now and fresh for `ttl` seconds."""
+    now = time.time()
+    return Snapshot(source, items, content_version(items), now, now + ttl)
+
+
+def feed_items(source: str, count: int = 50) -> List[Dict[str, Any]]:
+    """`count` normalized items titled "<source> <rank>"."""
+    return [
+        {"rank": i, "title": f"{source} {i}", "link": f"https://example.com/{i}",
+         "points": i, "comments": None, "source": source}
+        for i in range(1, count + 1)
+    ]
+
+
+def fake_fetcher(source: str, ttl: float, count: int = 50) -> Snapshot:
+    """A SnapshotStore fetcher serving feed_items() for every source."""
+    return make_snapshot(source, feed_items(source, count), ttl)
@@ -0,0 +1,233 @@
+"""
+Offline tests for the bulk article fetcher and main-text extraction.
+
+Run with:
+    python3 -m unittest tests.test_articles
+"""
+
+import threading
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+from mcp_server.adapters import articles
+from mcp_server.tools import fetch_articles_handler
+from mcp_server.utils import netguard
+from mcp_server.utils.cache import LRUCache
+from mcp_server.utils.parser import extract_main_text
+from tests.conftest import make_response
+
+
+ARTICLE_HTML = b"""
+<html><head><title>Big News</title></head>
+<body>
+  <nav><a href="/">Home</a> <a href="/about">About</a></nav>
+  <article>
+    <h1>Big News</h1>
+    <p>First paragraph of the story.</p>
+    <p>Second   paragraph,
+       with wrapped text.</p>
+    <script>track();</script>
+  </article>
+  <footer>Copyright</footer>
+</body></html>
+"""
+
+
+def serve(response: requests.Response):
+    """A fetch_streamed() stand-in that hands `response` to the reader."""
+    return lambda link, read, **kwargs: read(response)
+
+
+class TestExtractMainText(unittest.TestCase):
+    def test_prefers_article_and_drops_boilerplate(self) -> None:
+        title, text = extract_main_text(ARTICLE_HTML.decode())
+        self.assertEqual(title, "Big News")
+        self.assertEqual(
+            text,
+            "Big News\n\nFirst paragraph of the story.\n\nSecond paragraph, with wrapped text.",
+        )
+
+    def test_caps_text_length(self) -> None:
+        html = "<body>" + "<p>word word word</p>" * 1000 + "</body>"
+        _, text = extract_main_text(html, max_chars=100)
+        self.assertLessEqual(len(text), 100)
+
+
+class TestFetchArticles(unittest.TestCase):
+    def setUp(self) -> None:
+        articles._cache.clear()
+        # The example hosts don't resolve; TestPublicHosts covers the check.
+        patcher = mock.patch.object(articles, "ALLOW_PRIVATE_HOSTS", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fetches_in_order_and_caches(self) -> None:
+        with mock.patch.object(
+            articles, "fetch_streamed", side_effect=lambda link, read, **k: read(make_response(body=ARTICLE_HTML))
+        ) as fetch:
+            links = ["https://a.example/1", "https://b.example/2", "https://a.example/1"]
+            results = articles.fetch_articles(links)
+            self.assertEqual([r["link"] for r in results], links[:2])
+            self.assertEqual(results[0]["title"], "Big News")
+            self.assertIsNone(results[0]["error"])
+            self.assertEqual(fetch.call_count, 2)
+
+            articles.fetch_articles(links)
+            self.assertEqual(fetch.call_count, 2)
+
+    def test_truncates_at_max_bytes(self) -> None:
+        body = b"<html><body><p>" + b"x" * 5000 + b"</p></body></html>"
+        with mock.patch.object(articles, "fetch_streamed", side_effect=serve(make_response(body=body))):
+            result = articles.fetch_articles(["https://big.example/"], max_bytes=1000)[0]
+        self.assertTrue(result["truncated"])
+        self.assertEqual(result["bytes"], 1000)
+
+    def test_rejects_non_html_and_bad_urls(self) -> None:
+        with mock.patch.object(
+            articles, "fetch_streamed", side_effect=serve(make_response(body=b"%PDF", content_type="application/pdf"))
+        ):
+            pdf, bad = articles.fetch_articles(["https://x.example/paper.pdf", "ftp://x.example/"])
+        self.assertIn("application/pdf", pdf["error"])
+        self.assertEqual(bad["error"], "Unsupported URL")
+        self.assertEqual(pdf["error_type"], "UnsupportedContentType")
+
+    def test_per_host_concurrency_is_bounded(self) -> None:
+        active = {"now": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def slow_fetch(link, read, **kwargs):
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            time.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+            return read(make_response(body=ARTICLE_HTML))
+
+        links = [f"https://same.example/{i}" for i in range(8)]
+        with mock.patch.object(articles, "_host_slots", LRUCache(max_entries=8)), \
+                mock.patch.object(articles, "fetch_streamed", side_effect=slow_fetch):
+            articles.fetch_articles(links)
+        self.assertLessEqual(active["peak"], articles.PER_HOST_CONCURRENCY)
+
+    def test_interleaves_hosts(self) -> None:
+        links = ["https://a/1", "https://a/2", "https://a/3", "https://b/1"]
+        self.assertEqual(
+            articles._interleave_hosts(links),
+            ["https://a/1", "https://b/1", "https://a/2", "https://a/3"],
+        )
+
+    def test_host_slots_are_bounded(self) -> None:
+        with mock.patch.object(articles, "_host_slots", LRUCache(max_entries=2)):
+            first = articles._host_slot("a.example")
+            self.assertIs(articles._host_slot("a.example"), first)
+            for host in ("b.example", "c.example"):
+                articles._host_slot(host)
+            self.assertEqual(len(articles._host_slots), 2)
+
+    def test_handler_validates_links(self) -> None:
+        self.assertIn("error", fetch_articles_handler({"links": 5}))
+
+
+def redirect_to(location: str) -> requests.Response:
+    response = make_response(status=302, body=b"")
+    response.headers["Location"] = location
+    return response
+
+
+def resolving_to(*addresses: str):
+    return mock.patch.object(
+        netguard.socket, "getaddrinfo",
+        return_value=[(2, 1, 6, "", (address, 0)) for address in addresses],
+    )
+
+
+class TestPublicHosts(unittest.TestCase):
+    def setUp(self) -> None:
+        articles._cache.clear()
+        articles._public_hosts.clear()
+
+    def test_refuses_non_public_addresses(self) -> None:
+        for address in ("127.0.0.1", "10.1.2.3", "192.168.0.5", "169.254.169.254", "::1",
+                        "fe80::1%eth0", "::ffff:127.0.0.1", "0.0.0.0"):
+            articles._public_hosts.clear()
+            with resolving_to(address), mock.patch.object(articles, "fetch_streamed") as fetch:
+                result = articles.fetch_articles(["http://internal.example/latest"])[0]
+            self.assertEqual(result["error_type"], "ForbiddenHost", address)
+            fetch.assert_not_called()
+
+    def test_refuses_host_with_any_private_address(self) -> None:
+        with resolving_to("93.184.216.34", "10.0.0.1"):
+            self.assertFalse(articles._is_public_host("mixed.example"))
+
+    def test_allows_public_addresses(self) -> None:
+        with resolving_to("93.184.216.34", "2606:2800:220:1::1"), \
+                mock.patch.object(articles, "fetch_streamed", side_effect=serve(make_response(body=ARTICLE_HTML))):
+            result = articles.fetch_articles(["https://public.example/story"])[0]
+        self.assertIsNone(result["error"])
+
+    def test_unresolvable_host_is_refused(self) -> None:
+        with mock.patch.object(netguard.socket, "getaddrinfo", side_effect=OSError("no such host")):
+            self.assertFalse(articles._is_public_host("nowhere.example"))
+
+    def test_refuses_redirect_into_private_network(self) -> None:
+        def getaddrinfo(host, port):
+            address = host if host[0].isdigit() else "93.184.216.34"
+            return [(2, 1, 6, "", (address, 0))]
+
+        def fetch(url, read, **kwargs):
+            self.assertFalse(kwargs["allow_redirects"])
+            return read(redirect_to("http://169.254.169.254/latest/meta-data/"))
+
+        with mock.patch.object(netguard.socket, "getaddrinfo", side_effect=getaddrinfo), \
+                mock.patch.object(articles, "fetch_streamed", side_effect=fetch) as fetch_streamed:
+            result = articles.fetch_articles(["https://public.example/redirect"])[0]
+        self.assertEqual(result["error_type"], "ForbiddenHost")
+        self.assertEqual(result["text"], "")
+        # Nothing was requested from the redirect target.
+        self.assertEqual([c.args[0] for c in fetch_streamed.call_args_list], ["https://public.example/redirect"])
+
+    def test_follows_public_redirects(self) -> None:
+        pages = {
+            "https://public.example/old": redirect_to("/new"),
+            "https://public.example/new": make_response(body=ARTICLE_HTML),
+        }
+        with resolving_to("93.184.216.34"), \
+                mock.patch.object(articles, "fetch_streamed", side_effect=lambda url, read, **k: read(pages[url])):
+            result = articles.fetch_articles(["https://public.example/old"])[0]
+        self.assertEqual(result["title"], "Big News")
+
+    def test_caps_redirects(self) -> None:
+        with resolving_to("93.184.216.34"), \
+                mock.patch.object(articles, "fetch_streamed", side_effect=lambda url, read, **k: read(redirect_to(url))):
+            result = articles.fetch_articles(["https://public.example/loop"])[0]
+        self.assertEqual(result["error_type"], "TooManyRedirects")
+
+    def test_refuses_host_that_rebinds_to_private_address(self) -> None:
+        # Public when first checked, private by the time of the connect.
+        answers = iter(["93.184.216.34", "127.0.0.1"])
+        with mock.patch.object(
+            netguard.socket, "getaddrinfo", side_effect=lambda host, port: [(2, 1, 6, "", (next(answers), 0))]
+        ), mock.patch("urllib3.util.connection.create_connection") as connect:
+            result = articles.fetch_articles(["http://rebind.example/story"])[0]
+        self.assertEqual(result["error_type"], "ForbiddenHost")
+        connect.assert_not_called()
+
+    def test_connects_to_the_checked_address(self) -> None:
+        session = articles._session()
+        with resolving_to("93.184.216.34"), \
+                mock.patch("urllib3.util.connection.create_connection", side_effect=OSError("stop")) as connect:
+            with self.assertRaises(requests.ConnectionError):
+                session.get("https://public.example/", timeout=1, allow_redirects=False)
+        self.assertEqual(connect.call_args.args[0], ("93.184.216.34", 443))
+
+    def test_setting_allows_private_hosts(self) -> None:
+        with mock.patch.object(articles, "ALLOW_PRIVATE_HOSTS", True), resolving_to("127.0.0.1"):
+            self.assertTrue(articles._is_public_host("localhost"))
+
+
+if __name__ == "__main__":
+    unittest.main()
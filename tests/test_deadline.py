@@ -0,0 +1,236 @@
+"""
+Tests for deadline propagation and partial results.
+
+Run with:
+    python3 -m unittest tests.test_deadline
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import requests
+
+from mcp_server import mcp_server
+from mcp_server.adapters import articles, hackernews
+from mcp_server.executor import ToolExecutor
+from mcp_server.snapshots import Snapshot, SnapshotError, SnapshotStore
+from mcp_server.utils import deadline, http_client, ratelimit
+from mcp_server.utils.errors import DeadlineExceededError
+from mcp_server.utils.resilience import CircuitBreaker, RetryPolicy
+from tests.conftest import make_response, make_snapshot
+
+
+class TestDeadlineScope(unittest.TestCase):
+    def test_no_deadline_by_default(self) -> None:
+        self.assertIsNone(deadline.remaining())
+        self.assertEqual(deadline.clamp(5.0), 5.0)
+
+    def test_nested_scope_only_tightens(self) -> None:
+        with deadline.deadline_scope(0.5):
+            with deadline.deadline_scope(10.0):
+                self.assertLessEqual(deadline.remaining(), 0.5)
+            with deadline.deadline_scope(0.1):
+                self.assertLessEqual(deadline.clamp(5.0), 0.1)
+        self.assertIsNone(deadline.remaining())
+
+    def test_clamp_raises_when_expired(self) -> None:
+        with deadline.deadline_scope(0):
+            self.assertTrue(deadline.expired())
+            with self.assertRaises(DeadlineExceededError):
+                deadline.clamp(1.0)
+
+    def test_bind_carries_deadline_to_threads(self) -> None:
+        with ThreadPoolExecutor(1) as pool:
+            with deadline.deadline_scope(1.0):
+                bound = pool.submit(deadline.bind(deadline.remaining)).result()
+            unbound = pool.submit(deadline.remaining).result()
+        self.assertIsNotNone(bound)
+        self.assertIsNone(unbound)
+
+    def test_executor_carries_deadline(self) -> None:
+        pool = ToolExecutor(max_workers=1, max_queue=1)
+        with deadline.deadline_scope(1.0):
+            future = pool.submit("a", deadline.remaining)
+        self.assertLessEqual(future.result(1), 1.0)
+
+
+class TestFetchWithinDeadline(unittest.TestCase):
+    def setUp(self) -> None:
+        http_client._hosts.clear()
+        ratelimit._buckets.clear()
+        self.session = mock.Mock()
+        patcher = mock.patch.object(http_client, "get_session", return_value=self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_timeout_is_capped_to_remaining_budget(self) -> None:
+        self.session.get.return_value = make_response(200)
+        with deadline.deadline_scope(0.3):
+            http_client.fetch("https://example.com/", timeout=5.0)
+        self.assertLessEqual(self.session.get.call_args.kwargs["timeout"], 0.3)
+
+    def test_skips_retry_that_does_not_fit(self) -> None:
+        self.session.get.side_effect = requests.Timeout("slow")
+        slow_retry = RetryPolicy(retries=3, base_delay=1.0, max_delay=1.0)
+        started = time.monotonic()
+        # Backoff is jittered; pin it so the retry never fits the budget.
+        with mock.patch.object(RetryPolicy, "backoff", return_value=1.0):
+            with deadline.deadline_scope(0.2):
+                with self.assertRaises(DeadlineExceededError):
+                    http_client.fetch("https://example.com/", retry=slow_retry)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(self.session.get.call_count, 1)
+
+    def test_deadline_releases_half_open_probe(self) -> None:
+        state = http_client._host_state("example.com")
+        state.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+        state.breaker.record_failure()
+        self.session.get.return_value = make_response(200)
+
+        # Out of time before the rate limiter, and while waiting on it.
+        with deadline.deadline_scope(0):
+            with self.assertRaises(DeadlineExceededError):
+                http_client.fetch("https://example.com/")
+        with mock.patch.object(ratelimit.TokenBucket, "acquire", side_effect=lambda wait: time.sleep(0.06)):
+            with deadline.deadline_scope(0.05):
+                with self.assertRaises(DeadlineExceededError):
+                    http_client.fetch("https://example.com/")
+        self.session.get.assert_not_called()
+        self.assertTrue(state.breaker.allow())
+
+
+def snapshot_of(source: str, ttl: float) -> Snapshot:
+    items = [{"rank": 1, "title": "old", "link": "", "points": 1, "comments": None, "source": source}]
+    return make_snapshot(source, items, ttl)
+
+
+class TestPartialTools(unittest.TestCase):
+    def setUp(self) -> None:
+        executor = ToolExecutor(max_workers=4, max_queue=8)
+        patcher = mock.patch.object(mcp_server, "get_executor", return_value=executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def use_store(self, fetcher) -> SnapshotStore:
+        store = SnapshotStore(ttl=0.0, fetcher=fetcher)
+        patcher = mock.patch.object(mcp_server, "get_store", return_value=store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return store
+
+    def test_feed_returns_stale_items_when_out_of_time(self) -> None:
+        calls = []
+
+        def fetcher(source, ttl):
+            calls.append(source)
+            if len(calls) == 1:
+                return snapshot_of(source, ttl)
+            time.sleep(0.05)
+            raise SnapshotError("Failed to fetch Reddit posts", "Deadline exceeded")
+
+        self.use_store(fetcher)
+        asyncio.run(mcp_server.get_feed("reddit"))  # seeds an (immediately stale) snapshot
+        result = asyncio.run(mcp_server.get_feed("reddit", fields=["title"], deadline_ms=20))
+        self.assertEqual(result, {"items": [{"title": "old"}], "partial": True})
+
+    def test_feed_does_not_wait_past_deadline_for_refresh_in_flight(self) -> None:
+        release = threading.Event()
+        self.addCleanup(release.set)
+        calls = []
+
+        def fetcher(source, ttl):
+            calls.append(source)
+            if len(calls) > 1:
+                release.wait(5)
+            return snapshot_of(source, ttl)
+
+        store = self.use_store(fetcher)
+        asyncio.run(mcp_server.get_feed("reddit"))  # seeds an (immediately stale) snapshot
+        refreshing = threading.Thread(target=store.get, args=("reddit",))
+        refreshing.start()
+        while len(calls) < 2:
+            time.sleep(0.005)
+
+        started = time.monotonic()
+        result = asyncio.run(mcp_server.get_feed("reddit", fields=["title"], deadline_ms=50))
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(result, {"items": [{"title": "old"}], "partial": True})
+        release.set()
+        refreshing.join(5)
+
+    def test_feed_complete_within_deadline(self) -> None:
+        self.use_store(snapshot_of)
+        result = asyncio.run(mcp_server.hn_get_top_posts(limit=1, deadline_ms=5000))
+        self.assertFalse(result["partial"])
+        self.assertEqual(len(result["items"]), 1)
+
+    def test_feed_error_with_time_left_still_raises(self) -> None:
+        def failing(source, ttl):
+            raise SnapshotError("Failed to fetch Reddit posts", "404")
+
+        self.use_store(failing)
+        with self.assertRaises(RuntimeError):
+            asyncio.run(mcp_server.reddit_get_top_posts(deadline_ms=5000))
+
+    def test_articles_return_what_finished(self) -> None:
+        articles._cache.clear()
+
+        def fake_fetch_one(link, max_bytes, timeout):
+            if "slow" in link:
+                time.sleep(0.3)
+            return articles._empty_result(link) | {"title": link}
+
+        with mock.patch.object(articles, "_fetch_one", side_effect=fake_fetch_one):
+            result = asyncio.run(
+                mcp_server.fetch_articles(
+                    ["https://a.example/fast", "https://b.example/slow"], deadline_ms=100
+                )
+            )
+        self.assertTrue(result["partial"])
+        fast, slow = result["items"]
+        self.assertEqual(fast["title"], "https://a.example/fast")
+        self.assertEqual(slow["error"], "Deadline exceeded")
+        self.assertEqual(slow["error_type"], "DeadlineExceededError")
+
+    def test_article_errors_are_partial_only_when_cut_by_deadline(self) -> None:
+        articles._cache.clear()
+
+        def fake_fetch_one(link, max_bytes, timeout):
+            if "late" in link:
+                return articles._empty_result(link, "Deadline exceeded fetching", "DeadlineExceededError")
+            return articles._empty_result(link, "404 Not Found", "HttpError")
+
+        def run(links):
+            with mock.patch.object(articles, "_fetch_one", side_effect=fake_fetch_one):
+                return asyncio.run(mcp_server.fetch_articles(links, deadline_ms=5000))
+
+        # A plain failure doesn't make the result partial, even if it took
+        # the whole budget; a fetch the deadline cut short does.
+        self.assertFalse(run(["https://a.example/missing"])["partial"])
+        self.assertTrue(run(["https://a.example/missing", "https://b.example/late"])["partial"])
+
+    def test_comments_stop_at_deadline(self) -> None:
+        hackernews._items.clear()
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def fake_fetch_item(item_id):
+            if item_id == 1:
+                return {"id": 1, "title": "Story", "kids": [2, 3]}
+            if item_id == 3:
+                release.wait(1)
+            return {"id": item_id, "by": "x", "text": "hi"}
+
+        with mock.patch.object(hackernews, "_fetch_item", side_effect=fake_fetch_item):
+            result = asyncio.run(mcp_server.hn_get_comments(1, deadline_ms=100))
+        self.assertTrue(result["partial"])
+        self.assertTrue(result["truncated"])
+        self.assertEqual([c["id"] for c in result["comments"]], [2])
+
+
+if __name__ == "__main__":
+    unittest.main()
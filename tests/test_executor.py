@@ -0,0 +1,111 @@
+"""
+Tests for the bounded tool executor (per-key limits, load shedding).
+
+Run with:
+    python3 -m unittest tests.test_executor
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+from mcp_server import executor, mcp_server
+from mcp_server.executor import OverloadedError, ToolExecutor
+
+
+class Gate:
+    """A blocking job that records concurrency and waits to be released."""
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+
+    def __call__(self, value=None):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        self.release.wait(5)
+        with self.lock:
+            self.running -= 1
+        return value
+
+
+class TestToolExecutor(unittest.TestCase):
+    def test_per_key_limit(self) -> None:
+        pool = ToolExecutor(max_workers=4, max_queue=10, key_limits={"reddit": 1})
+        gate = Gate()
+        futures = [pool.submit("reddit", gate, i) for i in range(3)]
+        time.sleep(0.05)
+        self.assertEqual(gate.running, 1)
+        self.assertEqual(pool.queue_depth, 2)
+
+        gate.release.set()
+        self.assertEqual([f.result(2) for f in futures], [0, 1, 2])
+        self.assertEqual(gate.peak, 1)
+        self.assertEqual(pool.queue_depth, 0)
+
+    def test_saturated_key_does_not_block_others(self) -> None:
+        pool = ToolExecutor(max_workers=4, max_queue=10, key_limits={"reddit": 1})
+        gate = Gate()
+        pool.submit("reddit", gate)
+        pool.submit("reddit", gate)
+        self.assertEqual(pool.submit("hackernews", lambda: "hn").result(1), "hn")
+        gate.release.set()
+
+    def test_rejects_fast_when_queue_full(self) -> None:
+        pool = ToolExecutor(max_workers=1, max_queue=1)
+        gate = Gate()
+        first = pool.submit("a", gate)
+        queued = pool.submit("a", gate)
+
+        started = time.monotonic()
+        with self.assertRaises(OverloadedError) as ctx:
+            pool.submit("b", gate)
+        self.assertLess(time.monotonic() - started, 0.1)
+        self.assertIn("retry", str(ctx.exception))
+
+        gate.release.set()
+        first.result(2)
+        queued.result(2)
+        stats = pool.stats()
+        self.assertEqual(stats["rejected"], 1)
+        self.assertEqual(stats["max_queue_depth"], 1)
+        self.assertEqual(stats["keys"]["a"]["wait"]["count"], 2)
+
+    def test_calls_that_start_immediately_are_not_queued(self) -> None:
+        pool = ToolExecutor(max_workers=2, max_queue=0)
+        self.assertEqual(pool.submit("a", lambda: 1).result(1), 1)
+        self.assertEqual(pool.stats()["rejected"], 0)
+
+    def test_exceptions_propagate(self) -> None:
+        pool = ToolExecutor(max_workers=1, max_queue=1)
+
+        def boom():
+            raise ValueError("bad")
+
+        with self.assertRaises(ValueError):
+            pool.submit("a", boom).result(1)
+        # The slot was released despite the failure.
+        self.assertEqual(pool.submit("a", lambda: "ok").result(1), "ok")
+
+    def test_parse_limits(self) -> None:
+        self.assertEqual(executor._parse_limits("reddit=2, articles=x,hn=4"), {"reddit": 2, "hn": 4})
+
+
+class TestMcpAdmission(unittest.TestCase):
+    def test_overload_surfaces_as_tool_error(self) -> None:
+        pool = ToolExecutor(max_workers=1, max_queue=0)
+        gate = Gate()
+        pool.submit("hackernews", gate)
+        with mock.patch.object(mcp_server, "get_executor", return_value=pool):
+            with self.assertRaises(OverloadedError):
+                asyncio.run(mcp_server.hn_get_top_posts())
+        gate.release.set()
+
+
+if __name__ == "__main__":
+    unittest.main()
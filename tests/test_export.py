@@ -0,0 +1,130 @@
+"""
+Offline tests for the bulk snapshot export (export.py).
+
+Run with:
+    python3 -m unittest tests.test_export
+"""
+
+import gzip
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from mcp_server import export
+from mcp_server.shared_cache import SharedSnapshotCache
+from mcp_server.snapshots import Snapshot, content_version
+
+
+START = 1_790_000_000.0
+
+
+def items(title: str, count: int = 3):
+    return [{"rank": i, "title": f"{title} {i}", "link": f"https://e.com/{i}",
+             "points": i * 10, "comments": None, "source": "HackerNews"} for i in range(1, count + 1)]
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "snapshots.db")
+        self.out_dir = tmp.name
+        self.cache = SharedSnapshotCache(self.path, history_days=10_000)
+        for n, source in enumerate(["hackernews", "reddit", "hackernews", "reddit"]):
+            snapshot_items = items(f"{source} v{n}")
+            fetched_at = START + n * 60
+            self.cache.save(Snapshot(source, snapshot_items, content_version(snapshot_items), fetched_at, fetched_at + 60))
+
+    def run_export(self, **kwargs):
+        out = io.BytesIO()
+        count = export.export(self.cache, out, **kwargs)
+        return count, [json.loads(line) for line in out.getvalue().splitlines()]
+
+    def test_ndjson_rows_in_time_order(self) -> None:
+        count, rows = self.run_export()
+        self.assertEqual(count, 12)
+        self.assertEqual(list(rows[0]), list(export.EXPORT_FIELDS))
+        self.assertEqual(
+            rows[0],
+            {"source": "hackernews", "fetched_at": START, "version": rows[0]["version"], "rank": 1,
+             "title": "hackernews v0 1", "link": "https://e.com/1", "points": 10, "comments": None},
+        )
+        self.assertEqual([row["fetched_at"] for row in rows], sorted(row["fetched_at"] for row in rows))
+
+    def test_filters(self) -> None:
+        _, rows = self.run_export(sources=["reddit"], since=START + 60, until=START + 180)
+        self.assertEqual({row["title"].rsplit(" ", 1)[0] for row in rows}, {"reddit v1"})
+        _, rows = self.run_export(history=False)
+        self.assertEqual({row["title"].rsplit(" ", 1)[0] for row in rows}, {"hackernews v2", "reddit v3"})
+
+    def test_columns_are_written_in_bounded_chunks(self) -> None:
+        count, chunks = self.run_export(fmt="columns", chunk_size=5)
+        self.assertEqual(count, 12)
+        self.assertEqual([len(chunk["title"]) for chunk in chunks], [5, 5, 2])
+        self.assertEqual(list(chunks[0]), list(export.EXPORT_FIELDS))
+
+    def test_iterates_without_loading_everything(self) -> None:
+        read = []
+        rows = export.iter_rows(
+            snapshot for snapshot in self.cache.iter_snapshots(batch_size=1) if not read.append(snapshot)
+        )
+        next(rows)
+        self.assertEqual(len(read), 1)
+
+    def test_main_writes_gzip_file(self) -> None:
+        output = os.path.join(self.out_dir, "out.ndjson.gz")
+        with mock.patch("sys.stderr", io.StringIO()) as stderr:
+            export.main(["--db", self.path, "--source", "hackernews,reddit", "--since", str(START + 120), "-o", output])
+        with gzip.open(output, "rb") as f:
+            self.assertEqual(len(f.read().splitlines()), 6)
+        self.assertIn("Exported 6 rows", stderr.getvalue())
+
+    def test_main_rejects_bad_input(self) -> None:
+        with self.assertRaises(SystemExit):
+            export.main(["--db", self.path, "--source", "nope"])
+        missing = os.path.join(self.out_dir, "missing.db")
+        with self.assertRaises(SystemExit):
+            export.main(["--db", missing])
+        self.assertFalse(os.path.exists(missing))
+
+    def test_opens_cache_read_only(self) -> None:
+        cache = SharedSnapshotCache.open_readonly(self.path)
+        self.assertEqual(len(list(cache.iter_snapshots())), 4)
+        with self.assertRaises(sqlite3.OperationalError):
+            cache.save(Snapshot("reddit", [], content_version([]), START, START + 60))
+
+    def test_main_rejects_file_that_is_not_a_cache(self) -> None:
+        other = os.path.join(self.out_dir, "other.db")
+        conn = sqlite3.connect(other)
+        conn.execute("CREATE TABLE notes (text TEXT)")
+        conn.close()
+        with self.assertRaises(SystemExit) as raised:
+            export.main(["--db", other])
+        self.assertIn("not a snapshot cache", str(raised.exception))
+        conn = sqlite3.connect(other)
+        self.assertEqual(conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall(), [("notes",)])
+        conn.close()
+
+    def test_main_explains_empty_history(self) -> None:
+        with mock.patch("sys.stderr", io.StringIO()) as stderr, mock.patch("sys.stdout", mock.Mock()):
+            export.main(["--db", self.path, "--since", str(START + 10_000)])
+        self.assertIn("WEB2API_SHARED_CACHE", stderr.getvalue())
+
+
+class TestParseTime(unittest.TestCase):
+    def test_formats(self) -> None:
+        self.assertEqual(export.parse_time("1790000000"), 1_790_000_000.0)
+        self.assertEqual(export.parse_time("2026-10-01"), 1_790_812_800.0)
+        self.assertEqual(export.parse_time("2026-10-01T02:00:00+02:00"), 1_790_812_800.0)
+        with mock.patch("time.time", return_value=100_000.0):
+            self.assertEqual(export.parse_time("1d"), 13_600.0)
+        with self.assertRaises(Exception):
+            export.parse_time("yesterday")
+
+
+if __name__ == "__main__":
+    unittest.main()
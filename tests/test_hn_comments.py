@@ -0,0 +1,137 @@
+"""
+Offline tests for the Hacker News comment-thread tool.
+
+Run with:
+    python3 -m unittest tests.test_hn_comments
+"""
+
+import unittest
+from unittest import mock
+
+from mcp_server.adapters import hackernews
+from mcp_server.tools import hn_get_comments_handler
+from mcp_server.utils.errors import DeadlineExceededError, RateLimitedError
+from mcp_server.utils.http_client import HttpError
+from mcp_server.utils.parser import html_to_text
+
+
+# story 1 -> comments 2, 3, 4 (4 is deleted); 2 -> 5, 6; 5 -> 7
+ITEMS = {
+    1: {"id": 1, "type": "story", "title": "Story", "url": "https://example.com/s",
+        "score": 42, "by": "alice", "descendants": 6, "kids": [2, 3, 4]},
+    2: {"id": 2, "by": "bob", "time": 1, "text": "Top <i>one</i>", "kids": [5, 6]},
+    3: {"id": 3, "by": "carol", "time": 2, "text": "Top two"},
+    4: {"id": 4, "deleted": True},
+    5: {"id": 5, "by": "dave", "time": 3, "text": "Reply<p>Second &amp; last", "kids": [7]},
+    6: {"id": 6, "by": "erin", "time": 4, "text": "Reply two", "dead": True},
+    7: {"id": 7, "by": "frank", "time": 5, "text": "Deep"},
+}
+
+
+class TestFetchComments(unittest.TestCase):
+    def setUp(self) -> None:
+        hackernews._items.clear()
+        self.fetched = []
+
+        def fake_fetch_item(item_id):
+            self.fetched.append(item_id)
+            return ITEMS.get(item_id)
+
+        patcher = mock.patch.object(hackernews, "_fetch_item", side_effect=fake_fetch_item)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_builds_tree_and_skips_deleted_and_dead(self) -> None:
+        thread = hackernews.fetch_comments(1, max_depth=5, max_comments=100)
+
+        self.assertEqual(thread["title"], "Story")
+        self.assertEqual(thread["points"], 42)
+        self.assertEqual([c["id"] for c in thread["comments"]], [2, 3])
+        replies = thread["comments"][0]["replies"]
+        self.assertEqual([c["id"] for c in replies], [5])
+        self.assertEqual(replies[0]["depth"], 2)
+        self.assertEqual(replies[0]["replies"][0]["id"], 7)
+        self.assertEqual(thread["comment_count"], 4)
+        self.assertFalse(thread["truncated"])
+
+    def test_max_depth_stops_fetching(self) -> None:
+        thread = hackernews.fetch_comments(1, max_depth=1)
+
+        self.assertEqual(thread["comment_count"], 2)
+        self.assertTrue(thread["truncated"])
+        self.assertNotIn(5, self.fetched)
+
+    def test_max_comments_caps_requests(self) -> None:
+        thread = hackernews.fetch_comments(1, max_depth=5, max_comments=2)
+
+        self.assertEqual(thread["comment_count"], 2)
+        self.assertTrue(thread["truncated"])
+        # Only the root and the first two kids were requested.
+        self.assertEqual(sorted(self.fetched), [1, 2, 3])
+
+    def test_rate_limited_comment_marks_thread_partial(self) -> None:
+        def fake_fetch_item(item_id):
+            if item_id == 3:
+                raise RateLimitedError("news.ycombinator.com is rate limited")
+            return ITEMS.get(item_id)
+
+        hackernews._fetch_item.side_effect = fake_fetch_item
+        thread = hackernews.fetch_comments(1, max_depth=5, max_comments=100)
+
+        self.assertEqual([c["id"] for c in thread["comments"]], [2])
+        self.assertTrue(thread["partial"])
+        self.assertTrue(thread["truncated"])
+
+    def test_missing_root_raises(self) -> None:
+        with self.assertRaises(HttpError):
+            hackernews.fetch_comments(999)
+
+
+class TestItemCache(unittest.TestCase):
+    def setUp(self) -> None:
+        hackernews._items.clear()
+
+    def test_items_are_cached(self) -> None:
+        page = mock.Mock(content=b'{"id": 3, "text": "hi"}')
+        with mock.patch.object(hackernews, "fetch_page", return_value=page) as fetch_page:
+            hackernews._fetch_item(3)
+            hackernews._fetch_item(3)
+        self.assertEqual(fetch_page.call_count, 1)
+
+    def test_failed_comment_is_skipped(self) -> None:
+        with mock.patch.object(hackernews, "fetch_page", side_effect=HttpError("boom")):
+            self.assertIsNone(hackernews._fetch_item_quietly(3))
+
+    def test_deadline_is_not_swallowed(self) -> None:
+        with mock.patch.object(hackernews, "fetch_page", side_effect=DeadlineExceededError("late")):
+            with self.assertRaises(DeadlineExceededError):
+                hackernews._fetch_item_quietly(3)
+
+
+class TestHandler(unittest.TestCase):
+    def test_accepts_item_url_and_clamps_limits(self) -> None:
+        with mock.patch.object(hackernews, "fetch_comments", return_value={}) as fetch_comments:
+            hn_get_comments_handler(
+                {"item_id": "https://news.ycombinator.com/item?id=123", "max_depth": 99, "max_comments": 0}
+            )
+        fetch_comments.assert_called_once_with(123, max_depth=10, max_comments=1)
+
+    def test_invalid_id_returns_error(self) -> None:
+        self.assertIn("error", hn_get_comments_handler({"item_id": "abc"}))
+
+    def test_http_error_returns_error(self) -> None:
+        with mock.patch.object(hackernews, "fetch_comments", side_effect=HttpError("down")):
+            result = hn_get_comments_handler({"item_id": 1})
+        self.assertEqual(result["details"], "down")
+
+
+class TestHtmlToText(unittest.TestCase):
+    def test_paragraphs_and_entities(self) -> None:
+        self.assertEqual(html_to_text("a <i>b</i><p>c &amp; d"), "a b\n\nc & d")
+
+    def test_none(self) -> None:
+        self.assertEqual(html_to_text(None), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Offline tests for the Hacker News front-page extractor.
+
+Run with:
+    python3 -m unittest tests.test_hn_extract
+"""
+
+import unittest
+
+from mcp_server.adapters import hackernews
+
+
+def story(i: int, subtext: str) -> str:
+    return f"""
+<tr class="athing submission" id="{i}">
+  <td class="title"><span class="rank">{i}.</span></td>
+  <td class="title"><span class="titleline"><a href="https://ex.com/{i}">Story {i} &amp; co</a>
+    <span class="sitebit comhead">(<a href="from?site=ex.com">ex.com</a>)</span></span></td>
+</tr>
+<tr><td colspan="2"></td><td class="subtext">{subtext}</td></tr>
+<tr class="spacer" style="height:5px"></tr>
+"""
+
+
+PAGE = f"""
+<html><body><center><table id="hnmain">
+<tr><td><table><tr><td>header <a href="news">new</a></td></tr></table></td></tr>
+<tr><td><table class="itemlist">
+{story(1, '<span class="score">120 points</span> by <a class="hnuser">a</a> | <a href="hide?id=1">hide</a> | <a href="item?id=1">45&nbsp;comments</a>')}
+{story(2, '<span class="score">3 points</span> | <a href="hide?id=2">hide</a> | <a href="item?id=2">discuss</a>')}
+{story(3, '<span class="age"><a href="item?id=3">1 hour ago</a></span> | <a href="hide?id=3">hide</a>')}
+<tr class="athing" id="4"><td><span class="rank">4.</span></td><td>no title link</td></tr>
+<tr><td class="subtext"><span class="score">9 points</span></td></tr>
+{story(5, '<span class="score">1 point</span> | <a href="item?id=5">1&nbsp;comment</a>')}
+</table></td></tr>
+</table></center></body></html>
+""".encode("utf-8")
+
+
+class TestExtractPosts(unittest.TestCase):
+    def setUp(self) -> None:
+        self.posts = hackernews._extract_posts(PAGE, "utf-8")
+
+    def test_pairs_story_and_subtext_rows(self) -> None:
+        self.assertEqual(
+            self.posts[0],
+            {"title": "Story 1 & co", "link": "https://ex.com/1", "rank": 1, "points": 120, "comments": 45},
+        )
+
+    def test_discuss_and_job_rows_have_no_comment_count(self) -> None:
+        self.assertEqual((self.posts[1]["points"], self.posts[1]["comments"]), (3, None))
+        self.assertEqual((self.posts[2]["points"], self.posts[2]["comments"]), (None, None))
+
+    def test_rows_without_title_are_skipped(self) -> None:
+        self.assertEqual([post["rank"] for post in self.posts], [1, 2, 3, 5])
+        self.assertEqual(self.posts[3]["comments"], 1)
+
+    def test_page_without_stories(self) -> None:
+        self.assertEqual(hackernews._extract_posts(b"<html><body>down</body></html>", "utf-8"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,260 @@
+"""
+Offline tests for the shared HTTP client (retries, circuit breaker, hedging,
+capped streaming downloads).
+
+Run with:
+    python3 -m unittest tests.test_http_client
+"""
+
+import threading
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+from mcp_server.utils import deadline, http_client, ratelimit
+from mcp_server.utils.cache import LRUCache
+from mcp_server.utils.resilience import CircuitBreaker, RetryPolicy
+from tests.conftest import make_response
+
+
+NO_SLEEP = RetryPolicy(retries=2, base_delay=0.0, max_delay=0.0)
+
+
+class HttpClientTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        http_client._hosts.clear()
+        http_client._stale_pages.clear()
+        ratelimit._buckets.clear()
+        self.session = mock.Mock()
+        patcher = mock.patch.object(http_client, "get_session", return_value=self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestRetries(HttpClientTestCase):
+    def test_retries_5xx_then_succeeds(self) -> None:
+        self.session.get.side_effect = [make_response(503), make_response(200, b"ok")]
+        response = http_client.fetch("https://example.com/", retry=NO_SLEEP)
+        self.assertEqual(response.text, "ok")
+        self.assertEqual(self.session.get.call_count, 2)
+
+    def test_does_not_retry_4xx(self) -> None:
+        self.session.get.return_value = make_response(404)
+        with self.assertRaises(http_client.HttpError):
+            http_client.fetch("https://example.com/", retry=NO_SLEEP)
+        self.assertEqual(self.session.get.call_count, 1)
+
+    def test_raises_after_exhausting_retries(self) -> None:
+        self.session.get.side_effect = requests.Timeout("slow")
+        with self.assertRaises(http_client.HttpError):
+            http_client.fetch("https://example.com/", retry=NO_SLEEP)
+        self.assertEqual(self.session.get.call_count, 3)
+
+    def test_retries_429_after_pausing_limiter(self) -> None:
+        throttled = make_response(429)
+        throttled.headers["Retry-After"] = "0.05"
+        self.session.get.side_effect = [throttled, make_response(200, b"ok")]
+        response = http_client.fetch("https://example.com/", retry=NO_SLEEP)
+        self.assertEqual(response.text, "ok")
+        self.assertEqual(ratelimit.get_limiter("example.com").stats()["throttled"], 1)
+        self.assertEqual(http_client._host_state("example.com").breaker.state, "closed")
+
+    def test_backoff_is_bounded(self) -> None:
+        policy = RetryPolicy(retries=5, base_delay=0.1, max_delay=0.3)
+        for attempt in range(6):
+            self.assertLessEqual(policy.backoff(attempt), 0.3)
+
+
+class TestCircuitBreaker(HttpClientTestCase):
+    def test_open_circuit_serves_stale_page(self) -> None:
+        self.session.get.return_value = make_response(200, b"cached")
+        http_client.fetch_page("https://example.com/", keep_stale=True)
+
+        state = http_client._host_state("example.com")
+        for _ in range(http_client.BREAKER_FAILURE_THRESHOLD):
+            state.breaker.record_failure()
+
+        self.session.get.reset_mock()
+        page = http_client.fetch_page("https://example.com/", keep_stale=True)
+        self.assertEqual(page.content, b"cached")
+        self.session.get.assert_not_called()
+
+    def test_only_front_pages_are_kept_stale(self) -> None:
+        self.session.get.return_value = make_response(200, b"item")
+        http_client.fetch_page("https://example.com/item/1")
+        self.assertEqual(len(http_client._stale_pages), 0)
+
+        state = http_client._host_state("example.com")
+        for _ in range(http_client.BREAKER_FAILURE_THRESHOLD):
+            state.breaker.record_failure()
+        with self.assertRaises(http_client.CircuitOpenError):
+            http_client.fetch_page("https://example.com/item/1", keep_stale=True)
+
+    def test_stale_pages_are_bounded_by_bytes(self) -> None:
+        self.assertEqual(http_client._stale_pages.max_bytes, http_client.STALE_PAGE_BYTES)
+        small = LRUCache(max_entries=64, max_bytes=2500, sizeof=http_client._page_size)
+        self.session.get.side_effect = lambda url, **kwargs: make_response(200, b"x" * 1000, url=url)
+        with mock.patch.object(http_client, "_stale_pages", small):
+            for n in range(4):
+                http_client.fetch_page(f"https://example.com/{n}", keep_stale=True)
+        self.assertEqual(len(small), 2)
+        self.assertLessEqual(small.stats()["bytes"], 2500)
+
+    def test_open_circuit_without_cache_fails_fast(self) -> None:
+        state = http_client._host_state("example.com")
+        for _ in range(http_client.BREAKER_FAILURE_THRESHOLD):
+            state.breaker.record_failure()
+
+        with self.assertRaises(http_client.CircuitOpenError):
+            http_client.fetch("https://example.com/other")
+        self.session.get.assert_not_called()
+
+    def test_half_open_probe_closes_circuit(self) -> None:
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())   # the single probe
+        self.assertFalse(breaker.allow())  # concurrent callers still refused
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_rate_limit_timeout_releases_half_open_probe(self) -> None:
+        state = http_client._host_state("example.com")
+        state.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+        state.breaker.record_failure()
+        self.session.get.return_value = make_response(200)
+
+        with mock.patch.object(ratelimit.TokenBucket, "acquire", side_effect=ratelimit.RateLimitTimeout("busy")):
+            with self.assertRaises(http_client.RateLimitedError):
+                http_client.fetch("https://example.com/", retry=NO_SLEEP)
+        self.session.get.assert_not_called()
+        # The probe slot is free again, so the next call gets through.
+        http_client.fetch("https://example.com/", retry=NO_SLEEP)
+        self.assertEqual(state.breaker.state, CircuitBreaker.CLOSED)
+
+
+class TestHostState(HttpClientTestCase):
+    def test_per_host_state_is_bounded(self) -> None:
+        self.session.get.return_value = make_response(200)
+        with mock.patch.object(http_client, "_hosts", LRUCache(max_entries=2)), \
+                mock.patch.object(ratelimit, "_buckets", LRUCache(max_entries=2)):
+            for n in range(5):
+                http_client.fetch(f"https://host{n}.example/", retry=NO_SLEEP)
+            self.assertEqual(list(http_client.host_stats()), ["host3.example", "host4.example"])
+            self.assertEqual(list(ratelimit.limiter_stats()), ["host3.example", "host4.example"])
+
+
+class TestHedging(HttpClientTestCase):
+    def test_hedge_returns_faster_copy(self) -> None:
+        calls = []
+
+        def get(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 1:
+                time.sleep(0.5)
+                return make_response(200, b"slow")
+            return make_response(200, b"fast")
+
+        self.session.get.side_effect = get
+        state = http_client._host_state("example.com")
+        for _ in range(http_client.HEDGE_MIN_SAMPLES):
+            state.latency.observe(0.01)
+
+        response = http_client.fetch("https://example.com/", hedge=True)
+        self.assertEqual(response.text, "fast")
+        self.assertEqual(len(calls), 2)
+
+    def test_hedges_streamed_pages_and_closes_the_loser(self) -> None:
+        slow = make_response(200, b"slow")
+        closed = threading.Event()
+        slow.close = closed.set
+
+        def get(*args, **kwargs):
+            if self.session.get.call_count == 1:
+                time.sleep(0.3)
+                return slow
+            return make_response(200, b"fast")
+
+        self.session.get.side_effect = get
+        state = http_client._host_state("example.com")
+        for _ in range(http_client.HEDGE_MIN_SAMPLES):
+            state.latency.observe(0.01)
+
+        page = http_client.fetch_page("https://example.com/", hedge=True)
+        self.assertEqual(page.content, b"fast")
+        self.assertTrue(self.session.get.call_args.kwargs["stream"])
+        self.assertTrue(closed.wait(2.0))
+
+
+class TestFetchPage(HttpClientTestCase):
+    def test_streams_and_uses_header_charset(self) -> None:
+        body = "caf\u00e9".encode("latin-1")
+        self.session.get.return_value = make_response(
+            200, body, content_type="text/html; charset=ISO-8859-1"
+        )
+        page = http_client.fetch_page("https://example.com/")
+        self.assertEqual(page.text(), "caf\u00e9")
+        self.assertEqual(page.content_type, "text/html")
+        self.assertTrue(self.session.get.call_args.kwargs["stream"])
+
+    def test_defaults_to_utf8_without_charset(self) -> None:
+        self.session.get.return_value = make_response(200, b"x", content_type="text/html")
+        self.assertEqual(http_client.fetch_page("https://example.com/").encoding, "utf-8")
+
+    def test_rejects_oversized_body(self) -> None:
+        self.session.get.return_value = make_response(200, b"x" * 2048)
+        with self.assertRaises(http_client.ResponseTooLargeError):
+            http_client.fetch_page("https://example.com/", max_bytes=1024)
+
+    def test_rejects_oversized_content_length_without_reading(self) -> None:
+        response = make_response(200, b"")
+        response.headers["Content-Length"] = "999999"
+        self.session.get.return_value = response
+        with mock.patch.object(http_client, "read_body") as read:
+            with self.assertRaises(http_client.ResponseTooLargeError):
+                http_client.fetch_page("https://example.com/", max_bytes=1024)
+        read.assert_not_called()
+
+    def test_retries_body_that_breaks_off_mid_read(self) -> None:
+        broken = make_response(200, b"")
+        broken.iter_content = mock.Mock(side_effect=requests.exceptions.ChunkedEncodingError("reset"))
+        self.session.get.side_effect = [broken, make_response(200, b"whole")]
+        breaker = http_client._host_state("example.com").breaker
+        with mock.patch.object(breaker, "record_failure", wraps=breaker.record_failure) as record_failure:
+            page = http_client.fetch_page("https://example.com/", retry=NO_SLEEP)
+        self.assertEqual(page.content, b"whole")
+        self.assertEqual(self.session.get.call_count, 2)
+        record_failure.assert_called_once()
+
+    def test_body_read_failures_count_against_breaker(self) -> None:
+        def broken(*args, **kwargs):
+            response = make_response(200, b"")
+            response.iter_content = mock.Mock(side_effect=requests.exceptions.ConnectionError("read timed out"))
+            return response
+
+        self.session.get.side_effect = broken
+        with self.assertRaises(http_client.HttpError):
+            http_client.fetch_page("https://example.com/", retry=NO_SLEEP)
+        self.assertEqual(self.session.get.call_count, 3)
+        self.assertEqual(http_client._host_state("example.com").breaker.stats()["consecutive_failures"], 3)
+
+    def test_deadline_checked_between_chunks(self) -> None:
+        response = make_response(200, b"")
+        response.iter_content = mock.Mock(return_value=iter([b"a", b"b"]))
+        with deadline.deadline_scope(0):
+            with self.assertRaises(http_client.DeadlineExceededError):
+                http_client.read_body(response, 1024)
+
+    def test_charset_parsing(self) -> None:
+        parse = http_client.charset_from_headers
+        self.assertEqual(parse({"Content-Type": 'text/html; charset="Shift_JIS"'}), "Shift_JIS")
+        self.assertEqual(parse({"Content-Type": "text/html; charset=bogus-9"}), "utf-8")
+        self.assertEqual(parse({}), "utf-8")
+
+    def test_session_negotiates_compression(self) -> None:
+        self.assertIn("gzip", http_client.ACCEPT_ENCODING)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Tests for the shared JSON layer and the Reddit listing decoder.
+
+Run with:
+    python3 -m unittest tests.test_jsonio
+"""
+
+import json
+import unittest
+from unittest import mock
+
+from mcp_server.adapters import reddit
+from mcp_server.utils import jsonio
+
+
+DATA = {"b": [1, 2.5, None, True], "a": "héllo", 3: "int key"}
+
+
+class JsonioContract:
+    """Checks run against both backends."""
+
+    def test_compact_by_default(self) -> None:
+        text = jsonio.dumps({"a": 1, "b": [1, 2]})
+        self.assertEqual(text, '{"a":1,"b":[1,2]}')
+
+    def test_indent_on_request(self) -> None:
+        text = jsonio.dumps({"a": 1}, indent=True)
+        self.assertEqual(text, '{\n  "a": 1\n}')
+
+    def test_non_ascii_is_not_escaped(self) -> None:
+        self.assertIn("héllo".encode("utf-8"), jsonio.dumps_bytes(DATA))
+
+    def test_sort_keys_matches_stdlib(self) -> None:
+        expected = json.dumps(
+            {"b": 1, "a": [2]}, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+        )
+        self.assertEqual(jsonio.dumps({"b": 1, "a": [2]}, sort_keys=True), expected)
+
+    def test_round_trip_str_and_bytes(self) -> None:
+        encoded = jsonio.dumps(DATA)
+        self.assertEqual(jsonio.loads(encoded), jsonio.loads(encoded.encode("utf-8")))
+        self.assertEqual(jsonio.loads(encoded)["3"], "int key")
+
+    def test_big_integers(self) -> None:
+        self.assertEqual(jsonio.loads(jsonio.dumps({"n": 2**70}))["n"], 2**70)
+
+    def test_decode_error_is_value_error(self) -> None:
+        with self.assertRaises(jsonio.JSONDecodeError):
+            jsonio.loads(b"{not json")
+        with self.assertRaises(ValueError):
+            jsonio.loads("")
+
+
+@unittest.skipIf(jsonio.orjson is None, "orjson not installed")
+class TestOrjsonBackend(JsonioContract, unittest.TestCase):
+    pass
+
+
+class TestStdlibBackend(JsonioContract, unittest.TestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch.object(jsonio, "orjson", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestRedditSelection(unittest.TestCase):
+    def test_keeps_only_mapped_fields(self) -> None:
+        listing = {
+            "data": {
+                "children": [
+                    {"data": {"title": "T", "permalink": "/r/x/1", "ups": 5,
+                              "num_comments": 2, "id": "1", "preview": {"huge": [1] * 100}}},
+                ]
+            }
+        }
+        posts = reddit._select_posts(jsonio.dumps_bytes(listing))
+        self.assertEqual(
+            posts, [{"title": "T", "permalink": "/r/x/1", "ups": 5, "num_comments": 2, "id": "1"}]
+        )
+
+    def test_fetch_top_posts_maps_selected_fields(self) -> None:
+        listing = {"data": {"children": [{"data": {"title": "T", "permalink": "/r/x/1", "ups": 5}}]}}
+        page = mock.Mock(content=jsonio.dumps_bytes(listing))
+        reddit._listings.clear()
+        self.addCleanup(reddit._listings.clear)
+        with mock.patch.object(reddit, "fetch_page", return_value=page):
+            posts = reddit.fetch_top_posts(limit=5)
+        self.assertEqual(posts[0]["link"], "https://www.reddit.com/r/x/1")
+        self.assertEqual(posts[0]["score"], 5)
+        self.assertEqual(posts[0]["comments"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Tests for the live snapshot fan-out hub.
+
+Run with:
+    python3 -m unittest tests.test_live
+"""
+
+import time
+import unittest
+from unittest import mock
+
+from mcp_server import live
+from mcp_server.live import FeedHub, encode_event
+from mcp_server.snapshots import Snapshot, SnapshotStore, content_version
+
+
+class FakeFetcher:
+    def __init__(self) -> None:
+        self.items = [{"rank": 1, "title": "a", "link": "https://a", "points": 1}]
+        self.calls = 0
+
+    def __call__(self, source, ttl):
+        self.calls += 1
+        now = time.time()
+        return Snapshot(source, list(self.items), content_version(self.items), now, now + ttl)
+
+
+class TestFeedHub(unittest.TestCase):
+    def setUp(self) -> None:
+        self.fetcher = FakeFetcher()
+        self.store = SnapshotStore(ttl=60.0, fetcher=self.fetcher)
+        self.hub = FeedHub(self.store)
+
+    def tearDown(self) -> None:
+        for source in live.SOURCES:
+            for sub in list(self.hub._subscribers[source]):
+                self.hub.unsubscribe(sub)
+
+    def test_subscribers_share_one_fetch_and_event(self) -> None:
+        subs = [self.hub.subscribe("hackernews") for _ in range(50)]
+        events = [sub.next_event(timeout=2.0) for sub in subs]
+        self.assertEqual(self.fetcher.calls, 1)
+        self.assertTrue(all(e == events[0] for e in events))
+        self.assertIn(b"event: snapshot", events[0])
+
+    def test_publish_encodes_once(self) -> None:
+        subs = [live.Subscription("hackernews", 4) for _ in range(10)]
+        self.hub._subscribers["hackernews"].update(subs)
+        self.hub.publish(self.fetcher("hackernews", 60.0))
+        events = [sub.next_event(timeout=0) for sub in subs]
+        self.assertTrue(all(e is events[0] for e in events))
+
+    def test_only_version_changes_are_published(self) -> None:
+        sub = self.hub.subscribe("reddit")
+        self.assertIsNotNone(sub.next_event(timeout=2.0))
+
+        self.store.refresh("reddit")  # same content
+        self.assertIsNone(sub.next_event(timeout=0.05))
+
+        self.fetcher.items = [{"rank": 1, "title": "a", "link": "https://a", "points": 2}]
+        self.store.refresh("reddit")
+        self.assertIn(b'"points":2', sub.next_event(timeout=1.0))
+
+    def test_last_event_id_skips_current_snapshot(self) -> None:
+        snapshot = self.store.get("producthunt")
+        sub = self.hub.subscribe("producthunt", last_version=snapshot.version)
+        self.assertIsNone(sub.next_event(timeout=0.05))
+
+    def test_slow_subscriber_is_dropped(self) -> None:
+        sub = self.hub.subscribe("hackernews")
+        for i in range(live.SUBSCRIBER_QUEUE + 1):
+            self.fetcher.items = [{"rank": 1, "title": str(i)}]
+            self.store.refresh("hackernews")
+        self.assertTrue(sub.dropped)
+        self.assertEqual(self.hub.subscriber_count("hackernews"), 0)
+        self.assertEqual(self.hub.stats()["dropped"], 1)
+
+    def test_subscriber_cap(self) -> None:
+        with mock.patch.object(live, "MAX_SUBSCRIBERS", 1):
+            self.hub.subscribe("hackernews")
+            with self.assertRaises(live.HubFullError):
+                self.hub.subscribe("reddit")
+
+    def test_encode_event_format(self) -> None:
+        snapshot = self.fetcher("hackernews", 60.0)
+        event = encode_event(snapshot).decode("utf-8")
+        self.assertTrue(event.startswith(f"id: {snapshot.version}\nevent: snapshot\ndata: {{"))
+        self.assertTrue(event.endswith("\n\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
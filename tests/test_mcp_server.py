@@ -0,0 +1,76 @@
+"""
+Tests for the FastMCP tool functions in mcp_server.mcp_server.
+
+Run with:
+    python3 -m unittest tests.test_mcp_server
+"""
+
+import asyncio
+import unittest
+from unittest import mock
+
+from mcp_server import mcp_server
+from mcp_server.snapshots import SnapshotError, SnapshotStore
+from tests.conftest import fake_fetcher
+
+
+class McpServerTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = SnapshotStore(ttl=60.0, fetcher=fake_fetcher)
+        patcher = mock.patch.object(mcp_server, "get_store", return_value=self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestFeedTools(McpServerTestCase):
+    def test_per_source_tool_clamps_limit(self) -> None:
+        items = asyncio.run(mcp_server.hn_get_top_posts(limit=500))
+        self.assertEqual(len(items), 50)
+        self.assertEqual(items[0]["title"], "hackernews 1")
+
+    def test_get_feed_shares_snapshot(self) -> None:
+        asyncio.run(mcp_server.get_feed("Reddit", limit=3))
+        asyncio.run(mcp_server.reddit_get_top_posts(limit=5))
+        self.assertEqual(self.store.refreshes, 1)
+
+    def test_get_feed_rejects_unknown_source(self) -> None:
+        with self.assertRaises(ValueError):
+            asyncio.run(mcp_server.get_feed("digg"))
+
+    def test_fetch_error_surfaces_as_runtime_error(self) -> None:
+        def failing(source, ttl):
+            raise SnapshotError("Failed to fetch Reddit posts", "timeout")
+
+        self.store._fetcher = failing
+        with self.assertRaises(RuntimeError):
+            asyncio.run(mcp_server.reddit_get_top_posts())
+
+
+class TestProjection(McpServerTestCase):
+    def test_fields_projection(self) -> None:
+        items = asyncio.run(mcp_server.get_feed("hackernews", limit=2, fields=["title", "link"]))
+        self.assertEqual(items[0], {"title": "hackernews 1", "link": "https://example.com/1"})
+
+    def test_columnar_output(self) -> None:
+        result = asyncio.run(
+            mcp_server.ph_get_top_products(limit=3, fields=["rank", "points"], columnar=True)
+        )
+        self.assertEqual(result, {"rank": [1, 2, 3], "points": [1, 2, 3]})
+
+    def test_columnar_defaults_to_all_fields(self) -> None:
+        result = asyncio.run(mcp_server.reddit_get_top_posts(limit=2, columnar=True))
+        self.assertEqual(list(result), ["rank", "title", "link", "points", "comments", "source"])
+        self.assertEqual(len(result["title"]), 2)
+
+    def test_unknown_field_fails_before_fetching(self) -> None:
+        with self.assertRaises(ValueError):
+            asyncio.run(mcp_server.get_feed("hackernews", fields=["votes"]))
+        self.assertEqual(self.store.refreshes, 0)
+
+    def test_projection_does_not_mutate_snapshot(self) -> None:
+        asyncio.run(mcp_server.hn_get_top_posts(limit=1, fields=["title"]))
+        self.assertIn("link", self.store.peek("hackernews").items[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
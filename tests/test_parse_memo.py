@@ -0,0 +1,99 @@
+"""
+Tests for the content-hash parse memo used by the HTML adapters.
+
+Run with:
+    python3 -m unittest tests.test_parse_memo
+"""
+
+import unittest
+from unittest import mock
+
+from mcp_server.adapters import hackernews, producthunt
+from mcp_server.utils.cache import ParseMemo
+from mcp_server.utils.http_client import Page
+from mcp_server.utils.parser import parse_memo
+
+
+HN_HTML = b"""
+<table>
+  <tr class="athing" id="1">
+    <td><span class="rank">1.</span></td>
+    <td><span class="titleline"><a href="https://example.com/a">Story A</a></span></td>
+  </tr>
+  <tr><td class="subtext"><span class="score">10 points</span>
+    <a href="item?id=1">5&nbsp;comments</a></td></tr>
+</table>
+"""
+
+
+def hn_page(body: bytes = HN_HTML) -> Page:
+    return Page(hackernews.HN_URL, body, "utf-8", "text/html")
+
+
+class TestParseMemo(unittest.TestCase):
+    def test_parses_once_per_body(self) -> None:
+        memo = ParseMemo(max_entries=4)
+        parse = mock.Mock(side_effect=[["a"], ["b"]])
+
+        self.assertEqual(memo.get_or_parse("x", "1", b"body", parse), ["a"])
+        self.assertEqual(memo.get_or_parse("x", "1", b"body", parse), ["a"])
+        self.assertEqual(memo.get_or_parse("x", "1", b"other", parse), ["b"])
+        self.assertEqual(parse.call_count, 2)
+
+        stats = memo.stats()
+        self.assertEqual(stats["by_name"]["x"], {"hits": 1, "misses": 2, "hit_rate": 1 / 3})
+
+    def test_version_change_invalidates(self) -> None:
+        memo = ParseMemo()
+        parse = mock.Mock(return_value=[])
+        memo.get_or_parse("x", "1", b"body", parse)
+        memo.get_or_parse("x", "2", b"body", parse)
+        self.assertEqual(parse.call_count, 2)
+
+    def test_bounded(self) -> None:
+        memo = ParseMemo(max_entries=2)
+        for i in range(5):
+            memo.get_or_parse("x", "1", str(i).encode(), lambda: [i])
+        self.assertEqual(memo.stats()["entries"], 2)
+
+
+class TestAdapterMemo(unittest.TestCase):
+    def setUp(self) -> None:
+        parse_memo.clear()
+
+    def test_identical_hn_page_skips_parsing(self) -> None:
+        with mock.patch.object(hackernews, "fetch_page", return_value=hn_page()), \
+                mock.patch.object(hackernews, "parse_html", wraps=hackernews.parse_html) as parse:
+            first = hackernews.fetch_top_posts(limit=5)
+            second = hackernews.fetch_top_posts(limit=5)
+
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(first[0]["title"], "Story A")
+        self.assertEqual(first[0]["points"], 10)
+
+    def test_changed_hn_page_is_reparsed(self) -> None:
+        pages = [hn_page(), hn_page(HN_HTML.replace(b"Story A", b"Story B"))]
+        with mock.patch.object(hackernews, "fetch_page", side_effect=pages):
+            hackernews.fetch_top_posts()
+            posts = hackernews.fetch_top_posts()
+        self.assertEqual(posts[0]["title"], "Story B")
+
+    def test_callers_cannot_corrupt_memo(self) -> None:
+        with mock.patch.object(hackernews, "fetch_page", return_value=hn_page()):
+            hackernews.fetch_top_posts()[0]["title"] = "mutated"
+            self.assertEqual(hackernews.fetch_top_posts()[0]["title"], "Story A")
+
+    def test_producthunt_uses_memo(self) -> None:
+        body = b"<article data-test='post-item'><h3><a href='/posts/x'>X</a></h3></article>"
+        page = Page(producthunt.PH_URL, body, "utf-8", "text/html")
+        with mock.patch.object(producthunt, "fetch_page", return_value=page), \
+                mock.patch.object(producthunt, "parse_html", wraps=producthunt.parse_html) as parse:
+            producthunt.fetch_top_products()
+            products = producthunt.fetch_top_products(limit=1)
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(products[0]["link"], "https://www.producthunt.com/posts/x")
+
+
+if __name__ == "__main__":
+    unittest.main()
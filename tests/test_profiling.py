@@ -0,0 +1,101 @@
+"""
+Offline tests for on-demand profiling of tool handler calls (utils/profiling.py).
+
+Run with:
+    python3 -m unittest tests.test_profiling
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from mcp_server import mcp_server, tools
+from mcp_server.tools import Tool
+from mcp_server.utils import profiling
+
+
+def slow_parse(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+def fake_handler(args):
+    return [{"link": link, "total": slow_parse(2000)} for link in args["links"]]
+
+
+class ProfilingTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        for name, value in (("PROFILE_DIR", self.tmp.name), ("_tools", None), ("_last", None)):
+            patcher = mock.patch.object(profiling, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class TestProfiling(ProfilingTestCase):
+    def test_off_by_default(self) -> None:
+        self.assertEqual(profiling.run("tool", slow_parse, 10), 285)
+        self.assertIsNone(profiling.last_profile())
+
+    def test_scope_profiles_and_writes_file(self) -> None:
+        with profiling.profile_scope(True):
+            self.assertEqual(profiling.run("tool", slow_parse, 10), 285)
+        last = profiling.last_profile()
+        self.assertTrue(os.path.exists(last.path))
+        self.assertTrue(os.path.basename(last.path).startswith("tool-"))
+
+        summary = last.summary(limit=5)
+        self.assertEqual(summary["tool"], "tool")
+        self.assertLessEqual(len(summary["functions"]), 5)
+        self.assertTrue(any("slow_parse" in f["function"] for f in summary["functions"]))
+        with self.assertRaises(ValueError):
+            last.summary(sort="name")
+
+    def test_env_selects_tools(self) -> None:
+        self.assertIsNone(profiling._profiled_tools("off"))
+        self.assertEqual(profiling._profiled_tools("all"), frozenset())
+        with mock.patch.object(profiling, "_tools", profiling._profiled_tools("a, b")):
+            self.assertTrue(profiling.wanted("a"))
+            self.assertFalse(profiling.wanted("c"))
+        with mock.patch.object(profiling, "_tools", frozenset()):
+            self.assertTrue(profiling.wanted("c"))
+
+    def test_records_errors(self) -> None:
+        with profiling.profile_scope(True), self.assertRaises(ZeroDivisionError):
+            profiling.run("tool", lambda: 1 / 0)
+        self.assertIn("ZeroDivisionError", profiling.last_profile().error)
+
+    def test_overlapping_call_runs_unprofiled(self) -> None:
+        with profiling._busy, profiling.profile_scope(True):
+            self.assertEqual(profiling.run("tool", slow_parse, 10), 285)
+        self.assertIsNone(profiling.last_profile())
+
+    def test_prunes_old_profiles(self) -> None:
+        with mock.patch.object(profiling, "PROFILE_KEEP", 2), profiling.profile_scope(True):
+            for _ in range(4):
+                profiling.run("tool", slow_parse, 10)
+        self.assertEqual(len(os.listdir(self.tmp.name)), 2)
+
+
+class TestProfileTool(ProfilingTestCase):
+    def test_tool_argument_profiles_handler(self) -> None:
+        tool = Tool(name="fetch_articles", description="", handler=fake_handler)
+        with mock.patch.dict(tools._TOOLS, {"fetch_articles": tool}):
+            asyncio.run(mcp_server.fetch_articles(["https://example.com/a"]))
+            self.assertIsNone(profiling.last_profile())
+            items = asyncio.run(mcp_server.fetch_articles(["https://example.com/a"], profile=True))
+        self.assertEqual(items[0]["link"], "https://example.com/a")
+
+        summary = asyncio.run(mcp_server.debug_last_profile(limit=50, sort="tottime"))
+        self.assertEqual(summary["tool"], "fetch_articles")
+        self.assertTrue(any("slow_parse" in f["function"] for f in summary["functions"]))
+
+    def test_no_profile_yet_is_a_tool_error(self) -> None:
+        with self.assertRaises(RuntimeError):
+            asyncio.run(mcp_server.debug_last_profile())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Tests for progressive results (utils/progress.py and MCP progress notifications).
+
+Run with:
+    python3 -m unittest tests.test_progress
+"""
+
+import asyncio
+import json
+import time
+import unittest
+from unittest import mock
+
+from mcp.shared.memory import create_connected_server_and_client_session  # type: ignore[import]
+
+from mcp_server import mcp_server
+from mcp_server.adapters import articles, hackernews
+from mcp_server.executor import ToolExecutor
+from mcp_server.snapshots import SnapshotError, SnapshotStore
+from mcp_server.utils import progress
+from tests.conftest import fake_fetcher as shared_fetcher
+
+
+def fake_fetcher(source, ttl):
+    if source == "producthunt":
+        raise SnapshotError("Failed to fetch Product Hunt products", "timeout")
+    if source == "reddit":
+        time.sleep(0.05)
+    return shared_fetcher(source, ttl, count=5)
+
+
+class TestEmit(unittest.TestCase):
+    def test_emit_without_sink_is_a_no_op(self) -> None:
+        self.assertFalse(progress.active())
+        progress.emit([{"a": 1}])
+
+    def test_scope_routes_batches_and_skips_empty_ones(self) -> None:
+        batches = []
+        with progress.progress_scope(lambda items, label: batches.append((label, items))):
+            self.assertTrue(progress.active())
+            progress.emit([{"a": 1}], "x")
+            progress.emit([], "x")
+        progress.emit([{"a": 2}], "x")
+        self.assertEqual(batches, [("x", [{"a": 1}])])
+
+    def test_articles_emit_each_result(self) -> None:
+        articles._cache.clear()
+        batches = []
+
+        def fake_fetch_one(link, max_bytes, timeout):
+            return articles._empty_result(link)
+
+        with mock.patch.object(articles, "_fetch_one", side_effect=fake_fetch_one):
+            with progress.progress_scope(lambda items, label: batches.append(items)):
+                articles.fetch_articles(["https://a.example/1", "https://b.example/2"])
+        self.assertEqual(sorted(batch[0]["link"] for batch in batches),
+                         ["https://a.example/1", "https://b.example/2"])
+
+    def test_comments_emit_one_batch_per_level(self) -> None:
+        hackernews._items.clear()
+        tree = {
+            1: {"id": 1, "title": "Story", "kids": [2, 3]},
+            2: {"id": 2, "by": "a", "text": "top", "kids": [4]},
+            3: {"id": 3, "by": "b", "text": "top"},
+            4: {"id": 4, "by": "c", "text": "reply"},
+        }
+        batches = []
+        with mock.patch.object(hackernews, "_fetch_item", side_effect=tree.get):
+            with progress.progress_scope(lambda items, label: batches.append(items)):
+                hackernews.fetch_comments(1)
+        self.assertEqual([[c["id"] for c in batch] for batch in batches], [[2, 3], [4]])
+        self.assertNotIn("replies", batches[0][0])
+
+
+class TestProgressNotifications(unittest.TestCase):
+    def setUp(self) -> None:
+        for name, value in (
+            ("get_store", SnapshotStore(ttl=60.0, fetcher=fake_fetcher)),
+            ("get_executor", ToolExecutor(max_workers=4, max_queue=8)),
+        ):
+            patcher = mock.patch.object(mcp_server, name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def call(self, tool, arguments, with_progress=True):
+        notes = []
+
+        async def on_progress(done, total, message):
+            notes.append((done, total, json.loads(message)))
+
+        async def run():
+            async with create_connected_server_and_client_session(mcp_server.mcp) as client:
+                result = await client.call_tool(
+                    tool, arguments, progress_callback=on_progress if with_progress else None
+                )
+                return json.loads(result.content[0].text)
+
+        return asyncio.run(run()), notes
+
+    def test_context_is_not_a_tool_argument(self) -> None:
+        tools = asyncio.run(mcp_server.mcp.list_tools())
+        for tool in tools:
+            self.assertNotIn("ctx", tool.inputSchema["properties"], tool.name)
+
+    def test_get_feeds_sends_each_source_as_it_finishes(self) -> None:
+        result, notes = self.call(
+            "get_feeds", {"sources": ["reddit", "hackernews", "producthunt"], "limit": 2}
+        )
+        self.assertEqual(set(result["feeds"]), {"reddit", "hackernews"})
+        self.assertIn("timeout", result["errors"]["producthunt"])
+
+        # Hacker News is fast, Reddit sleeps: batches arrive in finishing order.
+        self.assertEqual([note[2]["source"] for note in notes], ["hackernews", "reddit"])
+        self.assertEqual([note[0] for note in notes], [2, 4])
+        self.assertEqual(notes[0][2]["items"], result["feeds"]["hackernews"])
+
+    def test_no_notifications_without_progress_token(self) -> None:
+        result, notes = self.call("get_feed", {"source": "hackernews", "limit": 1}, with_progress=False)
+        self.assertEqual(result["title"], "hackernews 1")
+        self.assertEqual(notes, [])
+
+    def test_get_feeds_rejects_unknown_source(self) -> None:
+        with self.assertRaises(ValueError):
+            asyncio.run(mcp_server.get_feeds(["hackernews", "digg"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Offline tests for the per-host token-bucket rate limiter.
+
+Run with:
+    python3 -m unittest tests.test_ratelimit
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+
+from mcp_server.utils.ratelimit import (
+    RateLimitTimeout,
+    TokenBucket,
+    _parse_rate_overrides,
+    _parse_retry_after,
+)
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_queue(self) -> None:
+        bucket = TokenBucket(rate=20.0, capacity=2)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertEqual(bucket.acquire(), 0.0)
+        waited = bucket.acquire(max_wait=1.0)
+        self.assertGreater(waited, 0.0)
+        self.assertLessEqual(waited, 0.06)
+
+    def test_rejects_when_wait_exceeds_max(self) -> None:
+        bucket = TokenBucket(rate=1.0, capacity=1)
+        bucket.acquire()
+        with self.assertRaises(RateLimitTimeout):
+            bucket.acquire(max_wait=0.1)
+        self.assertEqual(bucket.stats()["rejected"], 1)
+
+    def test_threads_are_serialized_by_rate(self) -> None:
+        bucket = TokenBucket(rate=50.0, capacity=1)
+        started = time.monotonic()
+        threads = [threading.Thread(target=bucket.acquire) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # 1 immediate token + 5 queued at 20ms each.
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+        self.assertGreaterEqual(bucket.max_queue_depth, 1)
+        self.assertEqual(bucket.queue_depth, 0)
+
+    def test_async_shares_bucket(self) -> None:
+        bucket = TokenBucket(rate=50.0, capacity=1)
+        bucket.acquire()
+        waited = asyncio.run(bucket.acquire_async(max_wait=1.0))
+        self.assertGreater(waited, 0.0)
+
+    def test_retry_after_pauses_bucket(self) -> None:
+        bucket = TokenBucket(rate=100.0, capacity=10)
+        bucket.observe_response(429, {"Retry-After": "0.2"})
+        self.assertFalse(bucket.try_acquire())
+        self.assertEqual(bucket.stats()["throttled"], 1)
+
+    def test_ratelimit_remaining_zero_pauses_bucket(self) -> None:
+        bucket = TokenBucket(rate=100.0, capacity=10)
+        bucket.observe_response(200, {"X-Ratelimit-Remaining": "0.0", "X-Ratelimit-Reset": "5"})
+        with self.assertRaises(RateLimitTimeout):
+            bucket.acquire(max_wait=1.0)
+
+
+class TestParsing(unittest.TestCase):
+    def test_retry_after_formats(self) -> None:
+        self.assertEqual(_parse_retry_after("3"), 3.0)
+        self.assertEqual(_parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertIsNone(_parse_retry_after("soon"))
+
+    def test_rate_overrides(self) -> None:
+        rates = _parse_rate_overrides("www.reddit.com=0.2:3, bad, news.ycombinator.com=2")
+        self.assertEqual(rates["www.reddit.com"], (0.2, 3))
+        self.assertEqual(rates["news.ycombinator.com"][0], 2.0)
+        self.assertNotIn("bad", rates)
+
+
+if __name__ == "__main__":
+    unittest.main()
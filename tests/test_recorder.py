@@ -0,0 +1,100 @@
+"""
+Tests for record mode (tool-call traces).
+
+Run with:
+    python3 -m unittest tests.test_recorder
+"""
+
+import asyncio
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from mcp_server import stdio_server, tools
+from mcp_server.utils import jsonio, recorder
+
+
+def read_trace(path: str):
+    with open(path, "rb") as fh:
+        return [jsonio.loads(line) for line in fh if line.strip()]
+
+
+class RecorderTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "trace.ndjson")
+        self.recorder = recorder.TraceRecorder(self.path)
+        self.addCleanup(self.recorder.close)
+        patcher = mock.patch.object(recorder, "get_recorder", return_value=self.recorder)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestRecordedDecorator(RecorderTestCase):
+    def test_records_arguments_timing_and_errors(self) -> None:
+        @recorder.recorded
+        async def get_feed(source: str, limit: int = 10):
+            if source == "bad":
+                raise ValueError("nope")
+            return [source] * limit
+
+        self.assertEqual(asyncio.run(get_feed("reddit", limit=2)), ["reddit", "reddit"])
+        with self.assertRaises(ValueError):
+            asyncio.run(get_feed("bad"))
+
+        ok, failed = read_trace(self.path)
+        self.assertEqual(ok["tool"], "get_feed")
+        self.assertEqual(ok["args"], {"source": "reddit", "limit": 2})
+        self.assertTrue(ok["ok"])
+        self.assertGreaterEqual(ok["duration_ms"], 0)
+        self.assertLessEqual(ok["ts"], failed["ts"])
+        self.assertEqual(failed["error"], "ValueError: nope")
+
+    def test_keeps_signature_for_fastmcp(self) -> None:
+        import inspect
+
+        async def tool(source: str, limit: int = 10):
+            return None
+
+        self.assertEqual(inspect.signature(recorder.recorded(tool)), inspect.signature(tool))
+
+
+class TestStdioServerRecording(RecorderTestCase):
+    def test_records_handler_calls(self) -> None:
+        tool = mock.Mock(handler=mock.Mock(return_value=[{"title": "x"}]))
+        request = '{"tool": "hn_get_top_posts", "args": {"limit": 1}}'
+        with mock.patch.object(tools, "get_recorder", return_value=self.recorder), \
+                mock.patch.dict(tools._TOOLS, {"hn_get_top_posts": tool}), \
+                mock.patch("sys.stdin", io.StringIO(request)), \
+                mock.patch("sys.stdout", io.StringIO()):
+            stdio_server.main()
+
+        (entry,) = read_trace(self.path)
+        self.assertEqual((entry["tool"], entry["args"], entry["ok"]), ("hn_get_top_posts", {"limit": 1}, True))
+
+    def test_records_handler_exceptions(self) -> None:
+        tool = mock.Mock(handler=mock.Mock(side_effect=RuntimeError("boom")))
+        with mock.patch.object(tools, "get_recorder", return_value=self.recorder), \
+                mock.patch.dict(tools._TOOLS, {"hn_get_top_posts": tool}):
+            with self.assertRaises(RuntimeError):
+                tools.call_tool("hn_get_top_posts", {}, record=True)
+            tool.handler.side_effect = None
+            tools.call_tool("hn_get_top_posts", {})  # not recorded
+
+        (entry,) = read_trace(self.path)
+        self.assertEqual((entry["ok"], entry["error"]), (False, "RuntimeError: boom"))
+
+
+class TestDisabled(unittest.TestCase):
+    def test_no_recorder_without_env(self) -> None:
+        with mock.patch.object(recorder, "_configured", False), \
+                mock.patch.object(recorder, "_recorder", None), \
+                mock.patch.dict(os.environ, {"WEB2API_RECORD": ""}):
+            self.assertIsNone(recorder.get_recorder())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+"""
+Offline tests for parameterized Reddit listings and their size-bounded cache.
+
+Run with:
+    python3 -m unittest tests.test_reddit_listings
+"""
+
+import asyncio
+import unittest
+from unittest import mock
+
+from mcp_server import mcp_server
+from mcp_server.adapters import reddit
+from mcp_server.tools import reddit_get_top_posts_handler
+from mcp_server.utils import jsonio
+from mcp_server.utils.cache import LRUCache
+from mcp_server.utils.http_client import Page
+
+
+def listing_page(count: int) -> Page:
+    children = [
+        {"data": {"title": f"Post {i}", "permalink": f"/r/python/{i}", "ups": i,
+                  "num_comments": 0, "subreddit": "python", "id": str(i)}}
+        for i in range(1, count + 1)
+    ]
+    body = jsonio.dumps_bytes({"data": {"children": children}})
+    return Page(
+        url="https://www.reddit.com/", content=body, encoding="utf-8", content_type="application/json"
+    )
+
+
+class TestLRUCacheBytes(unittest.TestCase):
+    def test_evicts_least_recently_used_to_stay_under_budget(self) -> None:
+        cache: LRUCache[str] = LRUCache(max_entries=10, max_bytes=10, sizeof=len)
+        cache.set("a", "xxxx")
+        cache.set("b", "xxxx")
+        cache.get("a")
+        cache.set("c", "xxxx")
+        self.assertIsNone(cache.get_stale("b"))
+        self.assertEqual(cache.get("a"), "xxxx")
+        self.assertEqual(cache.stats()["bytes"], 8)
+
+    def test_replacing_and_popping_adjust_size(self) -> None:
+        cache: LRUCache[str] = LRUCache(max_entries=10, max_bytes=10, sizeof=len)
+        cache.set("a", "xxxx")
+        cache.set("a", "xx")
+        self.assertEqual(cache.bytes, 2)
+        cache.pop("a")
+        self.assertEqual(cache.bytes, 0)
+
+    def test_oversized_value_is_not_stored(self) -> None:
+        cache: LRUCache[str] = LRUCache(max_entries=10, max_bytes=3, sizeof=len)
+        cache.set("a", "xx")
+        cache.set("b", "xxxx")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "xx")
+
+    def test_max_bytes_needs_sizeof(self) -> None:
+        with self.assertRaises(ValueError):
+            LRUCache(max_bytes=10)
+
+
+class TestListingKey(unittest.TestCase):
+    def test_normalizes(self) -> None:
+        self.assertEqual(reddit.listing_key("r/Python", "TOP"), ("python", "top", "day"))
+        self.assertEqual(reddit.listing_key("python+rust", "new", "week"), ("python+rust", "new", None))
+        self.assertEqual(reddit.listing_key(), ("all", "hot", None))
+
+    def test_rejects_bad_parameters(self) -> None:
+        for args in (("../all",), ("python", "best"), ("python", "top", "decade")):
+            with self.assertRaises(ValueError):
+                reddit.listing_key(*args)
+
+
+class TestGetListing(unittest.TestCase):
+    def setUp(self) -> None:
+        reddit._listings.clear()
+        patcher = mock.patch.object(
+            reddit, "fetch_page", side_effect=lambda url, params, headers, **kwargs: listing_page(params["limit"])
+        )
+        self.fetch_page = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_builds_url_and_window(self) -> None:
+        reddit.get_listing("python", "top", "week", limit=5)
+        args, kwargs = self.fetch_page.call_args
+        self.assertEqual(args[0], "https://www.reddit.com/r/python/top.json")
+        self.assertEqual(kwargs["params"], {"limit": 10, "t": "week"})
+        # Only the default r/all listing keeps a stale copy for outages.
+        self.assertFalse(kwargs["keep_stale"])
+
+    def test_smaller_limits_are_served_from_cached_prefix(self) -> None:
+        first = reddit.get_listing("python", "new", limit=20)
+        self.assertEqual(len(first), 20)
+        second = reddit.get_listing("python", "new", limit=7)
+        self.assertEqual(second, first[:7])
+        self.assertEqual(self.fetch_page.call_count, 1)
+
+    def test_larger_limit_refetches_and_replaces_entry(self) -> None:
+        reddit.get_listing("python", "new", limit=5)
+        self.assertEqual(len(reddit.get_listing("python", "new", limit=40)), 40)
+        reddit.get_listing("python", "new", limit=30)
+        self.assertEqual(self.fetch_page.call_count, 2)
+        self.assertEqual(len(reddit._listings), 1)
+
+    def test_short_listing_serves_any_limit(self) -> None:
+        self.fetch_page.side_effect = lambda url, params, headers, **kwargs: listing_page(3)
+        reddit.get_listing("python", "rising", limit=5)
+        self.assertEqual(len(reddit.get_listing("python", "rising", limit=50)), 3)
+        self.assertEqual(self.fetch_page.call_count, 1)
+
+    def test_callers_get_copies_of_cached_posts(self) -> None:
+        first = reddit.get_listing("python", "new", limit=5)
+        first[0]["title"] = "mutated"
+        first[1].clear()
+        again = reddit.get_listing("python", "new", limit=5)
+        self.assertEqual(again[0]["title"], "Post 1")
+        self.assertEqual(again[1]["title"], "Post 2")
+        self.assertEqual(self.fetch_page.call_count, 1)
+
+    def test_default_listing_is_cached_and_kept_stale(self) -> None:
+        self.assertEqual(len(reddit.fetch_top_posts(limit=10)), 10)
+        self.assertEqual(len(reddit.fetch_top_posts(limit=5)), 5)
+        self.assertEqual(self.fetch_page.call_count, 1)
+        self.assertTrue(self.fetch_page.call_args.kwargs["keep_stale"])
+
+    def test_cache_stays_within_byte_budget(self) -> None:
+        budget = reddit._entry_size((10, reddit.fetch_listing("python", limit=10))) * 3
+        with mock.patch.object(reddit._listings, "max_bytes", budget):
+            for name in ("aa", "bb", "cc", "dd", "ee"):
+                reddit.get_listing(name, "new", limit=10)
+            self.assertLessEqual(reddit._listings.bytes, budget)
+            self.assertEqual(len(reddit._listings), 3)
+
+
+class TestRedditTool(unittest.TestCase):
+    def test_handler_reports_invalid_parameters(self) -> None:
+        self.assertIn("Invalid sort", reddit_get_top_posts_handler({"sort": "best"})["error"])
+
+    def test_default_listing_uses_snapshot_store(self) -> None:
+        with mock.patch.object(mcp_server, "_feed", return_value=[]) as feed:
+            asyncio.run(mcp_server.reddit_get_top_posts(subreddit="All"))
+        feed.assert_called_once()
+
+    def test_other_listings_are_normalized(self) -> None:
+        reddit._listings.clear()
+        with mock.patch.object(reddit, "fetch_page", return_value=listing_page(5)):
+            items = asyncio.run(
+                mcp_server.reddit_get_top_posts(
+                    limit=2, subreddit="python", sort="top", fields=["rank", "title", "source"]
+                )
+            )
+        self.assertEqual(items, [
+            {"rank": 1, "title": "Post 1", "source": "Reddit"},
+            {"rank": 2, "title": "Post 2", "source": "Reddit"},
+        ])
+
+    def test_invalid_listing_is_a_tool_error(self) -> None:
+        with self.assertRaises(RuntimeError):
+            asyncio.run(mcp_server.reddit_get_top_posts(subreddit="no such"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Tests for the cross-process SQLite snapshot cache.
+
+Each SharedSnapshotCache instance stands in for a separate process.
+
+Run with:
+    python3 -m unittest tests.test_shared_cache
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from mcp_server.shared_cache import SharedSnapshotCache
+from mcp_server.snapshots import Snapshot, SnapshotStore, content_version
+from mcp_server.utils import deadline
+from mcp_server.utils.errors import DeadlineExceededError
+
+
+class CountingFetcher:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.calls = 0
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self, source, ttl):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        items = [{"rank": 1, "title": f"{source} story"}]
+        now = time.time()
+        return Snapshot(source, items, content_version(items), now, now + ttl)
+
+
+class TestSharedSnapshotCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "nested", "snapshots.db")
+
+    def test_round_trip(self) -> None:
+        cache = SharedSnapshotCache(self.path)
+        snapshot = CountingFetcher()("hackernews", 60.0)
+        cache.save(snapshot)
+        loaded = SharedSnapshotCache(self.path).load("hackernews")
+        self.assertEqual(loaded, snapshot)
+        self.assertIsNone(cache.load("reddit"))
+
+    def test_lease_is_exclusive_until_expiry(self) -> None:
+        a = SharedSnapshotCache(self.path)
+        b = SharedSnapshotCache(self.path)
+        self.assertTrue(a.try_acquire_lease("reddit", ttl=0.2))
+        self.assertTrue(a.try_acquire_lease("reddit", ttl=0.2))  # re-entrant
+        self.assertFalse(b.try_acquire_lease("reddit", ttl=0.2))
+        time.sleep(0.25)
+        self.assertTrue(b.try_acquire_lease("reddit", ttl=0.2))
+
+    def test_cached_adopts_fresh_snapshot_without_fetching(self) -> None:
+        SharedSnapshotCache(self.path).save(CountingFetcher()("hackernews", 60.0))
+        fetcher = CountingFetcher()
+        store = SnapshotStore(ttl=60.0, fetcher=fetcher, shared=SharedSnapshotCache(self.path))
+        self.assertEqual(store.cached("hackernews").items[0]["title"], "hackernews story")
+        self.assertIsNotNone(store.peek("hackernews"))
+        self.assertIsNone(store.cached("reddit"))
+        self.assertEqual(fetcher.calls, 0)
+
+    def test_second_process_reuses_snapshot(self) -> None:
+        fetcher = CountingFetcher()
+        first = SnapshotStore(ttl=60.0, fetcher=fetcher, shared=SharedSnapshotCache(self.path))
+        second = SnapshotStore(ttl=60.0, fetcher=fetcher, shared=SharedSnapshotCache(self.path))
+        self.assertEqual(first.get("hackernews").version, second.get("hackernews").version)
+        self.assertEqual(fetcher.calls, 1)
+
+    def test_lease_wait_is_bounded_by_deadline(self) -> None:
+        fetcher = CountingFetcher()
+        holder = SharedSnapshotCache(self.path)
+        self.assertTrue(holder.try_acquire_lease("reddit", ttl=30.0))
+        store = SnapshotStore(ttl=60.0, fetcher=fetcher, shared=SharedSnapshotCache(self.path))
+
+        started = time.monotonic()
+        with deadline.deadline_scope(0.1):
+            with self.assertRaises(DeadlineExceededError):
+                store.get("reddit")
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(fetcher.calls, 0)
+
+    def test_rechecks_after_taking_freed_lease(self) -> None:
+        # The lease holder saves and frees the lease between our load and
+        # our acquire; we must adopt its snapshot instead of fetching again.
+        other = SharedSnapshotCache(self.path)
+        saved = CountingFetcher()("reddit", 60.0)
+
+        class RacingCache(SharedSnapshotCache):
+            def try_acquire_lease(self, source, ttl):
+                other.save(saved)
+                return super().try_acquire_lease(source, ttl)
+
+        fetcher = CountingFetcher()
+        store = SnapshotStore(ttl=60.0, fetcher=fetcher, shared=RacingCache(self.path))
+        self.assertEqual(store.get("reddit"), saved)
+        self.assertEqual(fetcher.calls, 0)
+
+    def test_concurrent_processes_elect_one_writer(self) -> None:
+        fetcher = CountingFetcher(delay=0.2)
+        stores = [
+            SnapshotStore(ttl=60.0, fetcher=fetcher, shared=SharedSnapshotCache(self.path))
+            for _ in range(4)
+        ]
+        threads = [threading.Thread(target=s.get, args=("producthunt",)) for s in stores]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(fetcher.calls, 1)
+        versions = {s.peek("producthunt").version for s in stores}
+        self.assertEqual(len(versions), 1)
+
+
+    def test_history_keeps_new_versions_within_retention(self) -> None:
+        cache = SharedSnapshotCache(self.path, history_days=1.0)
+        now = time.time()
+        for age, title in ((3 * 86400, "old"), (3600, "a"), (1800, "a"), (60, "b")):
+            items = [{"rank": 1, "title": title}]
+            cache.save(Snapshot("reddit", items, content_version(items), now - age, now - age + 60))
+
+        history = list(cache.iter_snapshots(["reddit"]))
+        # The 3-day-old version is pruned and the unchanged one not repeated.
+        self.assertEqual([s.items[0]["title"] for s in history], ["a", "b"])
+        self.assertEqual([s.fetched_at for s in history], [now - 3600, now - 60])
+        (current,) = cache.iter_snapshots(history=False)
+        self.assertEqual(current.items[0]["title"], "b")
+
+    def test_history_can_be_disabled(self) -> None:
+        cache = SharedSnapshotCache(self.path, history_days=0)
+        cache.save(CountingFetcher()("reddit", 60.0))
+        self.assertEqual(list(cache.iter_snapshots()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,208 @@
+"""
+Offline tests for declarative site adapters (sites.py, adapters/declarative.py).
+
+Run with:
+    python3 -m unittest tests.test_sites
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from mcp_server import sites, snapshots, tools
+from mcp_server.adapters import declarative
+from mcp_server.sites import FieldSpec, SiteSpec
+from mcp_server.utils.http_client import HttpError, Page
+from mcp_server.utils.parser import parse_memo
+
+
+LOBSTERS_HTML = b"""
+<html><body><ol class="stories list">
+  <li id="story_a" class="story">
+    <div class="voters"><a class="upvoter" href="/login">1,204</a></div>
+    <div class="details">
+      <span class="link h-cite u-repost-of"><a class="u-url" href="https://example.com/a">First story</a></span>
+      <span class="comments_label"><a href="/s/a/first_story">12 comments</a></span>
+    </div>
+  </li>
+  <li id="story_b" class="story">
+    <div class="voters"><a class="upvoter" href="/login">7</a></div>
+    <div class="details">
+      <span class="link h-cite u-repost-of"><a class="u-url" href="/s/b/ask">Ask: second</a></span>
+      <span class="comments_label"><a href="/s/b/ask">no comments</a></span>
+    </div>
+  </li>
+  <li class="story"><div class="voters"></div></li>
+</ol></body></html>
+"""
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXAMPLE_SITES = os.path.join(ROOT, "examples", "sites.json")
+
+
+def lobsters_page() -> Page:
+    return Page(
+        url="https://lobste.rs/", content=LOBSTERS_HTML, encoding="utf-8", content_type="text/html"
+    )
+
+
+class LobstersTestCase(unittest.TestCase):
+    """Serves the example Lobsters spec as if WEB2API_SITES named it."""
+
+    def setUp(self) -> None:
+        parse_memo.clear()
+        (self.spec,) = sites.load_sites(EXAMPLE_SITES)
+        for patcher in (
+            mock.patch.dict(sites.SITES, {"lobsters": self.spec}),
+            mock.patch.dict(declarative._plans, clear=True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class TestSiteSpec(unittest.TestCase):
+    def test_from_dict_accepts_selector_shorthand(self) -> None:
+        spec = SiteSpec.from_dict(
+            {"key": "example", "url": "https://news.example.com/", "rows": "li",
+             "fields": {"title": "a", "points": {"selector": ".score", "parse": "int"}}}
+        )
+        self.assertEqual(spec.fields["title"], FieldSpec("a"))
+        self.assertEqual(spec.display, "example")
+        self.assertEqual(spec.tool_name, "example_get_top_posts")
+
+    def test_from_dict_rejects_bad_specs(self) -> None:
+        base = {"key": "example", "url": "https://news.example.com/", "rows": "li"}
+        for spec in (
+            {**base, "fields": {"link": "a"}},
+            {**base, "fields": {"title": {"selector": "a", "parse": "float"}}},
+            {**base, "key": "Bad Key", "fields": {"title": "a"}},
+            {"key": "example", "fields": {"title": "a"}},
+        ):
+            with self.assertRaises(ValueError):
+                SiteSpec.from_dict(spec)
+
+    def test_load_sites_skips_invalid_and_reserved(self) -> None:
+        entries = [
+            {"key": "example", "url": "https://news.example.com/", "rows": "li", "fields": {"title": "a"}},
+            {"key": "broken", "rows": "li", "fields": {"title": "a"}},
+            {"key": "reddit", "url": "https://example.com/", "rows": "li", "fields": {"title": "a"}},
+            {"key": "hn", "url": "https://example.com/", "rows": "li", "fields": {"title": "a"}},
+            {"key": "typo", "url": "https://example.com/", "rows": "li[[", "fields": {"title": "a"}},
+            {"key": "typo2", "url": "https://example.com/", "rows": "li", "fields": {"title": "a:nope("}},
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump(entries, f)
+        self.addCleanup(os.unlink, f.name)
+
+        loaded = sites.load_sites(f.name)
+        self.assertEqual([spec.key for spec in loaded], ["example", "reddit", "hn", "typo", "typo2"])
+        with self.assertLogs("mcp_server.sites", "WARNING") as logs:
+            collected = sites._collect(loaded, sites._BUILTIN_SOURCES, sites._BUILTIN_TOOLS)
+        self.assertEqual(list(collected), ["example"])
+        self.assertEqual(len(logs.output), 4)
+        self.assertIn("hn_get_top_posts", logs.output[1])
+        self.assertIn("li[[", logs.output[2])
+        self.assertEqual(sites.load_sites("/nonexistent.json"), [])
+
+    def test_reserved_tools_match_registry(self) -> None:
+        site_tools = {spec.tool_name for spec in sites.SITES.values()}
+        self.assertEqual(set(sites._BUILTIN_TOOLS), set(tools.get_tool_map()) - site_tools)
+
+    def test_no_sites_by_default(self) -> None:
+        self.assertEqual(sites.BUILTIN_SITES, [])
+
+    def test_example_spec_is_valid(self) -> None:
+        self.assertEqual(list(sites._collect(sites.load_sites(EXAMPLE_SITES), [], [])), ["lobsters"])
+
+
+class TestExtractionPlan(LobstersTestCase):
+    def test_extracts_and_parses_fields(self) -> None:
+        plan = declarative.get_plan("lobsters")
+        items = plan.extract(LOBSTERS_HTML, "utf-8", "https://lobste.rs/")
+        self.assertEqual(
+            items[0],
+            {
+                "title": "First story",
+                "link": "https://example.com/a",
+                "points": 1204,
+                "comments": 12,
+                "discussion_url": "https://lobste.rs/s/a/first_story",
+                "rank": 1,
+            },
+        )
+        # Relative links resolve; "no comments" has no number; rows without a title are skipped.
+        self.assertEqual(items[1]["link"], "https://lobste.rs/s/b/ask")
+        self.assertIsNone(items[1]["comments"])
+        self.assertEqual(len(items), 2)
+
+    def test_plan_is_compiled_once(self) -> None:
+        self.assertIs(declarative.get_plan("lobsters"), declarative.get_plan("lobsters"))
+
+    def test_fetch_site_memoizes_extraction(self) -> None:
+        with mock.patch.object(declarative, "fetch_page", return_value=lobsters_page()):
+            with mock.patch.object(
+                declarative.ExtractionPlan, "extract", autospec=True,
+                side_effect=declarative.ExtractionPlan.extract,
+            ) as extract:
+                first = declarative.fetch_site("lobsters", limit=1)
+                declarative.fetch_site("lobsters", limit=5)
+        self.assertEqual(extract.call_count, 1)
+        self.assertEqual([item["title"] for item in first], ["First story"])
+
+
+class TestSiteRegistration(LobstersTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        tool = tools.Tool(
+            name=self.spec.tool_name,
+            description=self.spec.description,
+            handler=tools.site_handler(self.spec),
+        )
+        for patcher in (
+            mock.patch.dict(tools._TOOLS, {tool.name: tool}),
+            mock.patch.dict(snapshots.SOURCES, {"lobsters": (self.spec.display, self.spec.tool_name)}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_registered_everywhere_when_configured(self) -> None:
+        code = (
+            "import asyncio\n"
+            "from mcp_server import mcp_server, snapshots, tools\n"
+            "names = [tool.name for tool in asyncio.run(mcp_server.mcp.list_tools())]\n"
+            "print('lobsters_get_top_posts' in tools.get_tool_map(), snapshots.SOURCES.get('lobsters'),\n"
+            "      'lobsters_get_top_posts' in names)\n"
+        )
+        for value, expected in (
+            (EXAMPLE_SITES, "True ('Lobsters', 'lobsters_get_top_posts') True"),
+            ("", "False None False"),
+        ):
+            result = subprocess.run(
+                [sys.executable, "-c", code], cwd=ROOT, env=dict(os.environ, WEB2API_SITES=value),
+                capture_output=True, text=True, timeout=60,
+            )
+            self.assertEqual(result.stdout.strip(), expected, result.stderr)
+
+    def test_snapshot_normalizes_site_items(self) -> None:
+        with mock.patch.object(declarative, "fetch_page", return_value=lobsters_page()):
+            snapshot = snapshots.fetch_snapshot("lobsters")
+        self.assertEqual(
+            snapshot.items[0],
+            {"rank": 1, "title": "First story", "link": "https://example.com/a",
+             "points": 1204, "comments": 12, "source": "Lobsters"},
+        )
+
+    def test_handler_reports_fetch_errors(self) -> None:
+        handler = tools.get_tool_map()["lobsters_get_top_posts"].handler
+        with mock.patch.object(declarative, "fetch_page", side_effect=HttpError("down")):
+            result = handler({"limit": 5})
+        self.assertEqual(result["error"], "Failed to fetch Lobsters items")
+
+
+if __name__ == "__main__":
+    unittest.main()
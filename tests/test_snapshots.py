@@ -0,0 +1,149 @@
+"""
+Tests for the snapshot store (normalization, versioning, single-flight).
+
+Run with:
+    python3 -m unittest tests.test_snapshots
+"""
+
+import threading
+import time
+import unittest
+
+from mcp_server import snapshots
+from mcp_server.snapshots import (
+    AdaptiveTTL,
+    SnapshotStore,
+    content_version,
+    identity_version,
+    normalize_items,
+)
+from tests.conftest import make_snapshot
+
+
+class TestNormalize(unittest.TestCase):
+    def test_maps_adapter_keys(self) -> None:
+        raw = [{"name": "Widget", "url": "https://w.example", "votes": 7}]
+        item = normalize_items("ProductHunt", raw)[0]
+        self.assertEqual(item["title"], "Widget")
+        self.assertEqual(item["link"], "https://w.example")
+        self.assertEqual(item["points"], 7)
+        self.assertEqual(item["rank"], 1)
+        self.assertEqual(item["source"], "ProductHunt")
+
+    def test_version_tracks_content(self) -> None:
+        a = [{"rank": 1, "title": "a"}]
+        self.assertEqual(content_version(a), content_version([{"title": "a", "rank": 1}]))
+        self.assertNotEqual(content_version(a), content_version([{"rank": 1, "title": "b"}]))
+
+
+class TestSnapshotStore(unittest.TestCase):
+    def test_serves_cached_until_expired(self) -> None:
+        calls = []
+
+        def fetcher(source, ttl):
+            calls.append(source)
+            return make_snapshot(source, [{"rank": len(calls)}], ttl)
+
+        store = SnapshotStore(ttl=60.0, fetcher=fetcher)
+        first = store.get("hackernews")
+        self.assertIs(store.get("hackernews"), first)
+        self.assertEqual(len(calls), 1)
+
+        store.refresh("hackernews")
+        self.assertEqual(len(calls), 2)
+
+    def test_concurrent_gets_share_one_fetch(self) -> None:
+        calls = []
+
+        def fetcher(source, ttl):
+            calls.append(source)
+            time.sleep(0.05)
+            return make_snapshot(source, [], ttl)
+
+        store = SnapshotStore(ttl=60.0, fetcher=fetcher)
+        threads = [threading.Thread(target=store.get, args=("reddit",)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(calls, ["reddit"])
+
+    def test_handler_error_raises_snapshot_error(self) -> None:
+        tool = snapshots.tools.get_tool_map()["hn_get_top_posts"]
+        original = tool.handler
+        tool.handler = lambda args: {"error": "boom", "details": "down"}
+        try:
+            with self.assertRaises(snapshots.SnapshotError) as ctx:
+                snapshots.fetch_snapshot("hackernews")
+        finally:
+            tool.handler = original
+        self.assertEqual(ctx.exception.error, "boom")
+
+
+class TestAdaptiveTTL(unittest.TestCase):
+    def test_converges_to_bounds(self) -> None:
+        ttl = AdaptiveTTL(60.0, 10.0, 300.0)
+        for _ in range(20):
+            ttl.observe(changed=True)
+        self.assertEqual(ttl.ttl, 10.0)
+        for _ in range(20):
+            ttl.observe(changed=False)
+        self.assertEqual(ttl.ttl, 300.0)
+        self.assertEqual((ttl.changed, ttl.unchanged), (20, 20))
+
+    def test_store_backs_off_static_source(self) -> None:
+        ttls = []
+
+        def fetcher(source, ttl):
+            ttls.append(ttl)
+            return make_snapshot(source, [{"rank": 1}], ttl)
+
+        store = SnapshotStore(ttl=60.0, fetcher=fetcher, min_ttl=10.0, max_ttl=600.0)
+        store.refresh("producthunt")
+        self.assertEqual(store.current_ttl("producthunt"), 60.0)  # nothing to compare yet
+        second = store.refresh("producthunt")
+        self.assertEqual(store.current_ttl("producthunt"), 90.0)
+        self.assertAlmostEqual(second.expires_at - second.fetched_at, 90.0)
+        store.refresh("producthunt")
+        self.assertEqual(ttls, [60.0, 60.0, 90.0])
+
+    def test_store_polls_volatile_source_faster(self) -> None:
+        def fetcher(source, ttl):
+            return make_snapshot(source, [{"title": f"story {time.monotonic()}"}], ttl)
+
+        store = SnapshotStore(ttl=60.0, fetcher=fetcher, min_ttl=10.0, max_ttl=600.0)
+        for _ in range(4):
+            snapshot = store.refresh("hackernews")
+        self.assertEqual(store.current_ttl("hackernews"), 10.0)
+        self.assertAlmostEqual(snapshot.ttl_remaining(), 10.0, delta=1.0)
+        self.assertEqual(store.current_ttl("reddit"), 60.0)
+
+    def test_score_changes_are_not_new_content(self) -> None:
+        points = iter(range(100))
+
+        def fetcher(source, ttl):
+            items = [{"rank": 1, "title": "same", "link": "https://e.com/1", "points": next(points)}]
+            return make_snapshot(source, items, ttl)
+
+        store = SnapshotStore(ttl=60.0, fetcher=fetcher, min_ttl=10.0, max_ttl=600.0)
+        first = store.refresh("hackernews")
+        second = store.refresh("hackernews")
+        self.assertNotEqual(first.version, second.version)
+        self.assertEqual(store.current_ttl("hackernews"), 90.0)
+
+    def test_identity_tracks_items_and_order(self) -> None:
+        a = {"title": "a", "link": "https://e.com/a", "points": 1}
+        b = {"title": "b", "link": "https://e.com/b", "points": 2}
+        self.assertEqual(identity_version([a, b]), identity_version([dict(a, points=9), b]))
+        self.assertNotEqual(identity_version([a, b]), identity_version([b, a]))
+        self.assertNotEqual(identity_version([a]), identity_version([a, b]))
+
+    def test_fixed_ttl_by_default(self) -> None:
+        store = SnapshotStore(ttl=60.0, fetcher=lambda source, ttl: make_snapshot(source, [], ttl))
+        store.refresh("reddit")
+        store.refresh("reddit")
+        self.assertEqual(store.current_ttl("reddit"), 60.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
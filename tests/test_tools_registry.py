@@ -0,0 +1,43 @@
+"""
+Tests for the tool registry and lazy adapter loading.
+
+Run with:
+    python3 -m unittest tests.test_tools_registry
+"""
+
+import subprocess
+import sys
+import unittest
+
+from mcp_server import tools
+
+
+class TestToolRegistry(unittest.TestCase):
+    def test_registry_is_built_once(self) -> None:
+        first = tools.get_tool_map()
+        second = tools.get_tool_map()
+        self.assertIs(first, second)
+        self.assertIs(first["hn_get_top_posts"], second["hn_get_top_posts"])
+        self.assertIs(tools.get_tool_manifest(), tools.get_tool_manifest())
+
+    def test_registry_contents(self) -> None:
+        names = [t.name for t in tools.get_tool_registry()]
+        for name in ("hn_get_top_posts", "ph_get_top_products", "reddit_get_top_posts"):
+            self.assertIn(name, names)
+        manifest_names = [t["name"] for t in tools.get_tool_manifest()["tools"]]
+        self.assertEqual(manifest_names, names)
+
+    def test_import_does_not_load_adapters(self) -> None:
+        code = (
+            "import sys, mcp_server.tools; "
+            "heavy = [m for m in ('bs4', 'requests', 'mcp_server.adapters') if m in sys.modules]; "
+            "print(','.join(heavy))"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        self.assertEqual(out, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
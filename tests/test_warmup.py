@@ -0,0 +1,146 @@
+"""
+Offline tests for startup warmup (warmup.py).
+
+Run with:
+    python3 -m unittest tests.test_warmup
+"""
+
+import os
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from mcp_server import sites, warmup
+from mcp_server.snapshots import SOURCES, SnapshotError
+from mcp_server.utils import http_client, ratelimit
+from mcp_server.utils.http_client import get_session
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        self.do_HEAD()
+        self.wfile.write(b"ok")
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class _CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    accepted = 0
+
+    def get_request(self):
+        request = super().get_request()
+        self.accepted += 1
+        return request
+
+
+class TestSettings(unittest.TestCase):
+    def test_default_sources(self) -> None:
+        with mock.patch.dict(os.environ, {"WEB2API_WARMUP_SOURCES": ""}):
+            self.assertEqual(warmup.default_sources(), list(SOURCES))
+        with mock.patch.dict(os.environ, {"WEB2API_WARMUP_SOURCES": "Reddit, nope"}):
+            self.assertEqual(warmup.default_sources(), ["reddit"])
+        with mock.patch.dict(os.environ, {"WEB2API_WARMUP_SOURCES": "none"}):
+            self.assertEqual(warmup.default_sources(), [])
+
+    def test_default_urls(self) -> None:
+        site = sites.SiteSpec("example", "Example", "https://news.example.org/", "li", {"title": sites.FieldSpec("a")})
+        with mock.patch.dict(os.environ, {"WEB2API_WARMUP_HOSTS": "example.com, https://www.reddit.com/"}), \
+                mock.patch.dict(sites.SITES, {"example": site}):
+            urls = warmup.default_urls()
+        self.assertIn("https://news.example.org/", urls)
+        self.assertIn("https://example.com/", urls)
+        self.assertEqual(urls.count("https://www.reddit.com/"), 1)
+
+
+class TestWarmup(unittest.TestCase):
+    def test_prefetches_sources_and_reports(self) -> None:
+        def get(source):
+            if source == "reddit":
+                raise SnapshotError("down")
+
+        store = mock.Mock(get=mock.Mock(side_effect=get), cached=mock.Mock(return_value=None))
+        with mock.patch.object(warmup, "get_store", return_value=store), \
+                mock.patch.object(warmup, "connect") as connect:
+            run = warmup.Warmup(["https://a.example/"], ["hackernews", "reddit"])
+            with self.assertLogs("mcp_server.warmup", "INFO") as logs:
+                run.start()
+                self.assertTrue(run.wait(5))
+        connect.assert_called_once_with("https://a.example/")
+        self.assertEqual(run.prefetched, ["hackernews"])
+        self.assertEqual(list(run.errors), ["prefetch reddit"])
+        stats = run.stats()
+        self.assertTrue(stats["finished"])
+        self.assertEqual(stats["sources"], {"total": 2, "prefetched": 1, "fresh": 0})
+        self.assertIn("1/2 sources prefetched", logs.output[0])
+
+    def test_skips_sources_fresh_in_shared_cache(self) -> None:
+        store = mock.Mock(cached=mock.Mock(side_effect=lambda source: object() if source == "reddit" else None))
+        with mock.patch.object(warmup, "get_store", return_value=store), \
+                mock.patch.object(warmup, "connect") as connect:
+            run = warmup.Warmup(
+                ["https://www.reddit.com/", "https://news.ycombinator.com/", "https://a.example/"],
+                ["hackernews", "reddit"],
+            )
+            with self.assertLogs("mcp_server.warmup", "INFO"):
+                run.run()
+        self.assertEqual(sorted(c.args[0] for c in connect.call_args_list),
+                         ["https://a.example/", "https://news.ycombinator.com/"])
+        store.get.assert_called_once_with("hackernews")
+        self.assertEqual(run.fresh, ["reddit"])
+        self.assertEqual(run.stats()["hosts"], {"total": 3, "connected": 2, "skipped": 1})
+
+    def test_start_warmup_once_when_enabled(self) -> None:
+        with mock.patch.object(warmup, "_warmup", None), \
+                mock.patch.object(warmup.Warmup, "run"):
+            for value in ("0", ""):
+                with mock.patch.dict(os.environ, {"WEB2API_WARMUP": value}):
+                    self.assertIsNone(warmup.start_warmup())
+            with mock.patch.dict(os.environ, {"WEB2API_WARMUP": "1"}):
+                first = warmup.start_warmup()
+                self.assertIs(warmup.start_warmup(), first)
+            self.assertIs(warmup.get_warmup(), first)
+
+
+class TestConnect(unittest.TestCase):
+    def test_next_request_reuses_warmed_connection(self) -> None:
+        server = _CountingServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f"http://127.0.0.1:{server.server_port}/"
+
+        with mock.patch.dict(os.environ, {"NO_PROXY": "127.0.0.1", "no_proxy": "127.0.0.1"}):
+            warmup.connect(url)
+            deadline = time.monotonic() + 5
+            while server.accepted == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(server.accepted, 1)
+            self.assertEqual(get_session().get(url, timeout=5).text, "ok")
+        self.assertEqual(server.accepted, 1)
+        self.assertEqual(ratelimit.get_limiter(f"127.0.0.1:{server.server_port}").stats()["acquired"], 1)
+
+    def test_open_circuit_is_not_contacted(self) -> None:
+        session = mock.Mock()
+        state = http_client._host_state("down.example")
+        for _ in range(http_client.BREAKER_FAILURE_THRESHOLD):
+            state.breaker.record_failure()
+        self.addCleanup(http_client._hosts.clear)
+        with mock.patch.object(http_client, "get_session", return_value=session):
+            with self.assertRaises(http_client.CircuitOpenError):
+                warmup.connect("https://down.example/")
+        session.head.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Tests for the Flask dashboard (caching headers, gzip, streaming).
+
+Run with:
+    python3 -m unittest tests.test_web_app
+"""
+
+import gzip
+import unittest
+from unittest import mock
+
+import web_app
+from mcp_server.snapshots import SnapshotStore
+from mcp_server.utils.cache import LRUCache
+from tests.conftest import make_snapshot
+
+
+ITEMS = [
+    {"rank": i, "title": f"Story {i}", "link": f"https://example.com/{i}",
+     "points": 10 * i, "comments": i, "source": "HackerNews"}
+    for i in range(1, 31)
+]
+
+
+def fake_fetcher(source, ttl):
+    return make_snapshot(source, ITEMS, ttl)
+
+
+class WebAppTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = SnapshotStore(ttl=60.0, fetcher=fake_fetcher)
+        for patcher in (
+            mock.patch.object(web_app, "get_store", return_value=self.store),
+            mock.patch.object(web_app, "_api_payloads", LRUCache(max_entries=256)),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = web_app.app.test_client()
+
+
+class TestIndex(WebAppTestCase):
+    def test_renders_rows_with_cache_headers(self) -> None:
+        resp = self.client.get("/?source=hackernews&limit=5")
+        self.assertEqual(resp.status_code, 200)
+        body = resp.get_data(as_text=True)
+        self.assertIn("Story 5", body)
+        self.assertNotIn("Story 6", body)
+        self.assertTrue(resp.headers["ETag"].startswith('W/"'))
+        self.assertIn("max-age=", resp.headers["Cache-Control"])
+
+    def test_revalidation_returns_304(self) -> None:
+        first = self.client.get("/?source=hackernews&limit=5")
+        second = self.client.get(
+            "/?source=hackernews&limit=5",
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.get_data(), b"")
+
+    def test_etag_varies_with_limit(self) -> None:
+        a = self.client.get("/?source=hackernews&limit=5").headers["ETag"]
+        b = self.client.get("/?source=hackernews&limit=6").headers["ETag"]
+        self.assertNotEqual(a, b)
+
+    def test_gzip_negotiated(self) -> None:
+        resp = self.client.get("/?source=hackernews", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(resp.headers["Content-Encoding"], "gzip")
+        self.assertIn(b"Story 1", gzip.decompress(resp.get_data()))
+
+    def test_unknown_source_is_not_cached(self) -> None:
+        resp = self.client.get("/?source=nope")
+        self.assertIn("Unknown source", resp.get_data(as_text=True))
+        self.assertEqual(resp.headers["Cache-Control"], "no-store")
+        self.assertNotIn("ETag", resp.headers)
+
+
+class TestJsonApi(WebAppTestCase):
+    def test_feed_with_limit_and_fields(self) -> None:
+        resp = self.client.get("/api/feed/hackernews?limit=3&fields=rank,title")
+        self.assertEqual(resp.status_code, 200)
+        data = resp.get_json()
+        self.assertEqual(data["source"], "hackernews")
+        self.assertEqual(data["items"], [{"rank": i, "title": f"Story {i}"} for i in (1, 2, 3)])
+        self.assertFalse(resp.headers["ETag"].startswith("W/"))
+
+    def test_payload_serialized_once_per_snapshot(self) -> None:
+        first = self.client.get("/api/feed/hackernews?limit=3")
+        second = self.client.get("/api/feed/hackernews?limit=3")
+        stats = web_app._api_payloads.stats()
+        self.assertEqual((stats["misses"], stats["hits"]), (1, 1))
+        self.assertEqual(first.get_data(), second.get_data())
+        self.assertEqual(first.headers["ETag"], second.headers["ETag"])
+
+    def test_strong_etag_revalidation(self) -> None:
+        etag = self.client.get("/api/feed/hackernews").headers["ETag"]
+        resp = self.client.get("/api/feed/hackernews", headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, 304)
+
+    def test_feeds_combines_sources(self) -> None:
+        data = self.client.get("/api/feeds?sources=hackernews,reddit&limit=2").get_json()
+        self.assertEqual(sorted(data["feeds"]), ["hackernews", "reddit"])
+        self.assertEqual(len(data["feeds"]["reddit"]["items"]), 2)
+
+    def test_bad_params(self) -> None:
+        self.assertEqual(self.client.get("/api/feed/nope").status_code, 404)
+        self.assertEqual(self.client.get("/api/feed/hackernews?fields=bogus").status_code, 400)
+        self.assertEqual(self.client.get("/api/feed/hackernews?limit=x").status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
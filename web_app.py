@@ -5,28 +5,63 @@ Simple web UI for the Web2API MCP project.
 
 - Shows a form to select `source` (Hacker News, Product Hunt, Reddit)
 - Shows a `limit` field
-- Calls the corresponding *_handler under the hood
-- Renders items in a basic HTML table
+- Reads the source's cached snapshot (see mcp_server.snapshots), which
+  calls the corresponding *_handler under the hood
+- Streams items into a basic HTML table
+
+The template is compiled once at import. Responses carry an ETag derived
+from the snapshot version, so browsers revalidate with a cheap 304, and
+the streamed body is gzipped when the client accepts it.
+
+JSON API (same snapshots, for non-MCP consumers):
+    GET /api/feed/<source>?limit=10&fields=rank,title,link
+    GET /api/feeds?sources=hackernews,reddit&limit=10&fields=title
+    GET /api/stream/<source>   (Server-Sent Events, one event per new snapshot)
 
 Run with:
     python3 web_app.py
 
+With WEB2API_WARMUP=1, upstream connections and snapshots are warmed up
+in the background on startup (see mcp_server.warmup). Under a WSGI server, call
+mcp_server.warmup.start_warmup() from a post-fork hook to do the same.
+
 Then open:
     http://127.0.0.1:5000
 """
 
-from typing import Any, Dict, List
+import gzip
+import hashlib
+import time
+import zlib
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from flask import Flask, render_template_string, request
+from flask import Flask, Response, request, stream_with_context
 
-from mcp_server.tools import (
-    hn_get_top_posts_handler,
-    ph_get_top_products_handler,
-    reddit_get_top_posts_handler,
+from mcp_server.live import HubFullError, get_hub
+from mcp_server.sites import SITES
+from mcp_server.snapshots import (
+    SOURCES,
+    Snapshot,
+    SnapshotError,
+    get_store,
+    parse_fields,
+    project,
 )
+from mcp_server.utils import jsonio, metrics
+from mcp_server.utils.cache import LRUCache
+from mcp_server.warmup import start_warmup
 
 app = Flask(__name__)
 
+# Bump when TEMPLATE changes so cached pages are not revalidated as equal.
+TEMPLATE_VERSION = "3"
+
+# Flush the streamed page every few template chunks rather than per token.
+STREAM_BUFFER = 8
+
+# Send an SSE comment this often so proxies don't close idle streams.
+SSE_HEARTBEAT = 15.0
+
 
 TEMPLATE = """
 <!doctype html>
@@ -158,6 +193,11 @@ TEMPLATE = """
           <option value="reddit" {{ 'selected' if selected_source == 'reddit' else '' }}>
             Reddit (r/all)
           </option>
+          {% for key, name in site_sources %}
+          <option value="{{ key }}" {{ 'selected' if selected_source == key else '' }}>
+            {{ name }}
+          </option>
+          {% endfor %}
         </select>
       </div>
 
@@ -234,6 +274,50 @@ TEMPLATE = """
           {% endfor %}
         </tbody>
       </table>
+
+      <script>
+        // Live updates: re-render rows whenever the server pushes a new snapshot.
+        (function () {
+          if (!window.EventSource) { return; }
+          var limit = {{ limit | tojson }};
+          var tbody = document.querySelector("table tbody");
+          var stream = new EventSource("/api/stream/" + encodeURIComponent({{ selected_source | tojson }}));
+
+          function cell(className, value) {
+            var td = document.createElement("td");
+            if (className) { td.className = className; }
+            td.textContent = (value === null || value === undefined || value === "") ? "-" : value;
+            return td;
+          }
+
+          stream.addEventListener("snapshot", function (event) {
+            var items = JSON.parse(event.data).items.slice(0, limit);
+            var rows = document.createDocumentFragment();
+            items.forEach(function (item) {
+              var tr = document.createElement("tr");
+              tr.appendChild(cell("rank", item.rank));
+              tr.appendChild(cell("", item.title));
+              if (item.link) {
+                var linkCell = document.createElement("td");
+                var a = document.createElement("a");
+                a.href = item.link;
+                a.target = "_blank";
+                a.rel = "noopener noreferrer";
+                a.textContent = item.link;
+                linkCell.appendChild(a);
+                tr.appendChild(linkCell);
+              } else {
+                tr.appendChild(cell("", null));
+              }
+              tr.appendChild(cell("source-col", item.source));
+              tr.appendChild(cell("points", item.points));
+              tr.appendChild(cell("comments", item.comments));
+              rows.appendChild(tr);
+            });
+            tbody.replaceChildren(rows);
+          });
+        })();
+      </script>
     {% endif %}
 
     <div class="footer">
@@ -245,6 +329,44 @@ TEMPLATE = """
 """
 
 
+# Compiled once; Jinja would otherwise re-parse TEMPLATE on every request.
+_template = app.jinja_env.from_string(TEMPLATE)
+
+
+def _gzip_stream(chunks: Iterable[str]) -> Iterator[bytes]:
+    """Gzip a stream of text chunks incrementally."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _render(context: Dict[str, Any], cache_tag: Optional[str], max_age: int) -> Response:
+    """Stream the template, with conditional-GET and gzip handling."""
+    if cache_tag is not None and request.if_none_match.contains_weak(cache_tag):
+        response = Response(status=304)
+    else:
+        stream = _template.stream(**context)
+        stream.enable_buffering(STREAM_BUFFER)
+        if request.accept_encodings["gzip"]:
+            body: Iterable[Any] = _gzip_stream(stream)
+            response = Response(stream_with_context(body), mimetype="text/html")
+            response.headers["Content-Encoding"] = "gzip"
+        else:
+            response = Response(stream_with_context(stream), mimetype="text/html")
+
+    response.vary.add("Accept-Encoding")
+    if cache_tag is None:
+        response.headers["Cache-Control"] = "no-store"
+    else:
+        # Weak: the gzip and identity bodies differ byte-wise.
+        response.set_etag(cache_tag, weak=True)
+        response.headers["Cache-Control"] = f"public, max-age={max_age}"
+    return response
+
+
 @app.route("/", methods=["GET"])
 def index() -> Any:
     # Read query params with defaults
@@ -254,6 +376,7 @@ def index() -> Any:
     error = None
     error_details = None
     posts: List[Dict[str, Any]] = []
+    snapshot: Optional[Snapshot] = None
 
     # Parse + clamp limit
     try:
@@ -267,78 +390,200 @@ def index() -> Any:
         error_details = str(exc)
         limit = 10
 
-    # Choose handler based on source
-    handler = None
-    if source == "hackernews":
-        handler = hn_get_top_posts_handler
-    elif source == "producthunt":
-        handler = ph_get_top_products_handler
-    elif source == "reddit":
-        handler = reddit_get_top_posts_handler
-    else:
+    if source not in SOURCES:
         if not error:
             error = f"Unknown source: {source}"
 
-    # Call handler if we have one and no previous error
-    if handler and not error:
-        result = handler({"limit": limit})
-
-        # If handler returned an error-like dict
-        if isinstance(result, dict) and result.get("error"):
-            error = result.get("error")
-            error_details = result.get("details")
+    # Read the (cached) snapshot if we have a valid source and no previous error
+    if source in SOURCES and not error:
+        try:
+            snapshot = get_store().get(source)
+        except SnapshotError as exc:
+            error = exc.error
+            error_details = exc.details
         else:
-            # Normalize result items into a common shape
-            normalized: List[Dict[str, Any]] = []
-            rank_counter = 1
-            for item in result:  # type: ignore[assignment]
-                # Safely probe multiple key names
-                title = (
-                    item.get("title")
-                    or item.get("name")
-                    or "(no title)"
-                )
-                link = (
-                    item.get("link")
-                    or item.get("url")
-                    or item.get("discussion_url")
-                    or ""
-                )
-                points = (
-                    item.get("points")
-                    or item.get("score")
-                    or item.get("votes")
-                    or item.get("votes_count")
-                )
-                comments = (
-                    item.get("comments")
-                    or item.get("num_comments")
-                    or item.get("comments_count")
-                )
-
-                normalized.append(
-                    {
-                        "rank": item.get("rank", rank_counter),
-                        "title": title,
-                        "link": link,
-                        "points": points,
-                        "comments": comments,
-                        "source": source.capitalize(),
-                    }
-                )
-                rank_counter += 1
-
-            posts = normalized
-
-    return render_template_string(
-    TEMPLATE,
-    limit=limit,
-    posts=posts,
-    error=error,
-    error_details=error_details,
-    selected_source=source,
-)
+            posts = snapshot.head(limit)
+
+    context = dict(
+        limit=limit,
+        posts=posts,
+        error=error,
+        error_details=error_details,
+        selected_source=source,
+        site_sources=[(key, spec.display) for key, spec in SITES.items()],
+    )
+
+    if snapshot is None or error:
+        return _render(context, None, 0)
+
+    cache_tag = f"{snapshot.version}-{source}-{limit}-{TEMPLATE_VERSION}"
+    return _render(context, cache_tag, int(snapshot.ttl_remaining()))
+
+
+# --- JSON API ------------------------------------------------------------- #
+
+
+class _Payload:
+    """A serialized API body, reused for every request with the same key."""
+
+    def __init__(self, body: bytes, tag: str) -> None:
+        self.body = body
+        self.tag = tag
+        self._gzipped: Optional[bytes] = None
+
+    def gzipped(self) -> bytes:
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, 6)
+        return self._gzipped
+
+
+# Keyed by snapshot version(s) + limit + fields, so entries never go stale;
+# old versions simply age out of the LRU.
+_api_payloads: "LRUCache[_Payload]" = LRUCache(max_entries=256)
+metrics.register("web_app.api_payloads", _api_payloads.stats)
+
+
+def _api_error(status: int, error: str, details: Optional[str] = None) -> Response:
+    body = jsonio.dumps_bytes({"error": error, "details": details})
+    response = Response(body, status=status, mimetype="application/json")
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+def _api_params() -> Tuple[int, Optional[List[str]]]:
+    """Parse `limit` and `fields`; raises ValueError with a user-facing message."""
+    try:
+        limit = int(request.args.get("limit", "10"))
+    except ValueError as exc:
+        raise ValueError("Invalid 'limit' value; expected an integer.") from exc
+    return max(1, min(limit, 50)), parse_fields(request.args.get("fields"))
+
+
+def _snapshot_body(snapshot: Snapshot, limit: int, fields: Optional[List[str]]) -> Dict[str, Any]:
+    return {
+        "source": snapshot.source,
+        "version": snapshot.version,
+        "fetched_at": snapshot.fetched_at,
+        "items": project(snapshot.head(limit), fields),
+    }
+
+
+def _payload(key: Tuple[Any, ...], build: Callable[[], Dict[str, Any]]) -> _Payload:
+    """Return the cached payload for key, serializing via build() on a miss."""
+    payload = _api_payloads.get(key)
+    if payload is None:
+        body = jsonio.dumps_bytes(build())
+        tag = hashlib.blake2b(repr(key).encode("utf-8"), digest_size=10).hexdigest()
+        payload = _Payload(body, tag)
+        _api_payloads.set(key, payload)
+    return payload
+
+
+def _send_payload(payload: _Payload, expires_at: float) -> Response:
+    """Send a cached payload with a strong ETag, 304 and gzip support."""
+    use_gzip = bool(request.accept_encodings["gzip"])
+    # Strong ETags must differ per representation.
+    tag = payload.tag + ("-gz" if use_gzip else "")
+
+    if request.if_none_match.contains(tag):
+        response = Response(status=304)
+    elif use_gzip:
+        response = Response(payload.gzipped(), mimetype="application/json")
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response = Response(payload.body, mimetype="application/json")
+
+    response.set_etag(tag)
+    response.vary.add("Accept-Encoding")
+    max_age = max(0, int(expires_at - time.time()))
+    response.headers["Cache-Control"] = f"public, max-age={max_age}"
+    return response
+
+
+@app.route("/api/feed/<source>", methods=["GET"])
+def api_feed(source: str) -> Any:
+    if source not in SOURCES:
+        return _api_error(404, f"Unknown source: {source}", f"Use one of: {', '.join(SOURCES)}")
+    try:
+        limit, fields = _api_params()
+    except ValueError as exc:
+        return _api_error(400, str(exc))
+
+    try:
+        snapshot = get_store().get(source)
+    except SnapshotError as exc:
+        return _api_error(502, exc.error, exc.details)
+
+    key = ("feed", source, snapshot.version, limit, tuple(fields or ()))
+    payload = _payload(key, lambda: _snapshot_body(snapshot, limit, fields))
+    return _send_payload(payload, snapshot.expires_at)
+
+
+@app.route("/api/feeds", methods=["GET"])
+def api_feeds() -> Any:
+    requested = request.args.get("sources")
+    sources = [s.strip() for s in requested.split(",") if s.strip()] if requested else list(SOURCES)
+    unknown = [s for s in sources if s not in SOURCES]
+    if unknown:
+        return _api_error(404, f"Unknown source(s): {', '.join(unknown)}", f"Use: {', '.join(SOURCES)}")
+    try:
+        limit, fields = _api_params()
+    except ValueError as exc:
+        return _api_error(400, str(exc))
+
+    results: Dict[str, Any] = {}
+    for source in sources:
+        try:
+            results[source] = get_store().get(source)
+        except SnapshotError as exc:
+            results[source] = exc
+
+    def build() -> Dict[str, Any]:
+        feeds: Dict[str, Any] = {}
+        for source, result in results.items():
+            if isinstance(result, SnapshotError):
+                feeds[source] = {"source": source, "error": result.error, "details": result.details}
+            else:
+                feeds[source] = _snapshot_body(result, limit, fields)
+        return {"feeds": feeds}
+
+    snapshots = [r for r in results.values() if isinstance(r, Snapshot)]
+    if len(snapshots) != len(results):
+        # Partial failures are not cached; retry upstream on the next request.
+        response = Response(jsonio.dumps_bytes(build()), mimetype="application/json")
+        response.headers["Cache-Control"] = "no-store"
+        return response
+
+    versions = tuple((s.source, s.version) for s in snapshots)
+    expires_at = min(s.expires_at for s in snapshots)
+    key = ("feeds", versions, limit, tuple(fields or ()))
+    return _send_payload(_payload(key, build), expires_at)
+
+
+@app.route("/api/stream/<source>", methods=["GET"])
+def api_stream(source: str) -> Any:
+    if source not in SOURCES:
+        return _api_error(404, f"Unknown source: {source}", f"Use one of: {', '.join(SOURCES)}")
+    try:
+        sub = get_hub().subscribe(source, request.headers.get("Last-Event-ID"))
+    except HubFullError as exc:
+        return _api_error(503, str(exc))
+
+    def events() -> Iterator[bytes]:
+        try:
+            yield b"retry: 5000\n\n"
+            while not sub.dropped:
+                event = sub.next_event(SSE_HEARTBEAT)
+                yield event if event is not None else b": keepalive\n\n"
+        finally:
+            get_hub().unsubscribe(sub)
+
+    response = Response(events(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
 
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000)
+    start_warmup()
+    app.run(host="0.0.0.0", port=5000, threaded=True)